@@ -24,12 +24,14 @@ from acme._metadata import __version__
 
 # Expose core interfaces.
 from acme.core import Actor
+from acme.core import BatchedActor
 # Internal core import.
 from acme.core import Learner
 from acme.core import Saveable
 from acme.core import VariableSource
 
 # Expose the environment loop.
+from acme.environment_loop import BatchedEnvironmentLoop
 from acme.environment_loop import EnvironmentLoop
 # Internal environment_loop import.
 
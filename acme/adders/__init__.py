@@ -17,5 +17,7 @@
 
 # pylint: disable=unused-import
 
+from acme.adders.asynchronous import AsyncAdder
 from acme.adders.base import Adder
+from acme.adders.casting import CastingAdder
 # Internal imports.
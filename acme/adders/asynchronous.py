@@ -0,0 +1,132 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Adder which moves the work of another adder to a background thread."""
+
+import queue
+import threading
+
+from absl import logging
+from acme import types
+from acme.adders import base
+import dm_env
+
+# Operations sent to the writer thread.
+_ADD_FIRST = 0
+_ADD = 1
+_RESET = 2
+_CLOSE = 3
+
+
+class AsyncAdder(base.Adder):
+  """Adder which makes the calls to another adder asynchronous.
+
+  Calls to `add_first` and `add` are placed on a bounded queue and forwarded
+  to the wrapped adder, in order, by a writer thread. This keeps the work done
+  by the wrapped adder (e.g. n-step computations, priorities and RPCs to a
+  replay server) off the thread which steps the environment, which only blocks
+  once `queue_size` calls are pending.
+
+  Calls to `reset` are forwarded in order as well, after which `reset` waits
+  for all pending calls to complete. An error raised by the wrapped adder is
+  raised once, by the next call made to this adder. Calls made before then are
+  dropped, while later calls are forwarded again so that the wrapped adder can
+  recover (e.g. a `ReverbAdder` reconnects at the start of the next episode).
+  `close` forwards all pending calls and then closes the wrapped adder.
+
+  Note that the data passed to `add_first` and `add` is not copied, so it must
+  not be modified by the caller afterwards.
+  """
+
+  def __init__(self, adder: base.Adder, queue_size: int = 100):
+    """Initializes the adder and starts its writer thread.
+
+    Args:
+      adder: the adder to forward calls to.
+      queue_size: the maximum number of pending calls.
+    """
+    self._adder = adder
+    self._queue = queue.Queue(maxsize=queue_size)
+    self._error = None
+    self._thread = threading.Thread(target=self._run, daemon=True)
+    self._thread.start()
+
+  @property
+  def queue_depth(self) -> int:
+    """The number of calls which have not completed yet."""
+    return self._queue.unfinished_tasks
+
+  def add_first(self, timestep: dm_env.TimeStep):
+    self._put((_ADD_FIRST, (timestep,)))
+
+  def add(self,
+          action: types.NestedArray,
+          next_timestep: dm_env.TimeStep,
+          extras: types.NestedArray = ()):
+    self._put((_ADD, (action, next_timestep, extras)))
+
+  def reset(self):
+    """Resets the wrapped adder once all pending calls have been made."""
+    self._put((_RESET, ()))
+    self.flush()
+
+  def flush(self):
+    """Blocks until all pending calls have been forwarded."""
+    self._queue.join()
+    self._raise_on_error()
+
+  def close(self):
+    """Forwards all pending calls, stops the writer and closes the adder."""
+    if self._thread.is_alive():
+      self._queue.put((_CLOSE, ()))
+      self._thread.join()
+      close = getattr(self._adder, 'close', None)
+      if close is not None:
+        close()
+    self._raise_on_error()
+
+  def _put(self, operation):
+    self._raise_on_error()
+    self._queue.put(operation)
+
+  def _raise_on_error(self):
+    """Raises an error of the wrapped adder once, dropping pending calls."""
+    if self._error is None:
+      return
+    self._queue.join()
+    error, self._error = self._error, None
+    raise error
+
+  def _run(self):
+    """Forwards queued calls to the wrapped adder."""
+    while True:
+      command, args = self._queue.get()
+      try:
+        if command == _CLOSE:
+          return
+        # Once an error has occurred pending calls are dropped.
+        if self._error is not None:
+          continue
+        if command == _ADD_FIRST:
+          self._adder.add_first(*args)
+        elif command == _ADD:
+          self._adder.add(*args)
+        elif command == _RESET:
+          self._adder.reset()
+      except Exception as e:  # pylint: disable=broad-except
+        logging.exception('Error in AsyncAdder writer thread.')
+        self._error = e
+      finally:
+        self._queue.task_done()
@@ -0,0 +1,109 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the asynchronous adder."""
+
+import threading
+
+from absl.testing import absltest
+from acme import adders
+import dm_env
+import numpy as np
+
+
+class _RecordingAdder(adders.Adder):
+  """Adder which records its calls, optionally waiting for an event first."""
+
+  def __init__(self, event: threading.Event = None, error_on_add: bool = False):
+    self.calls = []
+    self.threads = set()
+    self.error_on_add = error_on_add
+    self._event = event
+
+  def add_first(self, timestep):
+    self._record(('add_first', timestep.observation))
+
+  def add(self, action, next_timestep, extras=()):
+    if self.error_on_add:
+      raise ValueError('add error')
+    self._record(('add', action, next_timestep.observation, extras))
+
+  def reset(self):
+    self._record(('reset',))
+
+  def close(self):
+    self._record(('close',))
+
+  def _record(self, call):
+    if self._event:
+      self._event.wait()
+    self.threads.add(threading.current_thread())
+    self.calls.append(call)
+
+
+class AsyncAdderTest(absltest.TestCase):
+
+  def test_forwards_calls_in_order(self):
+    event = threading.Event()
+    wrapped = _RecordingAdder(event)
+    adder = adders.AsyncAdder(wrapped, queue_size=10)
+
+    adder.add_first(dm_env.restart(0))
+    adder.add(1, dm_env.transition(reward=0., observation=1), extras=2)
+    adder.add(3, dm_env.termination(reward=0., observation=4))
+
+    # The calls are queued while the wrapped adder is blocked.
+    self.assertEqual(adder.queue_depth, 3)
+    self.assertEmpty(wrapped.calls)
+
+    event.set()
+    adder.reset()
+    self.assertEqual(adder.queue_depth, 0)
+    self.assertEqual(wrapped.calls, [
+        ('add_first', 0),
+        ('add', 1, 1, 2),
+        ('add', 3, 4, ()),
+        ('reset',),
+    ])
+    self.assertNotIn(threading.current_thread(), wrapped.threads)
+    adder.close()
+
+  def test_close_forwards_pending_calls_then_closes(self):
+    event = threading.Event()
+    wrapped = _RecordingAdder(event)
+    adder = adders.AsyncAdder(wrapped)
+    adder.add_first(dm_env.restart(0))
+    event.set()
+    adder.close()
+    self.assertEqual(wrapped.calls, [('add_first', 0), ('close',)])
+
+  def test_raises_errors_once(self):
+    wrapped = _RecordingAdder(error_on_add=True)
+    adder = adders.AsyncAdder(wrapped)
+    adder.add_first(dm_env.restart(np.zeros(1)))
+    adder.add(0, dm_env.transition(reward=0., observation=np.zeros(1)))
+    with self.assertRaisesRegex(ValueError, 'add error'):
+      adder.flush()
+
+    # Later calls are forwarded again, e.g. for the next episode.
+    wrapped.error_on_add = False
+    adder.add_first(dm_env.restart(1))
+    adder.flush()
+    self.assertEqual(wrapped.calls[-1], ('add_first', 1))
+    adder.close()
+
+
+if __name__ == '__main__':
+  absltest.main()
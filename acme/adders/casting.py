@@ -0,0 +1,74 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Adder which casts rewards and discounts to the dtypes of their specs."""
+
+from acme import specs
+from acme import types
+from acme.adders import base
+import dm_env
+import numpy as np
+import tree
+
+
+class CastingAdder(base.Adder):
+  """Adder which casts rewards and discounts before forwarding them.
+
+  Environments often return Python floats or float64 rewards and discounts
+  whatever their specs say, and these (and everything computed from them, such
+  as n-step returns) would otherwise be inserted into replay with the wider
+  dtype. This adder casts them down to the dtypes of the environment's reward
+  and discount specs (e.g. float32) before passing them to the wrapped adder.
+  """
+
+  def __init__(self, adder: base.Adder,
+               environment_spec: specs.EnvironmentSpec):
+    """Initializes the adder.
+
+    Args:
+      adder: the adder to forward calls to.
+      environment_spec: the spec of the environment, giving the dtypes of its
+        rewards and discounts.
+    """
+    self._adder = adder
+    self._reward_spec = environment_spec.rewards
+    self._discount_spec = environment_spec.discounts
+
+  def add_first(self, timestep: dm_env.TimeStep):
+    self._adder.add_first(timestep)
+
+  def add(self,
+          action: types.NestedArray,
+          next_timestep: dm_env.TimeStep,
+          extras: types.NestedArray = ()):
+    next_timestep = next_timestep._replace(
+        reward=_cast(next_timestep.reward, self._reward_spec),
+        discount=_cast(next_timestep.discount, self._discount_spec))
+    self._adder.add(action, next_timestep, extras)
+
+  def reset(self):
+    self._adder.reset()
+
+  def close(self):
+    """Closes the wrapped adder, if it can be closed."""
+    close = getattr(self._adder, 'close', None)
+    if close is not None:
+      close()
+
+
+def _cast(value: types.NestedArray,
+          spec: types.NestedSpec) -> types.NestedArray:
+  return tree.map_structure(lambda x, s: np.asarray(x, dtype=s.dtype), value,
+                            spec)
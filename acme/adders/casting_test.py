@@ -0,0 +1,56 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the casting adder."""
+
+from absl.testing import absltest
+from acme import adders
+from acme import specs
+from acme.adders import reverb as reverb_adders
+from acme.adders.reverb import test_utils
+import dm_env
+import numpy as np
+
+
+class CastingAdderTest(absltest.TestCase):
+
+  def test_casts_rewards_and_discounts(self):
+    spec = specs.EnvironmentSpec(
+        observations=specs.Array((2,), np.uint8),
+        actions=specs.DiscreteArray(3),
+        rewards=specs.Array((), np.float32),
+        discounts=specs.BoundedArray((), np.float32, 0., 1.))
+    client = test_utils.FakeClient()
+    adder = adders.CastingAdder(
+        reverb_adders.NStepTransitionAdder(client, n_step=2, discount=0.9),
+        spec)
+
+    observation = np.zeros((2,), dtype=np.uint8)
+    adder.add_first(dm_env.restart(observation))
+    # Python floats would otherwise give float64 n-step returns and discounts.
+    adder.add(np.int32(0), dm_env.transition(1., observation, 1.))
+    adder.add(np.int32(0), dm_env.termination(1., observation))
+
+    self.assertNotEmpty(client.writers[0].timesteps)
+    for transition in client.writers[0].timesteps:
+      o_tm1, _, reward, discount, o_t, _ = transition
+      self.assertEqual(o_tm1.dtype, np.uint8)
+      self.assertEqual(o_t.dtype, np.uint8)
+      self.assertEqual(reward.dtype, np.float32)
+      self.assertEqual(discount.dtype, np.float32)
+
+
+if __name__ == '__main__':
+  absltest.main()
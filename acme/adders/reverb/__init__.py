@@ -23,6 +23,7 @@ from acme.adders.reverb.base import PriorityFn
 from acme.adders.reverb.base import PriorityFnInput
 from acme.adders.reverb.base import ReverbAdder
 from acme.adders.reverb.base import Step
+from acme.adders.reverb.base import uniform_priority
 # Internal imports.
 from acme.adders.reverb.episode import EpisodeAdder
 from acme.adders.reverb.sequence import SequenceAdder
@@ -17,13 +17,16 @@
 
 import abc
 import collections
-from typing import Callable, Mapping, NamedTuple, Optional
+from typing import Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional
 
+from absl import logging
 from acme import types
 from acme.adders import base
 
 import dm_env
+import numpy as np
 import reverb
+import tree
 
 DEFAULT_PRIORITY_TABLE = 'priority_table'
 
@@ -51,8 +54,152 @@ PriorityFn = Callable[['PriorityFnInput'], float]
 PriorityFnMapping = Mapping[str, PriorityFn]
 
 
+def uniform_priority(unused_input: PriorityFnInput) -> float:
+  """The default priority function which gives every item priority 1.0.
+
+  Adders recognize this function and skip building its (unused) input.
+
+  Args:
+    unused_input: the stacked steps, which are ignored.
+
+  Returns:
+    The uniform priority 1.0.
+  """
+  return 1.
+
+
+def has_uniform_priorities(priority_fns: PriorityFnMapping) -> bool:
+  """Returns whether every table uses the default `uniform_priority` fn."""
+  return all(fn is uniform_priority for fn in priority_fns.values())
+
+
+class StepBuffer:
+  """A fixed-size buffer of steps which can be read stacked along time.
+
+  This behaves like a `collections.deque` of `Step`s with the given `maxlen`,
+  i.e. appending to a full buffer discards its oldest step. In addition the
+  `stacked` method returns the buffered steps stacked along a new leading time
+  axis without copying them.
+
+  To do so the buffer keeps one preallocated array per leaf of a step which
+  steps are copied into in place as they are appended. Every step is written
+  twice, at positions `i` and `i + maxlen` of a ring of size `2 * maxlen`, so
+  that the buffered steps always form a contiguous slice of each array. These
+  arrays are only allocated (using the shapes and dtypes of the buffered steps)
+  the first time `stacked` is called, so a buffer which is never read stacked
+  costs no more than a deque.
+  """
+
+  def __init__(self, maxlen: int):
+    self._steps = collections.deque(maxlen=maxlen)
+    self._maxlen = maxlen
+    self._start = 0
+    self._arrays = None  # type: Optional[List[np.ndarray]]
+
+  @property
+  def maxlen(self) -> int:
+    return self._maxlen
+
+  def __len__(self) -> int:
+    return len(self._steps)
+
+  def __getitem__(self, index: int) -> Step:
+    return self._steps[index]
+
+  def __iter__(self) -> Iterator[Step]:
+    return iter(self._steps)
+
+  def append(self, step: Step):
+    """Appends a step, discarding the oldest step if the buffer is full."""
+    if not self._maxlen:
+      return
+    if len(self._steps) == self._maxlen:
+      position = self._start
+      self._start = (self._start + 1) % self._maxlen
+    else:
+      position = (self._start + len(self._steps)) % self._maxlen
+    self._steps.append(step)
+    if self._arrays is not None:
+      self._write(position, step)
+
+  def popleft(self) -> Step:
+    """Removes and returns the oldest step."""
+    self._start = (self._start + 1) % self._maxlen
+    return self._steps.popleft()
+
+  def clear(self):
+    """Removes all steps; any allocated arrays are kept for reuse."""
+    self._steps.clear()
+    self._start = 0
+
+  def stacked(self, final_step: Optional[Step] = None) -> Step:
+    """Returns the buffered steps stacked along a new leading time axis.
+
+    The leaves of the returned step are views into the buffer's arrays which
+    are overwritten as new steps are appended, so they must not be retained.
+
+    Args:
+      final_step: an optional additional step to stack after the buffered
+        steps, without appending it to the buffer.
+
+    Returns:
+      A `Step` whose leaves have a leading dimension of size `len(self)`, or
+      one more than that if `final_step` is given.
+
+    Raises:
+      ValueError: If there is nothing to stack.
+    """
+    structure = self._steps[0] if self._steps else final_step
+    if structure is None:
+      raise ValueError('Cannot stack an empty buffer.')
+
+    if self._arrays is None:
+      self._allocate(structure)
+      for offset, step in enumerate(self._steps):
+        self._write(self._start + offset, step)
+
+    start = self._start
+    stop = start + len(self._steps)
+    if final_step is not None:
+      # The slot following the buffered steps is free (or holds the unused
+      # mirror copy of the oldest step, which is rewritten when it is next
+      # appended) so the final step can be placed there.
+      for array, value in zip(self._arrays, tree.flatten(final_step)):
+        array[stop] = value
+      stop += 1
+
+    return tree.unflatten_as(structure,
+                             [array[start:stop] for array in self._arrays])
+
+  def _allocate(self, step: Step):
+    self._arrays = []
+    for value in tree.flatten(step):
+      value = np.asarray(value)
+      self._arrays.append(
+          np.zeros((2 * self._maxlen,) + value.shape, dtype=value.dtype))
+
+  def _write(self, position: int, step: Step):
+    position %= self._maxlen
+    for array, value in zip(self._arrays, tree.flatten(step)):
+      array[position] = value
+      array[position + self._maxlen] = value
+
+
 class ReverbAdder(base.Adder):
-  """Base class for Reverb adders."""
+  """Base class for Reverb adders.
+
+  Each adder streams its data through a single writer which is opened lazily
+  and kept open across episodes, as opening a new stream per episode is costly
+  for short episodes. Since items never reference steps from before the
+  current episode, episode boundaries only need to be tracked by the adder. If
+  a write fails the writer is discarded, along with the current episode, and a
+  new one is opened when the next episode starts.
+
+  The writer is flushed at the end of each episode, so that its last items are
+  sent without waiting for later steps to fill up the current chunk. Items of
+  an unfinished episode are only sent once their chunk fills up or the adder
+  is closed.
+  """
 
   def __init__(
       self,
@@ -81,7 +228,7 @@ class ReverbAdder(base.Adder):
     if priority_fns:
       priority_fns = dict(priority_fns)
     else:
-      priority_fns = {DEFAULT_PRIORITY_TABLE: lambda x: 1.}
+      priority_fns = {DEFAULT_PRIORITY_TABLE: uniform_priority}
 
     self._client = client
     self._priority_fns = priority_fns
@@ -96,7 +243,7 @@ class ReverbAdder(base.Adder):
 
     # The state of the adder is captured by a buffer of `buffer_size` steps
     # (generally SAR tuples) and one additional dangling observation.
-    self._buffer = collections.deque(maxlen=buffer_size)
+    self._buffer = StepBuffer(maxlen=buffer_size)
     self._next_observation = None
 
   @property
@@ -114,14 +261,53 @@ class ReverbAdder(base.Adder):
           'A priority function already exists for {}.'.format(table_name))
     self._priority_fns[table_name] = priority_fn
 
+  def _calculate_priorities(
+      self, final_step: Optional[Step] = None) -> Dict[str, float]:
+    """Calculates the priority of the buffered steps for each table.
+
+    The buffered steps, followed by `final_step` if given, are stacked along
+    the time dimension (without copying) and wrapped as a PriorityFnInput. See
+    `utils.calculate_priorities` for more details.
+
+    Args:
+      final_step: an optional step to include after the buffered steps.
+
+    Returns:
+      A dictionary mapping from table names to the priority (a float) for the
+      buffered steps.
+    """
+    # Avoid stacking the steps if none of the priority functions will use them.
+    if has_uniform_priorities(self._priority_fns):
+      return dict.fromkeys(self._priority_fns, 1.)
+
+    fn_input = PriorityFnInput(*self._buffer.stacked(final_step))
+    return {
+        table: priority_fn(fn_input)
+        for table, priority_fn in self._priority_fns.items()
+    }
+
   def reset(self):
-    """Resets the adder's buffer."""
-    if self.__writer:
-      self._writer.close()
-      self.__writer = None
+    """Resets the adder's buffer, keeping its writer open."""
     self._buffer.clear()
     self._next_observation = None
 
+  def close(self):
+    """Resets the adder and closes its writer, sending any pending data."""
+    self.reset()
+    if self.__writer:
+      self.__writer.close()
+      self.__writer = None
+
+  def _discard_writer(self):
+    """Abandons the current writer and episode after a failed write."""
+    self.reset()
+    writer, self.__writer = self.__writer, None
+    if writer:
+      try:
+        writer.close()
+      except Exception:  # pylint: disable=broad-except
+        logging.exception('Error closing a failed Reverb writer.')
+
   def add_first(self, timestep: dm_env.TimeStep):
     """Record the first observation of a trajectory."""
     if not timestep.first():
@@ -156,12 +342,19 @@ class ReverbAdder(base.Adder):
 
     # Record the next observation and write.
     self._next_observation = next_timestep.observation
-    self._write()
+    try:
+      self._write()
 
-    # Write the last "dangling" observation.
-    if next_timestep.last():
-      self._write_last()
-      self.reset()
+      # Write the last "dangling" observation and send the episode's data,
+      # keeping the stream open for the next episode.
+      if next_timestep.last():
+        self._write_last()
+        self._writer.flush()
+        self.reset()
+    except Exception:
+      # Reconnect on the next episode rather than reuse a broken stream.
+      self._discard_writer()
+      raise
 
   @abc.abstractmethod
   def _write(self):
@@ -0,0 +1,161 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the Reverb adder base."""
+
+import collections
+
+from absl.testing import absltest
+
+from acme.adders import reverb as adders
+from acme.adders.reverb import base
+from acme.adders.reverb import test_utils
+
+import numpy as np
+import reverb
+import tree
+
+
+def _make_step(value: float) -> base.Step:
+  return base.Step(
+      observation={'pixels': np.full((2, 2), value, dtype=np.float32)},
+      action=np.int32(value),
+      reward=value,
+      discount=np.float32(1.),
+      extras=())
+
+
+class StepBufferTest(absltest.TestCase):
+
+  def test_matches_deque(self):
+    buffer = base.StepBuffer(maxlen=3)
+    expected = collections.deque(maxlen=3)
+
+    # Interleave appends, reads and pops so that the ring wraps around.
+    for i in range(10):
+      step = _make_step(i)
+      buffer.append(step)
+      expected.append(step)
+      if i % 4 == 3:
+        self.assertIs(buffer.popleft(), expected.popleft())
+
+      self.assertLen(buffer, len(expected))
+      self.assertIs(buffer[-1], expected[-1])
+
+      final_step = _make_step(-1.)
+      stacked = buffer.stacked(final_step)
+      stacked_expected = tree.map_structure(
+          lambda *x: np.stack(x), *(list(expected) + [final_step]))
+      tree.map_structure(np.testing.assert_array_equal, stacked,
+                         stacked_expected)
+
+      # Stacking again without the final step must not be affected by it.
+      stacked = buffer.stacked()
+      stacked_expected = tree.map_structure(lambda *x: np.stack(x), *expected)
+      tree.map_structure(np.testing.assert_array_equal, stacked,
+                         stacked_expected)
+
+  def test_stacked_is_a_view(self):
+    buffer = base.StepBuffer(maxlen=4)
+    buffer.append(_make_step(1.))
+    buffer.append(_make_step(2.))
+    stacked = buffer.stacked()
+    self.assertIsNotNone(stacked.observation['pixels'].base)
+
+  def test_clear(self):
+    buffer = base.StepBuffer(maxlen=2)
+    buffer.append(_make_step(1.))
+    buffer.stacked()
+    buffer.clear()
+    self.assertEmpty(buffer)
+    buffer.append(_make_step(2.))
+    np.testing.assert_array_equal(buffer.stacked().reward, [2.])
+
+
+class _FailingWriter(test_utils.FakeWriter):
+  """Writer which fails to create its first item."""
+
+  def create_item(self, table, num_timesteps, priority):
+    raise RuntimeError('Connection lost')
+
+
+class _FailingClient(test_utils.FakeClient):
+  """Client whose first writer fails."""
+
+  def writer(self, max_sequence_length, delta_encoded=False, chunk_length=None):
+    if self.writers:
+      return super().writer(max_sequence_length, delta_encoded, chunk_length)
+    new_writer = _FailingWriter(max_sequence_length, delta_encoded,
+                                chunk_length)
+    self.writers.append(new_writer)
+    return new_writer
+
+
+class ReverbAdderTest(absltest.TestCase):
+
+  def test_reuses_writer_across_episodes(self):
+    client = test_utils.FakeClient()
+    adder = adders.NStepTransitionAdder(client, n_step=1, discount=1.)
+    for _ in range(3):
+      first, steps = test_utils.make_trajectory([1, 2, 3])
+      adder.add_first(first)
+      for step in steps:
+        adder.add(*step)
+
+    self.assertLen(client.writers, 1)
+    self.assertLen(client.writers[0].priorities, 6)
+    self.assertEqual(client.writers[0].num_flushes, 3)
+    adder.close()
+    self.assertTrue(client.writers[0].closed)
+
+  def test_reconnects_after_error(self):
+    client = _FailingClient()
+    adder = adders.NStepTransitionAdder(client, n_step=1, discount=1.)
+    first, steps = test_utils.make_trajectory([1, 2, 3])
+
+    adder.add_first(first)
+    with self.assertRaisesRegex(RuntimeError, 'Connection lost'):
+      adder.add(*steps[0])
+    self.assertTrue(client.writers[0].closed)
+
+    # The failed episode is abandoned and the next one uses a new writer.
+    adder.add_first(first)
+    for step in steps:
+      adder.add(*step)
+    self.assertLen(client.writers, 2)
+    self.assertLen(client.writers[1].priorities, 2)
+
+  def test_sends_episode_without_closing(self):
+    server = reverb.Server(
+        [reverb.Table.queue(adders.DEFAULT_PRIORITY_TABLE, max_size=10)],
+        port=None)
+    client = reverb.Client(f'localhost:{server.port}')
+    adder = adders.NStepTransitionAdder(client, n_step=1, discount=1.)
+    first, steps = test_utils.make_trajectory(
+        [np.float32(x) for x in (1, 2, 3)])
+    adder.add_first(first)
+    for action, timestep in steps:
+      adder.add(np.int32(action), timestep)
+
+    # The last item of the episode reaches the server while the adder (and so
+    # its writer) stays open.
+    table_info = client.server_info()[adders.DEFAULT_PRIORITY_TABLE]
+    self.assertEqual(table_info.current_size, 2)
+    adder.close()
+    server.stop()
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -75,11 +75,10 @@ class EpisodeAdder(base.ReverbAdder):
 
     # The length of the sequence we will be adding is the size of the buffer
     # plus one due to the final step.
-    steps = list(self._buffer) + [final_step]
-    num_steps = len(steps)
+    num_steps = len(self._buffer) + 1
 
     # Calculate the priority for this episode.
-    table_priorities = utils.calculate_priorities(self._priority_fns, steps)
+    table_priorities = self._calculate_priorities(final_step)
 
     # Create a prioritized item for each table.
     for table_name, priority in table_priorities.items():
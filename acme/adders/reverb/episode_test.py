@@ -56,8 +56,8 @@ class EpisodeAdderTest(parameterized.TestCase):
     action, step = steps[-1]
     adder.add(action, step)
 
-    # The writer should be closed and should have max_sequence_length timesteps.
-    self.assertTrue(client.writers[0].closed)
+    # The writer should be kept open and have max_sequence_length timesteps.
+    self.assertFalse(client.writers[0].closed)
     self.assertLen(client.writers[0].timesteps, max_sequence_length)
 
     # Make the sequence of data and the priority table entry we expect.
@@ -18,11 +18,13 @@
 This implements adders which add sequences or partial trajectories.
 """
 
-from typing import Optional
+from typing import Mapping, Optional, Sequence
 
+from acme import types
 from acme.adders.reverb import base
 from acme.adders.reverb import utils
 
+import dm_env
 import numpy as np
 import reverb
 import tree
@@ -39,6 +41,7 @@ class SequenceAdder(base.ReverbAdder):
       delta_encoded: bool = False,
       chunk_length: Optional[int] = None,
       priority_fns: Optional[base.PriorityFnMapping] = None,
+      sequence_extras: Sequence[str] = (),
   ):
     """Makes a SequenceAdder instance.
 
@@ -53,6 +56,15 @@ class SequenceAdder(base.ReverbAdder):
       chunk_length: Number of timesteps grouped together before delta encoding
         and compression. See `Client` for more information.
       priority_fns: See docstring for BaseAdder.
+      sequence_extras: Keys of the (dict) extras which are only needed at the
+        start of each sequence, e.g. the recurrent state of the actor. These
+        are written as zeros for every other step, which the compression of
+        replay chunks then reduces to almost nothing. Use the same keys with
+        `make_reverb_dataset` to sample them without a time dimension. Note
+        that this only reduces the bytes stored (and sent compressed): the
+        writer needs every step to have the same structure, so sampled
+        sequences still hold these extras (mostly zeros) for every step until
+        they are dropped after sampling.
     """
     super().__init__(
         client=client,
@@ -64,14 +76,36 @@ class SequenceAdder(base.ReverbAdder):
 
     self._period = period
     self._step = 0
+    self._sequence_extras = tuple(sequence_extras)
+    self._zero_sequence_extras = None
 
   def reset(self):
     self._step = 0
     super().reset()
 
+  def add(self,
+          action: types.NestedArray,
+          next_timestep: dm_env.TimeStep,
+          extras: types.NestedArray = ()):
+    """Record an action and the following timestep."""
+    if self._sequence_extras:
+      if not isinstance(extras, Mapping):
+        raise ValueError(
+            'Extras must be a dict to hold sequence_extras {}, got {}.'.format(
+                self._sequence_extras, type(extras).__name__))
+      missing = [key for key in self._sequence_extras if key not in extras]
+      if missing:
+        raise ValueError('Extras are missing sequence_extras {}.'.format(
+            missing))
+    super().add(action, next_timestep, extras)
+
   def _write(self):
-    # Append the previous step and increment number of steps written.
-    self._writer.append(self._buffer[-1])
+    # Append the previous step and increment number of steps written. Sequences
+    # start every `period` steps, so only these steps keep sequence extras.
+    step = self._buffer[-1]
+    if self._sequence_extras and self._step % self._period:
+      step = step._replace(extras=self._without_sequence_extras(step.extras))
+    self._writer.append(step)
     self._step += 1
     self._maybe_add_priorities()
 
@@ -104,6 +138,15 @@ class SequenceAdder(base.ReverbAdder):
     # Write priorities for the sequence.
     self._maybe_add_priorities()
 
+  def _without_sequence_extras(self, extras):
+    """Returns `extras` with the sequence extras replaced by zeros."""
+    if self._zero_sequence_extras is None:
+      self._zero_sequence_extras = {
+          key: tree.map_structure(np.zeros_like, extras[key])
+          for key in self._sequence_extras
+      }
+    return dict(extras, **self._zero_sequence_extras)
+
   def _maybe_add_priorities(self):
     if not (
         # Write the first time we hit the max sequence length...
@@ -114,9 +157,8 @@ class SequenceAdder(base.ReverbAdder):
       return
 
     # Compute priorities for the buffer.
-    steps = list(self._buffer)
-    num_steps = len(steps)
-    table_priorities = utils.calculate_priorities(self._priority_fns, steps)
+    num_steps = len(self._buffer)
+    table_priorities = self._calculate_priorities()
 
     # Create a prioritized item for each table.
     for table_name, priority in table_priorities.items():
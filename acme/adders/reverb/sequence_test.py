@@ -148,10 +148,9 @@ class SequenceAdderTest(parameterized.TestCase):
     # Add the final step.
     adder.add(*steps[-1])
 
-    # Ending the episode should close the writer. No new writer should yet have
-    # been created as it is constructed lazily.
+    # Ending the episode should keep the writer open for the next episode.
     self.assertLen(client.writers, 1)
-    self.assertTrue(client.writers[0].closed)
+    self.assertFalse(client.writers[0].closed)
 
     # Make sure our expected and observed transitions match.
     observed_sequences = list(p[1] for p in client.writers[0].priorities)
@@ -162,9 +161,47 @@ class SequenceAdderTest(parameterized.TestCase):
     adder.add_first(first)
     adder.add(*steps[0])
 
-    # Make sure this creates an open writer.
-    self.assertLen(client.writers, 2)
-    self.assertFalse(client.writers[1].closed)
+    # Make sure this reuses the open writer.
+    self.assertLen(client.writers, 1)
+    self.assertFalse(client.writers[0].closed)
+
+    # Closing the adder closes its writer.
+    adder.close()
+    self.assertTrue(client.writers[0].closed)
+
+  def test_sequence_extras(self):
+    client = test_utils.FakeClient()
+    adder = adders.SequenceAdder(
+        client, sequence_length=3, period=2, sequence_extras=('core_state',))
+
+    adder.add_first(dm_env.restart(0))
+    for t in range(1, 6):
+      extras = {'core_state': np.full(2, float(t)), 'logits': float(t)}
+      timestep = (dm_env.termination if t == 5 else dm_env.transition)(
+          reward=0.0, observation=t)
+      adder.add(0, timestep, extras)
+
+    observed_sequences = [p[1] for p in client.writers[0].priorities]
+    self.assertLen(observed_sequences, 2)
+    for start, sequence in zip([1, 3], observed_sequences):
+      # Only steps at which a sequence starts hold the core state.
+      core_states = [step.extras['core_state'][0] for step in sequence]
+      self.assertEqual(core_states, [start, 0., start + 2])
+      # Other extras are written for every step.
+      logits = [step.extras['logits'] for step in sequence]
+      self.assertEqual(logits, [start, start + 1, start + 2])
+
+  def test_sequence_extras_must_be_a_dict(self):
+    adder = adders.SequenceAdder(
+        test_utils.FakeClient(), sequence_length=3, period=1,
+        sequence_extras=('core_state',))
+    adder.add_first(dm_env.restart(0))
+    with self.assertRaisesRegex(ValueError, 'must be a dict'):
+      adder.add(0, dm_env.transition(reward=0., observation=1),
+                (np.zeros(2),))
+    with self.assertRaisesRegex(ValueError, 'missing'):
+      adder.add(0, dm_env.transition(reward=0., observation=1),
+                {'logits': np.zeros(2)})
 
 
 if __name__ == '__main__':
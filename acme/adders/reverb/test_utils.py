@@ -31,6 +31,7 @@ class FakeWriter:
 
     self.timesteps = []
     self.priorities = []
+    self.num_flushes = 0
     self.closed = False
 
   def append(self, timestep):
@@ -43,6 +44,10 @@ class FakeWriter:
     assert num_timesteps <= self.max_sequence_length
     self.priorities.append((table, self.timesteps[-num_timesteps:], priority))
 
+  def flush(self):
+    assert not self.closed, 'Trying to use closed Writer'
+    self.num_flushes += 1
+
   def close(self):
     assert not self.closed, 'Trying to use closed Writer'
     self.closed = True
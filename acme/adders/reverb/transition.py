@@ -19,11 +19,9 @@ This implements an N-step transition adder which collapses trajectory sequences
 into a single transition, simplifying to a simple transition adder when N=1.
 """
 
-import copy
-import itertools
-
 from typing import Optional
 
+from acme import types
 from acme.adders.reverb import base
 from acme.adders.reverb import utils
 
@@ -107,6 +105,18 @@ class NStepTransitionAdder(base.ReverbAdder):
     # Makes the additional discount a float32, which means that it will be
     # upcast if rewards/discounts are float64 and left alone otherwise.
     self._discount = np.float32(discount)
+    self._n_step = n_step
+
+    # Rewards and discounts of the buffered steps are additionally kept in
+    # preallocated ring buffers (created on the first write) so that n-step
+    # returns can be computed with vectorized operations. The number of steps
+    # written in the current episode determines the ring buffer position.
+    self._rewards = None
+    self._discounts = None
+    self._num_steps = 0
+
+    # Zero-filled final step, reused for every priority computation.
+    self._zero_step = None
 
     super().__init__(
         client=client,
@@ -114,7 +124,24 @@ class NStepTransitionAdder(base.ReverbAdder):
         max_sequence_length=1,
         priority_fns=priority_fns)
 
+  def reset(self):
+    self._num_steps = 0
+    super().reset()
+
   def _write(self):
+    # Record the reward and discount of the newly added step.
+    step = self._buffer[-1]
+    if self._rewards is None:
+      self._rewards = _ring_buffer(step.reward, self._n_step)
+      self._discounts = _ring_buffer(step.discount, self._n_step)
+    index = self._num_steps % self._n_step
+    self._rewards[index] = step.reward
+    self._discounts[index] = step.discount
+    self._num_steps += 1
+
+    self._write_transition()
+
+  def _write_transition(self):
     # NOTE: we do not check that the buffer is of length N here. This means
     # that at the beginning of an episode we will add the initial N-1
     # transitions (of size 1, 2, ...) and at the end of an episode (when
@@ -127,30 +154,35 @@ class NStepTransitionAdder(base.ReverbAdder):
     extras = self._buffer[0].extras
     next_observation = self._next_observation
 
-    # Initialize the n-step return and the discount accumulators. We make a
-    # copy of the first reward/discount so that when we add/multiply in place
-    # it won't change the actual reward or discount.
-    n_step_return = copy.deepcopy(self._buffer[0].reward)
-    total_discount = copy.deepcopy(self._buffer[0].discount)
-
-    # NOTE: total discount will have one less discount than it does
-    # step.discounts. This is so that when the learner/update uses an additional
-    # discount we don't apply it twice. Inside the following loop we will
-    # apply this right before summing up the n_step_return.
-    for step in itertools.islice(self._buffer, 1, None):
-      total_discount *= self._discount
-      n_step_return += step.reward * total_discount
-      total_discount *= step.discount
+    # Gather the rewards and discounts of the buffered steps, oldest first.
+    num_buffered = len(self._buffer)
+    indices = np.arange(self._num_steps - num_buffered,
+                        self._num_steps) % self._n_step
+    rewards = self._rewards[indices]
+    discounts = self._discounts[indices]
+
+    # The i-th reward is weighted by g^i * d_0 * ... * d_{i-1}. Note that the
+    # total discount has one less additional discount g than it has
+    # environment discounts d_i. This is so that when the learner/update uses
+    # an additional discount we don't apply it twice.
+    weights = np.empty_like(
+        discounts, dtype=np.result_type(discounts, self._discount))
+    weights[0] = 1.
+    weights[1:] = self._discount * discounts[:-1]
+    np.cumprod(weights, axis=0, out=weights)
+    total_discount = weights[-1] * discounts[-1]
+    ndim = max(weights.ndim, rewards.ndim)
+    n_step_return = np.sum(
+        _expand_dims(weights, ndim) * _expand_dims(rewards, ndim), axis=0)
 
     transition = (observation, action, n_step_return, total_discount,
                   next_observation, extras)
 
-    # Create a list of steps.
-    final_step = utils.final_step_like(self._buffer[0], next_observation)
-    steps = list(self._buffer) + [final_step]
-
     # Calculate the priority for this transition.
-    table_priorities = utils.calculate_priorities(self._priority_fns, steps)
+    if self._zero_step is None:
+      self._zero_step = utils.final_step_like(self._buffer[0], None)
+    final_step = self._zero_step._replace(observation=next_observation)
+    table_priorities = self._calculate_priorities(final_step)
 
     # Insert the transition into replay along with its priority.
     self._writer.append(transition)
@@ -162,5 +194,27 @@ class NStepTransitionAdder(base.ReverbAdder):
     # Drain the buffer until there are no transitions.
     self._buffer.popleft()
     while self._buffer:
-      self._write()
+      self._write_transition()
       self._buffer.popleft()
+
+
+def _ring_buffer(value: types.NestedArray, size: int) -> np.ndarray:
+  """Allocates a ring buffer holding `size` arrays shaped like `value`."""
+  value = np.asarray(value)
+  return np.zeros((size,) + value.shape, dtype=value.dtype)
+
+
+def _expand_dims(x: np.ndarray, ndim: int) -> np.ndarray:
+  """Inserts axes after the leading (time) axis so that `x` has rank `ndim`.
+
+  This aligns the trailing dimensions of stacked rewards and discounts so that
+  they broadcast against each other exactly as unstacked values would.
+
+  Args:
+    x: an array whose first axis is the time axis.
+    ndim: the desired rank.
+
+  Returns:
+    A reshaped view of `x`.
+  """
+  return x.reshape(x.shape[:1] + (1,) * (ndim - x.ndim) + x.shape[1:])
@@ -137,10 +137,9 @@ class NStepTransitionAdderTest(parameterized.TestCase):
     # Add the final step.
     adder.add(*steps[-1])
 
-    # Ending the episode should close the writer. No new writer should yet have
-    # been created as it is constructed lazily.
+    # Ending the episode should keep the writer open for the next episode.
     self.assertLen(client.writers, 1)
-    self.assertTrue(client.writers[0].closed)
+    self.assertFalse(client.writers[0].closed)
 
     # Make sure our expected and observed transitions match.
     observed_transitions = list(p[1][0] for p in client.writers[0].priorities)
@@ -151,9 +150,31 @@ class NStepTransitionAdderTest(parameterized.TestCase):
     adder.add_first(first)
     adder.add(*steps[0])
 
-    # Make sure this creates an open writer.
-    self.assertLen(client.writers, 2)
-    self.assertFalse(client.writers[1].closed)
+    # Make sure this reuses the open writer.
+    self.assertLen(client.writers, 1)
+    self.assertFalse(client.writers[0].closed)
+
+    # Closing the adder closes its writer.
+    adder.close()
+    self.assertTrue(client.writers[0].closed)
+
+  def test_priority_fn_input(self):
+    client = test_utils.FakeClient()
+
+    # Prioritize by the arrival state, which is the last stacked observation.
+    def priority_fn(inputs):
+      return float(inputs.observations[-1])
+
+    adder = adders.NStepTransitionAdder(
+        client, n_step=2, discount=1.0, priority_fns={'table': priority_fn})
+
+    first, steps = test_utils.make_trajectory([1, 2, 3, 4])
+    adder.add_first(first)
+    for step in steps:
+      adder.add(*step)
+
+    priorities = [p[2] for p in client.writers[0].priorities]
+    self.assertEqual(priorities, [2., 3., 4., 4.])
 
 
 if __name__ == '__main__':
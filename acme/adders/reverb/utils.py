@@ -19,7 +19,7 @@ from typing import Dict, Mapping, Sequence
 
 from acme import types
 from acme.adders.reverb import base
-from acme.tf import utils as tf2_utils
+from acme.utils import tree_utils
 
 import numpy as np
 import tree
@@ -70,8 +70,12 @@ def calculate_priorities(priority_fns: Mapping[str, base.PriorityFn],
     given collection of steps.
   """
 
+  # Avoid stacking the steps if none of the priority functions will use them.
+  if base.has_uniform_priorities(priority_fns):
+    return dict.fromkeys(priority_fns, 1.)
+
   # Stack the steps and wrap them as PrioityFnInput.
-  fn_input = base.PriorityFnInput(*tf2_utils.stack_sequence_fields(steps))
+  fn_input = base.PriorityFnInput(*tree_utils.stack_sequence_fields(steps))
 
   return {
       table: priority_fn(fn_input)
@@ -15,8 +15,10 @@
 
 """The base agent interface."""
 
-from typing import List
+import threading
+from typing import List, Optional
 
+from absl import logging
 from acme import core
 from acme import types
 # Internal imports.
@@ -40,10 +42,28 @@ class Agent(core.Actor, core.VariableSource):
 
   Note that the number of `observations_per_step` which can also be in the range
   [0, 1] in order to allow more steps per update.
+
+  If `asynchronous` is True the learner instead runs continuously in its own
+  thread, so that acting and learning overlap. The same ratio is then enforced
+  by a rate limiter: the learner waits while it would get ahead of the
+  observations and `observe` blocks while the learner lags behind by more than
+  `max_learner_lag` steps. The actor picks up new parameters in `update`.
+
+  Note that the learner thread writes its variables while the actor acts, so
+  with `asynchronous` the actor must not share (mutable) variables with the
+  learner, as e.g. the TF agents' actors share their Sonnet networks. Such an
+  actor could read partially updated variables in `select_action`; the actor
+  should instead hold its own copy, fetched through a variable client (as in
+  the JAX agents).
   """
 
-  def __init__(self, actor: core.Actor, learner: core.Learner,
-               min_observations: int, observations_per_step: float):
+  def __init__(self,
+               actor: core.Actor,
+               learner: core.Learner,
+               min_observations: int,
+               observations_per_step: float,
+               asynchronous: bool = False,
+               max_learner_lag: float = 100.):
     self._actor = actor
     self._learner = learner
 
@@ -61,6 +81,15 @@ class Agent(core.Actor, core.VariableSource):
       self._observations_per_update = 1
       self._steps_per_update = int(1.0 / observations_per_step)
 
+    self._learner_thread = None
+    if asynchronous:
+      self._rate_limiter = _RateLimiter(min_observations, observations_per_step,
+                                        max_learner_lag)
+      self._learner_error = []
+      self._learner_thread = threading.Thread(
+          target=self._run_learner, daemon=True)
+      self._learner_thread.start()
+
   def select_action(self, observation: types.NestedArray) -> types.NestedArray:
     return self._actor.select_action(observation)
 
@@ -74,8 +103,16 @@ class Agent(core.Actor, core.VariableSource):
   ):
     self._num_observations += 1
     self._actor.observe(action, next_timestep)
+    if self._learner_thread:
+      self._rate_limiter.insert()
 
   def update(self):
+    if self._learner_thread:
+      self._raise_learner_error()
+      # The learner steps in the background; just fetch its latest weights.
+      self._actor.update()
+      return
+
     # Only allow updates after some minimum number of observations have been and
     # then at some period given by observations_per_update.
     if (self._num_observations >= 0 and
@@ -88,8 +125,83 @@ class Agent(core.Actor, core.VariableSource):
       # Update actor weights after learner, note in TF this may be a no-op.
       self._actor.update()
 
+  def close(self):
+    """Stops the learner thread, if any, after its current step."""
+    if self._learner_thread:
+      self._rate_limiter.stop()
+      self._learner_thread.join()
+      self._raise_learner_error()
+
+  def _run_learner(self):
+    """Runs learner steps as allowed by the rate limiter."""
+    try:
+      while self._rate_limiter.acquire_step():
+        self._learner.step()
+    except Exception as e:  # pylint: disable=broad-except
+      logging.exception('Error in learner thread.')
+      self._learner_error.append(e)
+      # Unblock the actor so that it can surface the error.
+      self._rate_limiter.stop()
+
+  def _raise_learner_error(self):
+    if self._learner_error:
+      raise self._learner_error[0]
+
   def get_variables(self, names: List[str]) -> List[List[np.ndarray]]:
     return self._learner.get_variables(names)
 
+  def get_variables_version(self) -> Optional[int]:
+    return self._learner.get_variables_version()
+
+
+class _RateLimiter:
+  """Keeps the number of learner steps in line with the observations made.
+
+  The learner may take a step while it has taken fewer than
+  `(num_observations - min_observations) / observations_per_step` steps, and
+  observations block while the learner is more than `max_lag` steps short of
+  that target.
+  """
+
+  def __init__(self, min_observations: int, observations_per_step: float,
+               max_lag: float):
+    self._min_observations = min_observations
+    self._observations_per_step = observations_per_step
+    self._max_lag = max(max_lag, 1.)
+    self._num_observations = 0
+    self._num_steps = 0
+    self._stopped = False
+    self._condition = threading.Condition()
+
+  def _lag(self) -> float:
+    """Returns how many steps the learner is behind the observations."""
+    target = ((self._num_observations - self._min_observations) /
+              self._observations_per_step)
+    return target - self._num_steps
+
+  def insert(self):
+    """Records an observation, blocking while the learner lags behind."""
+    with self._condition:
+      self._num_observations += 1
+      self._condition.notify_all()
+      while not self._stopped and self._lag() > self._max_lag:
+        self._condition.wait()
+
+  def acquire_step(self) -> bool:
+    """Blocks until a learner step is allowed; returns False once stopped."""
+    with self._condition:
+      while not self._stopped and self._lag() < 1:
+        self._condition.wait()
+      if self._stopped:
+        return False
+      self._num_steps += 1
+      self._condition.notify_all()
+      return True
+
+  def stop(self):
+    with self._condition:
+      self._stopped = True
+      self._condition.notify_all()
+
 
 # Internal class.
@@ -0,0 +1,86 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the base agent."""
+
+import threading
+
+from absl.testing import absltest
+from acme import core
+from acme import environment_loop
+from acme import specs
+from acme.agents import agent
+from acme.testing import fakes
+
+
+class _Learner(core.Learner):
+  """Learner which counts its steps."""
+
+  def __init__(self, error_at_step: int = -1):
+    self.num_steps = 0
+    self.thread = None
+    self._error_at_step = error_at_step
+
+  def step(self):
+    self.thread = threading.current_thread()
+    self.num_steps += 1
+    if self.num_steps == self._error_at_step:
+      raise ValueError('learner error')
+
+  def get_variables(self, names):
+    return [[] for _ in names]
+
+
+class AgentTest(absltest.TestCase):
+
+  def _run(self, learner, asynchronous, num_episodes=10):
+    environment = fakes.DiscreteEnvironment(episode_length=10)
+    actor = fakes.Actor(specs.make_environment_spec(environment))
+    test_agent = agent.Agent(
+        actor,
+        learner,
+        min_observations=20,
+        observations_per_step=2,
+        asynchronous=asynchronous,
+        max_learner_lag=5)
+    loop = environment_loop.EnvironmentLoop(environment, test_agent)
+    loop.run(num_episodes=num_episodes)
+    return test_agent
+
+  def test_synchronous(self):
+    learner = _Learner()
+    self._run(learner, asynchronous=False)
+    # A step after the first 20 observations and every 2 observations after.
+    self.assertEqual(learner.num_steps, 41)
+    self.assertIs(learner.thread, threading.main_thread())
+
+  def test_asynchronous(self):
+    learner = _Learner()
+    test_agent = self._run(learner, asynchronous=True)
+    test_agent.close()
+    # The learner never gets ahead of the observations and lags by at most
+    # max_learner_lag steps.
+    self.assertBetween(learner.num_steps, 35, 40)
+    self.assertIsNot(learner.thread, threading.main_thread())
+
+  def test_asynchronous_error(self):
+    learner = _Learner(error_at_step=3)
+    with self.assertRaisesRegex(ValueError, 'learner error'):
+      test_agent = self._run(learner, asynchronous=True, num_episodes=100)
+      test_agent.close()
+
+
+if __name__ == '__main__':
+  absltest.main()
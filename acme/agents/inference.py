@@ -0,0 +1,255 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A server which batches policy evaluations for many concurrent actors."""
+
+import itertools
+import queue
+import threading
+import time
+from concurrent import futures
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+from acme import adders
+from acme import core
+from acme import types
+from acme.utils import tree_utils
+
+import dm_env
+import numpy as np
+import tree
+
+# A feed-forward policy maps a batch of observations to a batch of actions. A
+# recurrent policy additionally takes and returns a batch of states.
+FeedForwardPolicy = Callable[[types.NestedArray], types.NestedArray]
+RecurrentPolicy = Callable[[types.NestedArray, types.NestedArray],
+                           Tuple[types.NestedArray, types.NestedArray]]
+
+
+class _Request(NamedTuple):
+  client_id: int
+  observation: types.NestedArray
+  future: futures.Future
+
+
+class InferenceServer:
+  """Evaluates a policy on batches of observations from many actors.
+
+  Actors (see `InferenceActor`) submit single observations from their own
+  threads. A server thread collects these requests into a batch of at most
+  `max_batch_size` observations, waiting no more than `max_latency` seconds
+  after the first request for the batch to fill up, and evaluates the policy
+  once on the whole batch. This can be used as:
+
+    server = InferenceServer(policy, variable_client=variable_client)
+    actors = [InferenceActor(server, adder) for _ in range(num_actors)]
+    ...
+    server.stop()
+
+  If an `initial_state_fn` is given the policy is treated as recurrent, i.e. it
+  is called as `policy(observations, states)` and must return the actions and
+  the next states. The server keeps the state of each actor between calls and
+  resets it whenever that actor starts a new episode.
+
+  The server is the only user of the given `variable_client`, which is updated
+  before each batch is evaluated; the policy is expected to read its parameters
+  from that client (e.g. through a closure over `variable_client.params`).
+  Parameters are therefore copied once per server rather than once per actor.
+
+  Once the server is stopped, any requests it has not served fail with a
+  `RuntimeError`, as do requests made afterwards.
+  """
+
+  def __init__(
+      self,
+      policy: Union[FeedForwardPolicy, RecurrentPolicy],
+      variable_client: Optional[Any] = None,
+      initial_state_fn: Optional[Callable[[], types.NestedArray]] = None,
+      max_batch_size: int = 64,
+      max_latency: float = 1e-3,
+  ):
+    """Initializes and starts the server.
+
+    Args:
+      policy: a `FeedForwardPolicy`, or a `RecurrentPolicy` if
+        `initial_state_fn` is given, operating on batched inputs.
+      variable_client: an optional client whose `update` method is called
+        before each batch is evaluated.
+      initial_state_fn: returns the (unbatched) initial state of a recurrent
+        policy.
+      max_batch_size: the maximum number of observations evaluated together.
+      max_latency: maximum number of seconds to wait for a batch to fill up,
+        counted from the arrival of its first request.
+
+    Raises:
+      ValueError: if `max_batch_size` is less than 1.
+    """
+    if max_batch_size < 1:
+      raise ValueError('max_batch_size ({}) must be at least 1.'.format(
+          max_batch_size))
+
+    self._policy = policy
+    self._variable_client = variable_client
+    self._initial_state_fn = initial_state_fn
+    self._max_batch_size = max_batch_size
+    self._max_latency = max_latency
+
+    self._requests = queue.Queue()
+    self._states: Dict[int, types.NestedArray] = {}
+    self._states_lock = threading.Lock()
+    self._client_ids = itertools.count()
+    self._stop = object()
+    self._stopped = False
+    self._stop_lock = threading.Lock()
+
+    self._thread = threading.Thread(target=self._run, daemon=True)
+    self._thread.start()
+
+  def new_client_id(self) -> int:
+    """Returns an identifier to be used by a new client of the server."""
+    return next(self._client_ids)
+
+  def select_action(self, client_id: int,
+                    observation: types.NestedArray) -> types.NestedArray:
+    """Returns the action for a single observation, blocking until ready.
+
+    Args:
+      client_id: the identifier of the client making the request.
+      observation: a single (unbatched) observation.
+
+    Returns:
+      The action selected by the policy.
+
+    Raises:
+      RuntimeError: if the server is stopped before serving the request.
+    """
+    future = futures.Future()
+    with self._stop_lock:
+      if self._stopped:
+        raise RuntimeError('The inference server has been stopped.')
+      self._requests.put(_Request(client_id, observation, future))
+    return future.result()
+
+  def reset_state(self, client_id: int):
+    """Resets the recurrent state of the given client, if any."""
+    with self._states_lock:
+      self._states.pop(client_id, None)
+
+  def stop(self):
+    """Stops the server thread, failing any requests it has not served."""
+    with self._stop_lock:
+      if self._stopped:
+        return
+      self._stopped = True
+      self._requests.put(self._stop)
+    self._thread.join()
+
+    # Fail any requests which are still queued.
+    error = RuntimeError('The inference server has been stopped.')
+    while True:
+      try:
+        request = self._requests.get_nowait()
+      except queue.Empty:
+        break
+      if request is not self._stop:
+        request.future.set_exception(error)
+
+  def _run(self):
+    """Collects and evaluates batches of requests until stopped."""
+    while True:
+      request = self._requests.get()
+      if request is self._stop:
+        return
+      batch = [request]
+      deadline = time.time() + self._max_latency
+      stop = False
+      while len(batch) < self._max_batch_size:
+        try:
+          request = self._requests.get(
+              timeout=max(deadline - time.time(), 0.))
+        except queue.Empty:
+          break
+        if request is self._stop:
+          stop = True
+          break
+        batch.append(request)
+
+      try:
+        actions = self._evaluate(batch)
+      except Exception as e:  # pylint: disable=broad-except
+        for request in batch:
+          request.future.set_exception(e)
+      else:
+        for index, request in enumerate(batch):
+          request.future.set_result(
+              tree.map_structure(lambda a, i=index: a[i], actions))
+
+      if stop:
+        return
+
+  def _evaluate(self, batch) -> types.NestedArray:
+    """Evaluates the policy on a batch of requests."""
+    if self._variable_client is not None:
+      self._variable_client.update()
+
+    observations = tree_utils.stack_sequence_fields(
+        [request.observation for request in batch])
+    if self._initial_state_fn is None:
+      return tree.map_structure(np.asarray, self._policy(observations))
+
+    with self._states_lock:
+      states = [self._states.get(request.client_id) for request in batch]
+    states = [
+        self._initial_state_fn() if state is None else state
+        for state in states
+    ]
+    actions, new_states = self._policy(
+        observations, tree_utils.stack_sequence_fields(states))
+    new_states = tree.map_structure(np.asarray, new_states)
+    with self._states_lock:
+      for index, request in enumerate(batch):
+        self._states[request.client_id] = tree.map_structure(
+            lambda s, i=index: s[i], new_states)
+    return tree.map_structure(np.asarray, actions)
+
+
+class InferenceActor(core.Actor):
+  """An actor which selects actions through a shared `InferenceServer`.
+
+  The actor itself holds no parameters, so `update` does nothing; the server
+  keeps its policy up to date instead.
+  """
+
+  def __init__(self,
+               server: InferenceServer,
+               adder: Optional[adders.Adder] = None):
+    self._server = server
+    self._adder = adder
+    self._client_id = server.new_client_id()
+
+  def select_action(self, observation: types.NestedArray) -> types.NestedArray:
+    return self._server.select_action(self._client_id, observation)
+
+  def observe_first(self, timestep: dm_env.TimeStep):
+    self._server.reset_state(self._client_id)
+    if self._adder:
+      self._adder.add_first(timestep)
+
+  def observe(self, action: types.NestedArray, next_timestep: dm_env.TimeStep):
+    if self._adder:
+      self._adder.add(action, next_timestep)
+
+  def update(self):
+    pass
@@ -0,0 +1,168 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the batched inference server."""
+
+import threading
+
+from absl.testing import absltest
+from acme import environment_loop
+from acme import specs
+from acme.agents import inference
+from acme.testing import fakes
+import dm_env
+import numpy as np
+
+
+class _CountingPolicy:
+  """Feed-forward policy which records the size of each batch."""
+
+  def __init__(self):
+    self.batch_sizes = []
+
+  def __call__(self, observations):
+    self.batch_sizes.append(observations.shape[0])
+    return observations.sum(axis=-1).astype(np.int32)
+
+
+class _VariableClient:
+
+  def __init__(self):
+    self.num_updates = 0
+
+  def update(self):
+    self.num_updates += 1
+
+
+class InferenceServerTest(absltest.TestCase):
+
+  def test_batches_concurrent_requests(self):
+    policy = _CountingPolicy()
+    variable_client = _VariableClient()
+    num_actors = 8
+    num_steps = 20
+    server = inference.InferenceServer(
+        policy,
+        variable_client=variable_client,
+        max_batch_size=num_actors,
+        max_latency=0.05)
+    actors = [inference.InferenceActor(server) for _ in range(num_actors)]
+
+    results = [[] for _ in range(num_actors)]
+
+    def act(index):
+      for step in range(num_steps):
+        observation = np.array([index, step], dtype=np.float32)
+        results[index].append(actors[index].select_action(observation))
+
+    threads = [
+        threading.Thread(target=act, args=(i,)) for i in range(num_actors)
+    ]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    server.stop()
+
+    # Every actor receives the action for its own observation.
+    for index in range(num_actors):
+      self.assertEqual(results[index],
+                       [index + step for step in range(num_steps)])
+
+    # Requests were batched and the variables updated once per batch.
+    self.assertEqual(sum(policy.batch_sizes), num_actors * num_steps)
+    self.assertLess(len(policy.batch_sizes), num_actors * num_steps)
+    self.assertLessEqual(max(policy.batch_sizes), num_actors)
+    self.assertEqual(variable_client.num_updates, len(policy.batch_sizes))
+
+  def test_recurrent_state_per_client(self):
+
+    def policy(observations, states):
+      # Acts with the number of steps taken since the start of the episode.
+      del observations
+      return states, states + 1
+
+    server = inference.InferenceServer(
+        policy, initial_state_fn=lambda: np.zeros((), dtype=np.int32))
+    first = inference.InferenceActor(server)
+    second = inference.InferenceActor(server)
+    timestep = dm_env.restart(np.zeros((1,)))
+
+    first.observe_first(timestep)
+    second.observe_first(timestep)
+    self.assertEqual(first.select_action(timestep.observation), 0)
+    self.assertEqual(first.select_action(timestep.observation), 1)
+    self.assertEqual(second.select_action(timestep.observation), 0)
+
+    # Starting a new episode resets the state of that actor only.
+    first.observe_first(timestep)
+    self.assertEqual(first.select_action(timestep.observation), 0)
+    self.assertEqual(second.select_action(timestep.observation), 1)
+    server.stop()
+
+  def test_raises_policy_errors(self):
+
+    def policy(observations):
+      del observations
+      raise ValueError('policy error')
+
+    server = inference.InferenceServer(policy)
+    actor = inference.InferenceActor(server)
+    with self.assertRaisesRegex(ValueError, 'policy error'):
+      actor.select_action(np.zeros((1,)))
+    server.stop()
+
+  def test_stop_fails_later_requests(self):
+    called = threading.Event()
+    release = threading.Event()
+
+    def policy(observations):
+      called.set()
+      release.wait()
+      return np.zeros((observations.shape[0],), dtype=np.int32)
+
+    server = inference.InferenceServer(policy)
+    actor = inference.InferenceActor(server)
+    actions = []
+    thread = threading.Thread(
+        target=lambda: actions.append(actor.select_action(np.zeros((1,)))))
+    thread.start()
+    called.wait()
+
+    # Requests made before the server is stopped are still served.
+    stop_thread = threading.Thread(target=server.stop)
+    stop_thread.start()
+    release.set()
+    thread.join()
+    stop_thread.join()
+    self.assertEqual(actions, [0])
+
+    # Requests made once the server is stopped fail rather than block.
+    with self.assertRaises(RuntimeError):
+      actor.select_action(np.zeros((1,)))
+
+  def test_environment_loop(self):
+    environment = fakes.DiscreteEnvironment(episode_length=5)
+    spec = specs.make_environment_spec(environment)
+    policy = lambda obs: np.zeros((obs.shape[0],), dtype=spec.actions.dtype)
+    server = inference.InferenceServer(policy)
+    loop = environment_loop.EnvironmentLoop(
+        environment, inference.InferenceActor(server))
+    loop.run(num_episodes=2)
+    server.stop()
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -15,7 +15,7 @@
 
 """Simple JAX actors."""
 
-from typing import Callable, Optional
+from typing import Callable, Optional, Sequence
 
 from acme import adders
 from acme import core
@@ -27,6 +27,7 @@ import dm_env
 import haiku as hk
 import jax
 import jax.numpy as jnp
+import numpy as np
 
 # Useful type aliases.
 RNGKey = jnp.ndarray
@@ -69,3 +70,43 @@ class FeedForwardActor(core.Actor):
 
   def update(self):
     self._client.update()
+
+
+class BatchedFeedForwardActor(core.BatchedActor):
+  """A feed-forward actor which acts in a batch of environments at once.
+
+  The policy is evaluated once per step on observations stacked across all
+  environments. Each environment has its own (optional) adder so that episodes
+  ending at different times do not interfere with each other.
+  """
+
+  def __init__(
+      self,
+      policy: FeedForwardPolicy,
+      rng: hk.PRNGSequence,
+      variable_client: variable_utils.VariableClient,
+      adders: Optional[Sequence[adders.Adder]] = None,
+  ):
+    self._rng = rng
+    self._policy = jax.jit(policy, backend='cpu')
+
+    self._adders = adders
+    self._client = variable_client
+
+  def select_action(self,
+                    observations: types.NestedArray) -> types.NestedArray:
+    key = next(self._rng)
+    actions = self._policy(self._client.params, key, observations)
+    return jax.tree_util.tree_map(np.asarray, actions)
+
+  def observe_first(self, timestep: dm_env.TimeStep, index: int):
+    if self._adders:
+      self._adders[index].add_first(timestep)
+
+  def observe(self, action: types.NestedArray, next_timestep: dm_env.TimeStep,
+              index: int):
+    if self._adders:
+      self._adders[index].add(action, next_timestep)
+
+  def update(self):
+    self._client.update()
@@ -68,6 +68,33 @@ class ActorTest(absltest.TestCase):
     loop = environment_loop.EnvironmentLoop(environment, actor)
     loop.run(20)
 
+  def test_batched_feedforward(self):
+    environments = [_make_fake_env() for _ in range(3)]
+    env_spec = specs.make_environment_spec(environments[0])
+
+    def policy(inputs: jnp.ndarray):
+      return hk.Sequential([
+          hk.Flatten(),
+          hk.Linear(env_spec.actions.num_values),
+          lambda x: jnp.argmax(x, axis=-1),
+      ])(
+          inputs)
+
+    policy = hk.transform(policy, apply_rng=True)
+
+    rng = hk.PRNGSequence(1)
+    dummy_obs = utils.add_batch_dim(utils.zeros_like(env_spec.observations))
+    params = policy.init(next(rng), dummy_obs)
+
+    variable_source = fakes.VariableSource(params)
+    variable_client = variable_utils.VariableClient(variable_source, 'policy')
+
+    actor = actors.BatchedFeedForwardActor(
+        policy.apply, rng=hk.PRNGSequence(1), variable_client=variable_client)
+
+    loop = environment_loop.BatchedEnvironmentLoop(environments, actor)
+    loop.run(20)
+
 
 if __name__ == '__main__':
   absltest.main()
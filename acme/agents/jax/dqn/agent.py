@@ -15,12 +15,15 @@
 
 """DQN agent implementation."""
 
+from typing import Optional
+
 from acme import datasets
 from acme import specs
 from acme.adders import reverb as adders
 from acme.agents import agent
 from acme.agents.jax import actors
 from acme.agents.jax.dqn import learning
+from acme.datasets import local_replay
 from acme.jax import networks
 from acme.jax import variable_utils
 import haiku as hk
@@ -55,34 +58,104 @@ class DQN(agent.Agent):
       epsilon: float = 0.,
       learning_rate: float = 1e-3,
       discount: float = 0.99,
+      priority_update_period: int = 1,
+      num_sgd_steps_per_step: int = 1,
+      in_process_replay: bool = False,
+      num_stacked_frames: Optional[int] = None,
+      asynchronous: bool = False,
+      max_learner_lag: float = 100.,
   ):
-    """Initialize the agent."""
-
-    # Create a replay server to add data to. This uses no limiter behavior in
-    # order to allow the Agent interface to handle it.
-    replay_table = reverb.Table(
-        name=adders.DEFAULT_PRIORITY_TABLE,
-        sampler=reverb.selectors.Prioritized(priority_exponent),
-        remover=reverb.selectors.Fifo(),
-        max_size=max_replay_size,
-        rate_limiter=reverb.rate_limiters.MinSize(1))
-    self._server = reverb.Server([replay_table], port=None)
+    """Initialize the agent.
+
+    Args:
+      environment_spec: description of the actions, observations, etc.
+      network: the online Q network (the one being optimized).
+      batch_size: batch size for updates.
+      prefetch_size: size to prefetch from replay.
+      target_update_period: number of learner steps to perform before updating
+        the target networks.
+      samples_per_insert: number of samples to take from replay for every
+        insert that is made.
+      min_replay_size: minimum replay size before updating.
+      max_replay_size: maximum replay size.
+      importance_sampling_exponent: power to which importance weights are
+        raised before normalizing.
+      priority_exponent: exponent used in prioritized sampling.
+      n_step: number of steps to squash into a single transition.
+      epsilon: probability of taking a random action.
+      learning_rate: learning rate for the q-network update.
+      discount: discount to use for TD updates.
+      priority_update_period: number of learner steps whose priority updates
+        are sent to replay together.
+      num_sgd_steps_per_step: number of SGD steps run by each learner step.
+      in_process_replay: whether to keep replay in this process (see
+        `acme.datasets.local_replay`) rather than in a Reverb server.
+      num_stacked_frames: if given along with `in_process_replay`, the number
+        of frames stacked along the last axis of observations (e.g. for
+        Atari), which are then each stored only once in replay.
+      asynchronous: whether to run the learner continuously in its own thread
+        (see `acme.agents.agent.Agent`). The actor only reads copies of the
+        learner's parameters, fetched by its variable client.
+      max_learner_lag: if `asynchronous`, the number of learner steps by which
+        the learner may fall behind before observing blocks.
+    """
+
+    if in_process_replay:
+      # Keep replay in this process, avoiding the cost of sending each item to
+      # (and sampling it from) a replay server.
+      frame_leaves, frame_storage = (), None
+      if num_stacked_frames:
+        frame_leaves = local_replay.stacked_observation_leaves(
+            environment_spec, num_stacked_frames, transition_adder=True)
+        # Transitions mostly add a single new frame, plus a few to start each
+        # episode.
+        frame_storage = local_replay.FrameStorage(
+            capacity=max_replay_size + max_replay_size // 4 +
+            4 * num_stacked_frames,
+            stack_size=num_stacked_frames)
+      replay_client = local_replay.Client([
+          local_replay.Table(
+              name=adders.DEFAULT_PRIORITY_TABLE,
+              max_size=max_replay_size,
+              priority_exponent=priority_exponent,
+              rate_limiter=local_replay.MinSize(1),
+              frame_leaves=frame_leaves,
+              frame_storage=frame_storage)
+      ])
+      adder_client = replay_client
+      iterator = local_replay.make_iterator(
+          client=replay_client,
+          environment_spec=environment_spec,
+          batch_size=batch_size,
+          transition_adder=True)
+    else:
+      # Create a replay server to add data to. This uses no limiter behavior
+      # in order to allow the Agent interface to handle it.
+      replay_table = reverb.Table(
+          name=adders.DEFAULT_PRIORITY_TABLE,
+          sampler=reverb.selectors.Prioritized(priority_exponent),
+          remover=reverb.selectors.Fifo(),
+          max_size=max_replay_size,
+          rate_limiter=reverb.rate_limiters.MinSize(1))
+      self._server = reverb.Server([replay_table], port=None)
+      address = f'localhost:{self._server.port}'
+      replay_client = reverb.Client(address)
+      adder_client = reverb.Client(address)
+
+      # The iterator provides an interface to sample from replay.
+      iterator = datasets.make_reverb_numpy_iterator(
+          client=reverb.Client(address),
+          environment_spec=environment_spec,
+          batch_size=batch_size,
+          prefetch_size=prefetch_size,
+          transition_adder=True)
 
     # The adder is used to insert observations into replay.
-    address = f'localhost:{self._server.port}'
     adder = adders.NStepTransitionAdder(
-        client=reverb.Client(address),
+        client=adder_client,
         n_step=n_step,
         discount=discount)
 
-    # The dataset provides an interface to sample from replay.
-    dataset = datasets.make_reverb_dataset(
-        client=reverb.TFClient(address),
-        environment_spec=environment_spec,
-        batch_size=batch_size,
-        prefetch_size=prefetch_size,
-        transition_adder=True)
-
     def policy(params: hk.Params, key: jnp.ndarray,
                observation: jnp.ndarray) -> jnp.ndarray:
       action_values = hk.transform(network).apply(params, observation)
@@ -97,8 +170,10 @@ class DQN(agent.Agent):
         discount=discount,
         importance_sampling_exponent=importance_sampling_exponent,
         target_update_period=target_update_period,
-        iterator=dataset.as_numpy_iterator(),
-        replay_client=reverb.Client(address),
+        iterator=iterator,
+        replay_client=replay_client,
+        priority_update_period=priority_update_period,
+        num_sgd_steps_per_step=num_sgd_steps_per_step,
     )
 
     variable_client = variable_utils.VariableClient(learner, 'foo')
@@ -113,4 +188,13 @@ class DQN(agent.Agent):
         actor=actor,
         learner=learner,
         min_observations=max(batch_size, min_replay_size),
-        observations_per_step=float(batch_size) / samples_per_insert)
+        # Each learner step consumes `num_sgd_steps_per_step` batches.
+        observations_per_step=(float(batch_size * num_sgd_steps_per_step) /
+                               samples_per_insert),
+        asynchronous=asynchronous,
+        max_learner_lag=max_learner_lag)
+
+  def close(self):
+    """Stops learning and sends any pending priority updates to replay."""
+    super().close()
+    self._learner.close()
@@ -16,6 +16,7 @@
 """Tests for DQN agent."""
 
 from absl.testing import absltest
+from absl.testing import parameterized
 
 import acme
 from acme import specs
@@ -26,9 +27,12 @@ import haiku as hk
 import numpy as np
 
 
-class DQNTest(absltest.TestCase):
+class DQNTest(parameterized.TestCase):
 
-  def test_dqn(self):
+  @parameterized.parameters(
+      (1, False, False), (2, False, False), (1, True, False), (1, True, True))
+  def test_dqn(self, num_sgd_steps_per_step: int, in_process_replay: bool,
+               asynchronous: bool):
     # Create a fake environment to test with.
     environment = fakes.DiscreteEnvironment(
         num_actions=5,
@@ -51,12 +55,18 @@ class DQNTest(absltest.TestCase):
         network=network,
         batch_size=10,
         samples_per_insert=2,
-        min_replay_size=10)
+        min_replay_size=10,
+        num_sgd_steps_per_step=num_sgd_steps_per_step,
+        in_process_replay=in_process_replay,
+        asynchronous=asynchronous,
+        max_learner_lag=1.)
 
-    # Try running the environment loop. We have no assertions here because all
-    # we care about is that the agent runs without raising any errors.
+    # Try running the environment loop. Whether or not the learner runs in its
+    # own thread, observing waits for it to take its share of steps.
     loop = acme.EnvironmentLoop(environment, agent)
     loop.run(num_episodes=20)
+    agent.close()
+    self.assertGreater(agent.get_variables_version(), 0)
 
 
 if __name__ == '__main__':
@@ -15,7 +15,7 @@
 
 """DQN learner implementation."""
 
-from typing import Iterator, List, NamedTuple, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Tuple
 
 import acme
 from acme.adders import reverb as adders
@@ -24,11 +24,13 @@ from acme.jax import utils
 from acme.utils import async_utils
 from acme.utils import counting
 from acme.utils import loggers
+from acme.utils import profiling
 from dm_env import specs
 import haiku as hk
 import jax
 from jax.experimental import optix
 import jax.numpy as jnp
+import numpy as np
 import reverb
 import rlax
 
@@ -47,6 +49,37 @@ class LearnerOutputs(NamedTuple):
   priorities: jnp.ndarray
 
 
+class _PriorityUpdater:
+  """Sends priority updates to replay as batched mutations.
+
+  The updates of `period` consecutive learner steps are merged, keeping the
+  latest priority for each key, and sent as a single `mutate_priorities` call.
+  """
+
+  def __init__(self, client: reverb.Client, table: str, period: int):
+    self._client = client
+    self._table = table
+    self._period = period
+    self._updates = {}  # type: Dict[int, float]
+    self._num_steps = 0
+
+  def __call__(self, outputs: LearnerOutputs):
+    # Outputs of multiple SGD steps are stacked; later steps take precedence.
+    keys = np.asarray(outputs.keys).ravel().tolist()
+    priorities = np.asarray(outputs.priorities).ravel().tolist()
+    self._updates.update(zip(keys, priorities))
+    self._num_steps += 1
+    if self._num_steps >= self._period:
+      self.flush()
+
+  def flush(self):
+    """Sends any pending updates to replay."""
+    if self._updates:
+      self._client.mutate_priorities(table=self._table, updates=self._updates)
+    self._updates = {}
+    self._num_steps = 0
+
+
 class DQNLearner(acme.Learner, acme.Saveable):
   """DQN learner."""
 
@@ -64,9 +97,28 @@ class DQNLearner(acme.Learner, acme.Saveable):
                max_abs_reward: float = 1.,
                huber_loss_parameter: float = 1.,
                replay_client: reverb.Client = None,
+               priority_update_period: int = 1,
+               num_sgd_steps_per_step: int = 1,
                counter: counting.Counter = None,
-               logger: loggers.Logger = None):
-    """Initializes the learner."""
+               logger: loggers.Logger = None,
+               timer: profiling.Timer = None):
+    """Initializes the learner.
+
+    Priority updates for each learner step are sent to replay as a single
+    batched mutation. If `priority_update_period` is greater than one, the
+    updates of that many consecutive steps are merged (keeping the latest
+    priority of each key) before being sent; `close` sends any updates still
+    pending.
+
+    If `num_sgd_steps_per_step` is greater than one, each call to `step` draws
+    that many batches from the iterator and runs all of the corresponding SGD
+    steps (including target network updates) in a single compiled call, so
+    that counters and logs are only updated once per call.
+
+    If a `timer` is given, latency percentiles of sampling, SGD, priority
+    updates and logging are written to the logs. Timing SGD waits for its
+    results, which removes some of the overlap of host and device work.
+    """
 
     # Transform network into a pure function.
     network = hk.transform(network)
@@ -121,21 +173,39 @@ class DQNLearner(acme.Learner, acme.Saveable):
 
       return new_state, outputs
 
-    def update_priorities(outputs: LearnerOutputs):
-      for key, priority in zip(outputs.keys, outputs.priorities):
-        replay_client.mutate_priorities(
-            table=adders.DEFAULT_PRIORITY_TABLE, updates={key: priority})
+    def multi_sgd_step(
+        state: TrainingState,
+        samples: reverb.ReplaySample) -> Tuple[TrainingState, LearnerOutputs]:
+      """Runs SGD steps for batches stacked along the leading axis."""
+
+      def body(state, sample):
+        state, outputs = sgd_step(state, sample)
+        # Periodically update target network parameters.
+        update_target = state.step % target_update_period == 0
+        target_params = jax.tree_multimap(
+            lambda p, t: jnp.where(update_target, p, t), state.params,
+            state.target_params)
+        return state._replace(target_params=target_params), outputs
+
+      return jax.lax.scan(body, state, samples)
 
     # Internalise agent components (replay buffer, networks, optimizer).
     self._replay_client = replay_client
-    self._iterator = utils.prefetch(iterator)
+    # Batches for multiple SGD steps are stacked by the prefetching threads.
+    self._iterator = utils.prefetch(
+        iterator,
+        device=jax.devices()[0],
+        num_batches=(num_sgd_steps_per_step
+                     if num_sgd_steps_per_step > 1 else None))
 
     # Internalise the hyperparameters.
     self._target_update_period = target_update_period
+    self._num_sgd_steps_per_step = num_sgd_steps_per_step
 
     # Internalise logging/counting objects.
     self._counter = counter or counting.Counter()
     self._logger = logger or loggers.TerminalLogger('learner', time_delta=1.)
+    self._timer = timer or profiling.Timer(enabled=False)
 
     # Initialise parameters and optimiser state.
     initial_params = network.init(
@@ -152,31 +222,61 @@ class DQNLearner(acme.Learner, acme.Saveable):
 
     self._forward = jax.jit(network.apply)
     self._sgd_step = jax.jit(sgd_step)
-    self._async_priority_updater = async_utils.AsyncExecutor(update_priorities)
+    self._multi_sgd_step = jax.jit(multi_sgd_step)
+    self._priority_updater = _PriorityUpdater(
+        replay_client, adders.DEFAULT_PRIORITY_TABLE, priority_update_period)
+    self._async_priority_updater = async_utils.AsyncExecutor(
+        self._priority_updater)
 
   def step(self):
-    samples = next(self._iterator)
-    # Do a batch of SGD.
-    # TODO(jaslanides): Log metrics.
-    self._state, outputs = self._sgd_step(self._state, samples)
+    with self._timer.time('sample'):
+      samples = next(self._iterator)
 
-    # Update our counts and record it.
-    result = self._counter.increment(steps=1)
+    with self._timer.time('sgd_step'):
+      if self._num_sgd_steps_per_step > 1:
+        # Do several batches of SGD in a single compiled call.
+        self._state, outputs = self._multi_sgd_step(self._state, samples)
+      else:
+        # Do a batch of SGD.
+        # TODO(jaslanides): Log metrics.
+        self._state, outputs = self._sgd_step(self._state, samples)
+
+        # Periodically update target network parameters.
+        if self._state.step % self._target_update_period == 0:
+          self._state = self._state._replace(target_params=self._state.params)
 
-    # Periodically update target network parameters.
-    if self._state.step % self._target_update_period == 0:
-      self._state = self._state._replace(target_params=self._state.params)
+      if self._timer.enabled:
+        jax.tree_util.tree_map(lambda x: x.block_until_ready(), outputs)
+
+    # Update our counts and record it.
+    result = self._counter.increment(steps=self._num_sgd_steps_per_step)
 
     # Update priorities in replay.
     if self._replay_client:
-      self._async_priority_updater.put(outputs)
-
-    # Write to logs.
-    self._logger.write(result)
+      with self._timer.time('priority_update'):
+        self._async_priority_updater.put(outputs)
+
+    # Write to logs, including whether the learner is waiting for data.
+    with self._timer.time('write'):
+      self._logger.write({
+          **result,
+          **self._iterator.get_metrics(),
+          **self._timer.get_periodic_metrics()
+      })
+
+  def close(self):
+    """Sends any pending priority updates to replay and stops updating them."""
+    self._async_priority_updater.join()
+    self._async_priority_updater.close()
+    # Updates merged over a partial period have not been sent yet.
+    self._priority_updater.flush()
 
   def get_variables(self, names: List[str]) -> List[hk.Params]:
     return [self._state.params]
 
+  def get_variables_version(self) -> int:
+    return int(self._state.step)
+
   def save(self) -> TrainingState:
     return self._state
 
@@ -0,0 +1,87 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the DQN learner."""
+
+from absl.testing import absltest
+
+from acme import specs
+from acme.adders import reverb as adders
+from acme.agents.jax.dqn import learning
+from acme.datasets import local_replay
+from acme.testing import fakes
+
+import haiku as hk
+from jax.experimental import optix
+import numpy as np
+
+
+class _RecordingClient(local_replay.Client):
+  """Records the priority updates sent to replay."""
+
+  def __init__(self, tables):
+    super().__init__(tables)
+    self.updates = []
+
+  def mutate_priorities(self, table, updates=None, deletes=None):
+    self.updates.append(dict(updates))
+    super().mutate_priorities(table, updates, deletes)
+
+
+class DQNLearnerTest(absltest.TestCase):
+
+  def test_close_sends_pending_priority_updates(self):
+    environment = fakes.DiscreteEnvironment(
+        num_actions=3, num_observations=5, obs_shape=(4,),
+        obs_dtype=np.float32, episode_length=10)
+    spec = specs.make_environment_spec(environment)
+    client = _RecordingClient([
+        local_replay.Table(
+            adders.DEFAULT_PRIORITY_TABLE, max_size=100, priority_exponent=1.)
+    ])
+    adder = adders.NStepTransitionAdder(client, n_step=1, discount=1.)
+
+    action = spec.actions.generate_value()
+    timestep = environment.reset()
+    adder.add_first(timestep)
+    while not timestep.last():
+      timestep = environment.step(action)
+      adder.add(action, timestep)
+
+    def network(x):
+      return hk.nets.MLP([spec.actions.num_values])(hk.Flatten()(x))
+
+    learner = learning.DQNLearner(
+        network=network,
+        obs_spec=spec.observations,
+        discount=1.,
+        importance_sampling_exponent=0.2,
+        target_update_period=10,
+        iterator=local_replay.make_iterator(
+            client, spec, batch_size=4, transition_adder=True),
+        optimizer=optix.adam(1e-3),
+        rng=hk.PRNGSequence(1),
+        replay_client=client,
+        priority_update_period=3)
+
+    # The updates of the fourth step are only merged until the learner closes.
+    for _ in range(4):
+      learner.step()
+    learner.close()
+    self.assertLen(client.updates, 2)
+
+
+if __name__ == '__main__':
+  absltest.main()
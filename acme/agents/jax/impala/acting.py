@@ -15,7 +15,7 @@
 
 """IMPALA actor implementation."""
 
-from typing import Callable, Optional, Tuple
+from typing import Callable, Optional, Sequence, Tuple
 
 from acme import adders
 from acme import core
@@ -26,6 +26,7 @@ import dm_env
 import haiku as hk
 import jax
 import jax.numpy as jnp
+import numpy as np
 
 
 _LogitsAndValue = Tuple[networks.Logits, networks.Value]
@@ -96,3 +97,100 @@ class IMPALAActor(core.Actor):
   def update(self):
     if self._variable_client:
       self._variable_client.update()
+
+
+class BatchedIMPALAActor(core.BatchedActor):
+  """A recurrent actor which acts in a batch of environments at once.
+
+  The recurrent state of all N environments is kept as a single [N, ...] array
+  (per leaf) and the policy is evaluated in one compiled step for the whole
+  batch; `forward_fn` itself operates on a single, unbatched observation and
+  state, and is vectorized over the batch. Rather than discarding the state at
+  the start of an episode, environments which started a new episode are marked
+  in a reset mask and their rows of the state are re-initialized inside the
+  compiled step.
+
+  Each environment has its own (optional) adder, to which the logits and the
+  core state used for that environment's action are added as extras.
+  """
+
+  def __init__(
+      self,
+      forward_fn: PolicyValueFn,
+      initial_state_fn: Callable[[], hk.LSTMState],
+      rng: hk.PRNGSequence,
+      variable_client: variable_utils.VariableClient,
+      adders: Optional[Sequence[adders.Adder]] = None,
+  ):
+
+    # Store these for later use.
+    self._adders = adders
+    self._variable_client = variable_client
+    self._rng = rng
+
+    self._initial_state = hk.transform(initial_state_fn).apply(None)
+    self._state = None
+    self._prev_state = None
+    self._prev_logits = None
+    self._resets = set()
+
+    def step(params, key, observations, state, reset):
+      # Re-initialize the state of environments starting a new episode.
+      def maybe_reset(initial_state, state):
+        mask = jnp.reshape(reset, reset.shape + (1,) * (state.ndim - 1))
+        return jnp.where(mask, initial_state, state)
+
+      state = jax.tree_multimap(maybe_reset, self._initial_state, state)
+      (logits, _), new_state = jax.vmap(
+          forward_fn, in_axes=(None, 0, 0))(params, observations, state)
+      actions = jax.random.categorical(key, logits)
+      return actions, logits, state, new_state
+
+    self._step = jax.jit(step, backend='cpu')
+
+  def select_action(self,
+                    observations: types.Observation) -> types.Action:
+    num_environments = jax.tree_util.tree_leaves(observations)[0].shape[0]
+    if self._state is None:
+      self._state = jax.tree_util.tree_map(
+          lambda x: jnp.broadcast_to(x, (num_environments,) + x.shape),
+          self._initial_state)
+
+    reset = np.zeros(num_environments, dtype=bool)
+    reset[list(self._resets)] = True
+    self._resets.clear()
+
+    actions, logits, state, self._state = self._step(
+        self._variable_client.params, next(self._rng), observations,
+        self._state, reset)
+
+    # Convert the extras once per step rather than once per environment.
+    if self._adders:
+      self._prev_logits = np.asarray(logits)
+      self._prev_state = jax.tree_util.tree_map(np.asarray, state)
+
+    return np.asarray(actions)
+
+  def observe_first(self, timestep: dm_env.TimeStep, index: int):
+    if self._adders:
+      self._adders[index].add_first(timestep)
+
+    # Mark the state to be re-initialized at the next policy call.
+    self._resets.add(index)
+
+  def observe(
+      self,
+      action: types.Action,
+      next_timestep: dm_env.TimeStep,
+      index: int,
+  ):
+    if not self._adders:
+      return
+
+    core_state = jax.tree_util.tree_map(lambda s: s[index], self._prev_state)
+    extras = {'logits': self._prev_logits[index], 'core_state': core_state}
+    self._adders[index].add(action, next_timestep, extras)
+
+  def update(self):
+    if self._variable_client:
+      self._variable_client.update()
@@ -0,0 +1,98 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the IMPALA actors."""
+
+from typing import Optional
+
+from absl.testing import absltest
+from acme import environment_loop
+from acme import specs
+from acme.agents.jax.impala import acting
+from acme.jax import networks
+from acme.jax import variable_utils
+from acme.testing import fakes
+import haiku as hk
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+
+class _FakeAdder:
+  """Records the extras added for each step."""
+
+  def __init__(self):
+    self.extras = []
+
+  def add_first(self, timestep):
+    del timestep
+
+  def add(self, action, next_timestep, extras=()):
+    del action, next_timestep
+    self.extras.append(extras)
+
+
+class BatchedIMPALAActorTest(absltest.TestCase):
+
+  def test_batched_actor(self):
+    environments = [
+        fakes.DiscreteEnvironment(
+            num_actions=5,
+            num_observations=10,
+            obs_shape=(10, 5),
+            obs_dtype=np.float32,
+            episode_length=10 + i) for i in range(3)
+    ]
+    spec = specs.make_environment_spec(environments[0])
+
+    def forward_fn(x, s):
+      embeddings = hk.nets.MLP([20])(jnp.reshape(x, [-1]))
+      embeddings, new_state = hk.LSTM(20)(embeddings, s)
+      return networks.PolicyValueHead(spec.actions.num_values)(
+          embeddings), new_state
+
+    def initial_state_fn(batch_size: Optional[int] = None):
+      return hk.LSTM(20).initial_state(batch_size)
+
+    rng = hk.PRNGSequence(1)
+    forward = hk.transform(forward_fn)
+    initial_state = hk.transform(initial_state_fn).apply(None)
+    params = forward.init(
+        next(rng), np.zeros((10, 5), dtype=np.float32), initial_state)
+    variable_client = variable_utils.VariableClient(
+        fakes.VariableSource(params), 'policy')
+
+    adders = [_FakeAdder() for _ in environments]
+    actor = acting.BatchedIMPALAActor(
+        forward_fn=jax.jit(forward.apply),
+        initial_state_fn=initial_state_fn,
+        rng=rng,
+        variable_client=variable_client,
+        adders=adders)
+
+    loop = environment_loop.BatchedEnvironmentLoop(environments, actor)
+    loop.run(num_episodes=6)
+
+    for adder in adders:
+      self.assertNotEmpty(adder.extras)
+      extras = adder.extras[0]
+      self.assertEqual(extras['logits'].shape, (spec.actions.num_values,))
+      self.assertEqual(extras['core_state'].hidden.shape, (20,))
+      # The first step of each environment starts from the initial state.
+      np.testing.assert_array_equal(extras['core_state'].hidden, 0.)
+
+
+if __name__ == '__main__':
+  absltest.main()
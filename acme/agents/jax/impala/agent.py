@@ -58,6 +58,7 @@ class IMPALA(acme.Actor):
       seed: int = 0,
       max_abs_reward: float = np.inf,
       max_gradient_norm: float = np.inf,
+      num_sgd_steps_per_step: int = 1,
   ):
 
     num_actions = environment_spec.actions.num_values
@@ -65,7 +66,8 @@ class IMPALA(acme.Actor):
     queue = reverb.Table.queue(
         name=adders.DEFAULT_PRIORITY_TABLE, max_size=max_queue_size)
     self._server = reverb.Server([queue], port=None)
-    self._can_sample = lambda: queue.can_sample(batch_size)
+    self._can_sample = lambda: queue.can_sample(
+        batch_size * num_sgd_steps_per_step)
     address = f'localhost:{self._server.port}'
 
     # Component to add things into replay.
@@ -73,20 +75,22 @@ class IMPALA(acme.Actor):
         client=reverb.Client(address),
         period=sequence_period,
         sequence_length=sequence_length,
+        sequence_extras=('core_state',),
     )
 
-    # The dataset object to learn from.
+    # The iterator of batches to learn from.
     extra_spec = {
         'core_state': hk.transform(initial_state_fn).apply(None),
         'logits': np.ones(shape=(num_actions,), dtype=np.float32)
     }
     # Remove batch dimensions.
-    dataset = datasets.make_reverb_dataset(
-        client=reverb.TFClient(address),
+    iterator = datasets.make_reverb_numpy_iterator(
+        client=reverb.Client(address),
         environment_spec=environment_spec,
         batch_size=batch_size,
         extra_spec=extra_spec,
-        sequence_length=sequence_length)
+        sequence_length=sequence_length,
+        sequence_extras=('core_state',))
 
     rng = hk.PRNGSequence(seed)
 
@@ -99,7 +103,7 @@ class IMPALA(acme.Actor):
         obs_spec=environment_spec.observations,
         unroll_fn=unroll_fn,
         initial_state_fn=initial_state_fn,
-        iterator=dataset.as_numpy_iterator(),
+        iterator=iterator,
         rng=rng,
         counter=counter,
         logger=logger,
@@ -108,6 +112,7 @@ class IMPALA(acme.Actor):
         entropy_cost=entropy_cost,
         baseline_cost=baseline_cost,
         max_abs_reward=max_abs_reward,
+        num_sgd_steps_per_step=num_sgd_steps_per_step,
     )
 
     variable_client = variable_utils.VariableClient(self._learner, key='policy')
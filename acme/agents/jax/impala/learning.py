@@ -23,6 +23,8 @@ from acme.jax import networks
 from acme.jax import utils
 from acme.utils import counting
 from acme.utils import loggers
+from acme.utils import profiling
+from acme.utils import tree_utils
 import haiku as hk
 import jax
 from jax.experimental import optix
@@ -54,9 +56,21 @@ class IMPALALearner(acme.Learner, acme.Saveable):
       entropy_cost: float = 0.,
       baseline_cost: float = 1.,
       max_abs_reward: float = np.inf,
+      num_sgd_steps_per_step: int = 1,
       counter: counting.Counter = None,
       logger: loggers.Logger = None,
+      timer: profiling.Timer = None,
   ):
+    """Initializes the learner.
+
+    If `num_sgd_steps_per_step` is greater than one, each call to `step` draws
+    that many batches from the iterator and runs the corresponding SGD steps in
+    a single compiled call. The logged metrics are then averaged over them.
+
+    If a `timer` is given, latency percentiles of sampling, SGD and logging are
+    written to the logs. Timing SGD waits for its results, which removes some
+    of the overlap of host and device work.
+    """
 
     # Transform into pure functions.
     unroll_fn = hk.transform(unroll_fn)
@@ -67,7 +81,7 @@ class IMPALALearner(acme.Learner, acme.Saveable):
 
       # Extract the data.
       observations, actions, rewards, discounts, extra = sample.data
-      initial_state = tree.map_structure(lambda s: s[0], extra['core_state'])
+      initial_state = extra['core_state']  # A sequence extra.
       behaviour_logits = extra['logits']
 
       # Apply reward clipping.
@@ -105,7 +119,6 @@ class IMPALALearner(acme.Learner, acme.Saveable):
 
       return mean_loss
 
-    @jax.jit
     def sgd_step(
         state: TrainingState, sample: reverb.ReplaySample
     ) -> Tuple[TrainingState, Dict[str, jnp.ndarray]]:
@@ -129,6 +142,13 @@ class IMPALALearner(acme.Learner, acme.Saveable):
 
       return new_state, metrics
 
+    def multi_sgd_step(
+        state: TrainingState, samples: reverb.ReplaySample
+    ) -> Tuple[TrainingState, Dict[str, jnp.ndarray]]:
+      """Runs SGD steps for samples stacked along the leading axis."""
+      new_state, metrics = jax.lax.scan(sgd_step, state, samples)
+      return new_state, tree.map_structure(jnp.mean, metrics)
+
     def make_initial_state(key: jnp.ndarray) -> TrainingState:
       """Initialises the training state (parameters and optimiser state)."""
       dummy_obs = utils.zeros_like(obs_spec)
@@ -144,24 +164,45 @@ class IMPALALearner(acme.Learner, acme.Saveable):
 
     # Internalise iterator.
     self._iterator = iterator
-    self._sgd_step = sgd_step
+    self._sgd_step = jax.jit(sgd_step)
+    self._multi_sgd_step = jax.jit(multi_sgd_step)
+    self._num_sgd_steps_per_step = num_sgd_steps_per_step
 
     # Set up logging/counting.
     self._counter = counter or counting.Counter()
     self._logger = logger or loggers.TerminalLogger('learner', time_delta=1.)
+    self._timer = timer or profiling.Timer(enabled=False)
 
   def step(self):
     """Does a step of SGD and logs the results."""
 
+    with self._timer.time('sample'):
+      if self._num_sgd_steps_per_step > 1:
+        samples = tree_utils.stack_sequence_fields([
+            next(self._iterator) for _ in range(self._num_sgd_steps_per_step)
+        ])
+        # Do several batches of SGD in a single compiled call.
+        sgd_step = self._multi_sgd_step
+      else:
+        samples = next(self._iterator)
+        sgd_step = self._sgd_step
+
     # Do a batch of SGD.
-    sample = next(self._iterator)
-    self._state, results = self._sgd_step(self._state, sample)
+    with self._timer.time('sgd_step'):
+      self._state, results = sgd_step(self._state, samples)
+      if self._timer.enabled:
+        jax.tree_util.tree_map(lambda x: x.block_until_ready(), results)
 
     # Update our counts and record it.
-    counts = self._counter.increment(steps=1)
+    counts = self._counter.increment(steps=self._num_sgd_steps_per_step)
 
     # Snapshot and attempt to write logs.
-    self._logger.write({**results, **counts})
+    with self._timer.time('write'):
+      self._logger.write({
+          **results,
+          **counts,
+          **self._timer.get_periodic_metrics()
+      })
 
   def get_variables(self, names: List[str]) -> List[hk.Params]:
     return [self._state.params]
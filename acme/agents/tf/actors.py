@@ -15,6 +15,8 @@
 
 """Generic actor implementation, using TensorFlow and Sonnet."""
 
+from typing import Optional, Sequence
+
 from acme import adders
 from acme import core
 from acme import types
@@ -23,6 +25,7 @@ from acme.tf import utils as tf2_utils
 from acme.tf import variable_utils as tf2_variable_utils
 
 import dm_env
+import numpy as np
 import sonnet as snt
 import tensorflow as tf
 import tensorflow_probability as tfp
@@ -175,7 +178,112 @@ class RecurrentActor(core.Actor):
       return
 
     numpy_state = tf2_utils.to_numpy_squeeze(self._prev_state)
-    self._adder.add(action, next_timestep, extras=(numpy_state,))
+    self._adder.add(action, next_timestep, extras={'core_state': numpy_state})
+
+  def update(self):
+    if self._variable_client:
+      self._variable_client.update()
+
+
+class BatchedRecurrentActor(core.BatchedActor):
+  """A recurrent actor which acts in a batch of environments at once.
+
+  The recurrent state of all N environments is kept as a single batch of size N
+  and the policy is evaluated in one compiled step for the whole batch. Rather
+  than discarding the state at the start of an episode, environments which
+  started a new episode are marked in a reset mask and their rows of the state
+  are re-initialized inside the compiled step.
+
+  Each environment has its own (optional) adder, to which the recurrent state
+  used for that environment's action is added as extras, as for
+  `RecurrentActor`.
+  """
+
+  def __init__(
+      self,
+      policy_network: snt.RNNCore,
+      adders: Optional[Sequence[adders.Adder]] = None,
+      variable_client: tf2_variable_utils.VariableClient = None,
+  ):
+    """Initializes the actor.
+
+    Args:
+      policy_network: the (recurrent) policy to run.
+      adders: an (optional) adder for each environment in the batch.
+      variable_client: object which allows to copy weights from the learner copy
+        of the policy to the actor copy (in case they are separate).
+    """
+    # Store these for later use.
+    self._adders = adders
+    self._variable_client = variable_client
+    self._network = policy_network
+    self._state = None
+    self._prev_state = None
+    self._resets = set()
+
+  @tf.function
+  def _step(self, observations: types.NestedTensor,
+            state: types.NestedTensor, reset: tf.Tensor):
+    # Re-initialize the state of environments starting a new episode.
+    initial_state = self._network.initial_state(tf.shape(reset)[0])
+
+    def maybe_reset(initial, current):
+      mask = tf.reshape(reset, [-1] + [1] * (current.shape.rank - 1))
+      return tf.where(mask, initial, current)
+
+    state = tree.map_structure(maybe_reset, initial_state, state)
+
+    # Forward.
+    policy_output, new_state = self._network(observations, state)
+
+    # If the policy network parameterises a distribution, sample from it.
+    def maybe_sample(output):
+      if isinstance(output, tfd.Distribution):
+        output = output.sample()
+      return output
+
+    policy_output = tree.map_structure(maybe_sample, policy_output)
+
+    return policy_output, state, new_state
+
+  def select_action(self,
+                    observations: types.NestedArray) -> types.NestedArray:
+    num_environments = tree.flatten(observations)[0].shape[0]
+    if self._state is None:
+      self._state = self._network.initial_state(num_environments)
+
+    reset = np.zeros(num_environments, dtype=bool)
+    reset[list(self._resets)] = True
+    self._resets.clear()
+
+    policy_output, state, self._state = self._step(
+        observations, self._state, tf.constant(reset))
+
+    # Convert the state once per step rather than once per environment.
+    if self._adders:
+      self._prev_state = tf2_utils.to_numpy(state)
+
+    return tf2_utils.to_numpy(policy_output)
+
+  def observe_first(self, timestep: dm_env.TimeStep, index: int):
+    if self._adders:
+      self._adders[index].add_first(timestep)
+
+    # Mark the state to be re-initialized at the next policy call.
+    self._resets.add(index)
+
+  def observe(
+      self,
+      action: types.NestedArray,
+      next_timestep: dm_env.TimeStep,
+      index: int,
+  ):
+    if not self._adders:
+      return
+
+    numpy_state = tree.map_structure(lambda s: s[index], self._prev_state)
+    self._adders[index].add(
+        action, next_timestep, extras={'core_state': numpy_state})
 
   def update(self):
     if self._variable_client:
@@ -39,6 +39,20 @@ def _make_fake_env() -> dm_env.Environment:
   return fakes.Environment(env_spec, episode_length=10)
 
 
+class _FakeAdder:
+  """Records the extras added for each step."""
+
+  def __init__(self):
+    self.extras = []
+
+  def add_first(self, timestep):
+    del timestep
+
+  def add(self, action, next_timestep, extras=()):
+    del action, next_timestep
+    self.extras.append(extras)
+
+
 class ActorTest(absltest.TestCase):
 
   def test_feedforward(self):
@@ -69,6 +83,40 @@ class ActorTest(absltest.TestCase):
     loop = environment_loop.EnvironmentLoop(environment, actor)
     loop.run(20)
 
+  def test_batched_recurrent(self):
+    environments = [_make_fake_env() for _ in range(3)]
+    env_spec = specs.make_environment_spec(environments[0])
+
+    network = snt.DeepRNN([
+        snt.Flatten(),
+        snt.LSTM(8),
+        snt.Linear(env_spec.actions.num_values),
+        lambda x: tf.argmax(x, axis=-1, output_type=env_spec.actions.dtype),
+    ])
+
+    actor = actors.BatchedRecurrentActor(network)
+    loop = environment_loop.BatchedEnvironmentLoop(environments, actor)
+    loop.run(20)
+
+  def test_batched_recurrent_resets_state(self):
+    network = snt.DeepRNN([snt.Flatten(), snt.LSTM(8)])
+    adders = [_FakeAdder() for _ in range(3)]
+    actor = actors.BatchedRecurrentActor(network, adders=adders)
+    observations = np.random.normal(size=(3, 10, 5)).astype(np.float32)
+
+    actor.select_action(observations)
+    actor.select_action(observations)
+    actor.observe_first(_make_fake_env().reset(), index=1)
+    actor.select_action(observations)
+    for index, adder in enumerate(adders):
+      actor.observe(np.int32(0), dm_env.transition(0., np.zeros((10, 5))),
+                    index=index)
+      extras, = adder.extras
+      hidden = extras['core_state'][0].hidden
+      self.assertEqual(hidden.shape, (8,))
+      # Only the environment which started a new episode used a fresh state.
+      self.assertEqual(np.any(hidden != 0), index != 1)
+
 
 if __name__ == '__main__':
   absltest.main()
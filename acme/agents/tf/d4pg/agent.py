@@ -24,6 +24,7 @@ from acme.adders import reverb as adders
 from acme.agents import agent
 from acme.agents.tf import actors
 from acme.agents.tf.d4pg import learning
+from acme.datasets import local_replay
 from acme.tf import networks
 from acme.tf import utils as tf2_utils
 from acme.utils import counting
@@ -61,7 +62,8 @@ class D4PG(agent.Agent):
                logger: loggers.Logger = None,
                counter: counting.Counter = None,
                checkpoint: bool = True,
-               replay_table_name: str = adders.DEFAULT_PRIORITY_TABLE):
+               replay_table_name: str = adders.DEFAULT_PRIORITY_TABLE,
+               in_process_replay: bool = False):
     """Initialize the agent.
 
     Args:
@@ -86,34 +88,57 @@ class D4PG(agent.Agent):
       counter: counter object used to keep track of steps.
       checkpoint: boolean indicating whether to checkpoint the learner.
       replay_table_name: string indicating what name to give the replay table.
+      in_process_replay: whether to keep replay in this process (see
+        `acme.datasets.local_replay`) rather than in a Reverb server.
     """
-    # Create a replay server to add data to. This uses no limiter behavior in
-    # order to allow the Agent interface to handle it.
-    replay_table = reverb.Table(
-        name=replay_table_name,
-        sampler=reverb.selectors.Uniform(),
-        remover=reverb.selectors.Fifo(),
-        max_size=max_replay_size,
-        rate_limiter=reverb.rate_limiters.MinSize(1))
-    self._server = reverb.Server([replay_table], port=None)
+    if in_process_replay:
+      # Keep replay in this process, avoiding the cost of sending each item to
+      # (and sampling it from) a replay server.
+      replay_client = local_replay.Client([
+          local_replay.Table(
+              name=replay_table_name,
+              max_size=max_replay_size,
+              rate_limiter=local_replay.MinSize(1))
+      ])
+      adder_client = replay_client
+
+      # The dataset provides an interface to sample from replay.
+      dataset = local_replay.make_dataset(
+          client=replay_client,
+          environment_spec=environment_spec,
+          batch_size=batch_size,
+          transition_adder=True,
+          table=replay_table_name)
+      dataset = dataset.prefetch(prefetch_size)
+    else:
+      # Create a replay server to add data to. This uses no limiter behavior
+      # in order to allow the Agent interface to handle it.
+      replay_table = reverb.Table(
+          name=replay_table_name,
+          sampler=reverb.selectors.Uniform(),
+          remover=reverb.selectors.Fifo(),
+          max_size=max_replay_size,
+          rate_limiter=reverb.rate_limiters.MinSize(1))
+      self._server = reverb.Server([replay_table], port=None)
+      address = f'localhost:{self._server.port}'
+      adder_client = reverb.Client(address)
+
+      # The dataset provides an interface to sample from replay.
+      dataset = datasets.make_reverb_dataset(
+          table=replay_table_name,
+          client=reverb.TFClient(address),
+          batch_size=batch_size,
+          prefetch_size=prefetch_size,
+          environment_spec=environment_spec,
+          transition_adder=True)
 
     # The adder is used to insert observations into replay.
-    address = f'localhost:{self._server.port}'
     adder = adders.NStepTransitionAdder(
         priority_fns={replay_table_name: lambda x: 1.},
-        client=reverb.Client(address),
+        client=adder_client,
         n_step=n_step,
         discount=discount)
 
-    # The dataset provides an interface to sample from replay.
-    dataset = datasets.make_reverb_dataset(
-        table=replay_table_name,
-        client=reverb.TFClient(address),
-        batch_size=batch_size,
-        prefetch_size=prefetch_size,
-        environment_spec=environment_spec,
-        transition_adder=True)
-
     # Make sure observation network is a Sonnet Module.
     observation_network = tf2_utils.to_sonnet_module(observation_network)
 
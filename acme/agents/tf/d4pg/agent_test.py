@@ -18,6 +18,7 @@
 from typing import Dict, Sequence
 
 from absl.testing import absltest
+from absl.testing import parameterized
 import acme
 from acme import specs
 from acme import types
@@ -57,9 +58,10 @@ def make_networks(
   }
 
 
-class D4PGTest(absltest.TestCase):
+class D4PGTest(parameterized.TestCase):
 
-  def test_d4pg(self):
+  @parameterized.parameters(False, True)
+  def test_d4pg(self, in_process_replay):
     # Create a fake environment to test with.
     environment = fakes.ContinuousEnvironment(episode_length=10, bounded=True)
     spec = specs.make_environment_spec(environment)
@@ -75,6 +77,7 @@ class D4PGTest(absltest.TestCase):
         batch_size=10,
         samples_per_insert=2,
         min_replay_size=10,
+        in_process_replay=in_process_replay,
     )
 
     # Try running the environment loop. We have no assertions here because all
@@ -26,6 +26,7 @@ from acme.tf import savers as tf2_savers
 from acme.tf import utils as tf2_utils
 from acme.utils import counting
 from acme.utils import loggers
+from acme.utils import profiling
 import numpy as np
 import sonnet as snt
 import tensorflow as tf
@@ -56,6 +57,7 @@ class D4PGLearner(acme.Learner):
       counter: counting.Counter = None,
       logger: loggers.Logger = None,
       checkpoint: bool = True,
+      timer: profiling.Timer = None,
   ):
     """Initializes the learner.
 
@@ -80,6 +82,8 @@ class D4PGLearner(acme.Learner):
       counter: counter object used to keep track of steps.
       logger: logger object to be used by learner.
       checkpoint: boolean indicating whether to checkpoint the learner.
+      timer: optional Timer used to log latency percentiles of the learner
+        step (including sampling), checkpointing and logging.
     """
 
     # Store online and target networks.
@@ -96,6 +100,7 @@ class D4PGLearner(acme.Learner):
     # General learner book-keeping and loggers.
     self._counter = counter or counting.Counter()
     self._logger = logger or loggers.make_default_logger('learner')
+    self._timer = timer or profiling.Timer(enabled=False)
 
     # Other learner parameters.
     self._discount = discount
@@ -121,6 +126,10 @@ class D4PGLearner(acme.Learner):
         'policy': policy_network_to_expose.variables,
     }
 
+    # Host copies of the variables, cached for the step at which they were made.
+    self._cached_variables = {}
+    self._cached_version = None
+
     # Create a checkpointer and snapshotter objects.
     self._checkpointer = None
     self._snapshotter = None
@@ -248,7 +257,8 @@ class D4PGLearner(acme.Learner):
 
   def step(self):
     # Run the learning step.
-    fetches = self._step()
+    with self._timer.time('step'):
+      fetches = self._step()
 
     # Compute elapsed time.
     timestamp = time.time()
@@ -258,13 +268,26 @@ class D4PGLearner(acme.Learner):
     # Update our counts and record it.
     counts = self._counter.increment(steps=1, walltime=elapsed_time)
     fetches.update(counts)
+    fetches.update(self._timer.get_periodic_metrics())
 
     # Checkpoint and attempt to write the logs.
-    if self._checkpointer is not None:
-      self._checkpointer.save()
-    if self._snapshotter is not None:
-      self._snapshotter.save()
-    self._logger.write(fetches)
+    with self._timer.time('checkpoint'):
+      if self._checkpointer is not None:
+        self._checkpointer.save()
+      if self._snapshotter is not None:
+        self._snapshotter.save()
+    with self._timer.time('write'):
+      self._logger.write(fetches)
 
   def get_variables(self, names: List[str]) -> List[List[np.ndarray]]:
-    return [tf2_utils.to_numpy(self._variables[name]) for name in names]
+    version = self.get_variables_version()
+    if version != self._cached_version:
+      self._cached_variables = {}
+      self._cached_version = version
+    for name in names:
+      if name not in self._cached_variables:
+        self._cached_variables[name] = tf2_utils.to_numpy(self._variables[name])
+    return [self._cached_variables[name] for name in names]
+
+  def get_variables_version(self) -> int:
+    return int(self._num_steps.numpy())
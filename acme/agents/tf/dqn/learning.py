@@ -25,6 +25,7 @@ from acme.tf import savers as tf2_savers
 from acme.tf import utils as tf2_utils
 from acme.utils import counting
 from acme.utils import loggers
+from acme.utils import profiling
 import numpy as np
 import reverb
 import sonnet as snt
@@ -54,6 +55,7 @@ class DQNLearner(acme.Learner, tf2_savers.TFSaveable):
       counter: counting.Counter = None,
       logger: loggers.Logger = None,
       checkpoint: bool = True,
+      timer: profiling.Timer = None,
   ):
     """Initializes the learner.
 
@@ -73,6 +75,8 @@ class DQNLearner(acme.Learner, tf2_savers.TFSaveable):
       counter: Counter object for (potentially distributed) counting.
       logger: Logger object for writing logs to.
       checkpoint: boolean indicating whether to checkpoint the learner.
+      timer: optional Timer used to log latency percentiles of the learner
+        step (including sampling), snapshotting and logging.
     """
 
     # Internalise agent components (replay buffer, networks, optimizer).
@@ -93,9 +97,14 @@ class DQNLearner(acme.Learner, tf2_savers.TFSaveable):
     self._variables: List[List[tf.Tensor]] = [network.trainable_variables]
     self._num_steps = tf.Variable(0, dtype=tf.int32)
 
+    # Host copy of the variables, cached for the step at which it was made.
+    self._cached_variables = None
+    self._cached_version = None
+
     # Internalise logging/counting objects.
     self._counter = counter or counting.Counter()
     self._logger = logger or loggers.TerminalLogger('learner', time_delta=1.)
+    self._timer = timer or profiling.Timer(enabled=False)
 
     # Create a snapshotter object.
     if checkpoint:
@@ -169,7 +178,8 @@ class DQNLearner(acme.Learner, tf2_savers.TFSaveable):
 
   def step(self):
     # Do a batch of SGD.
-    result = self._step()
+    with self._timer.time('step'):
+      result = self._step()
 
     # Compute elapsed time.
     timestamp = time.time()
@@ -179,14 +189,24 @@ class DQNLearner(acme.Learner, tf2_savers.TFSaveable):
     # Update our counts and record it.
     counts = self._counter.increment(steps=1, walltime=elapsed_time)
     result.update(counts)
+    result.update(self._timer.get_periodic_metrics())
 
     # Snapshot and attempt to write logs.
     if self._snapshotter is not None:
-      self._snapshotter.save()
-    self._logger.write(result)
+      with self._timer.time('checkpoint'):
+        self._snapshotter.save()
+    with self._timer.time('write'):
+      self._logger.write(result)
 
   def get_variables(self, names: List[str]) -> List[np.ndarray]:
-    return tf2_utils.to_numpy(self._variables)
+    version = self.get_variables_version()
+    if version != self._cached_version:
+      self._cached_variables = tf2_utils.to_numpy(self._variables)
+      self._cached_version = version
+    return self._cached_variables
+
+  def get_variables_version(self) -> int:
+    return int(self._num_steps.numpy())
 
   @property
   def state(self):
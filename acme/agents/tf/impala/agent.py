@@ -68,6 +68,7 @@ class IMPALA(acme.Actor):
         client=reverb.Client(address),
         period=sequence_period,
         sequence_length=sequence_length,
+        sequence_extras=('core_state',),
     )
 
     # The dataset object to learn from.
@@ -82,7 +83,8 @@ class IMPALA(acme.Actor):
         environment_spec=environment_spec,
         batch_size=batch_size,
         extra_spec=extra_spec,
-        sequence_length=sequence_length)
+        sequence_length=sequence_length,
+        sequence_extras=('core_state',))
 
     tf2_utils.create_variables(network, [environment_spec.observations])
 
@@ -29,7 +29,6 @@ import reverb
 import sonnet as snt
 import tensorflow as tf
 import tensorflow_probability as tfp
-import tree
 import trfl
 
 tfd = tfp.distributions
@@ -100,9 +99,12 @@ class IMPALALearner(acme.Learner, tf2_savers.TFSaveable):
 
     # Retrieve a batch of data from replay.
     inputs: reverb.ReplaySample = next(self._iterator)
-    data = tf2_utils.batch_to_sequence(inputs.data)
-    observations, actions, rewards, discounts, extra = data
-    core_state = tree.map_structure(lambda s: s[0], extra['core_state'])
+    observations, actions, rewards, discounts, extra = inputs.data
+    # The core state is a sequence extra, i.e. has no time dimension.
+    core_state = extra['core_state']
+    data = (observations, actions, rewards, discounts, extra['logits'])
+    observations, actions, rewards, discounts, behaviour_logits = (
+        tf2_utils.batch_to_sequence(data))
 
     #
     actions = actions[:-1]  # [T-1]
@@ -115,7 +117,6 @@ class IMPALALearner(acme.Learner, tf2_savers.TFSaveable):
                                               core_state)
 
       # Compute importance sampling weights: current policy / behavior policy.
-      behaviour_logits = extra['logits']
       pi_behaviour = tfd.Categorical(logits=behaviour_logits[:-1])
       pi_target = tfd.Categorical(logits=logits[:-1])
       log_rhos = pi_target.log_prob(actions) - pi_behaviour.log_prob(actions)
@@ -22,6 +22,7 @@ from acme.agents import agent
 from acme.agents.tf.mcts import acting
 from acme.agents.tf.mcts import learning
 from acme.agents.tf.mcts import models
+from acme.datasets import local_replay
 from acme.tf import utils as tf2_utils
 
 import numpy as np
@@ -43,38 +44,57 @@ class MCTS(agent.Agent):
       num_simulations: int,
       environment_spec: specs.EnvironmentSpec,
       batch_size: int,
+      in_process_replay: bool = False,
   ):
+    action_spec: specs.DiscreteArray = environment_spec.actions
+    extra_spec = {
+        'pi': specs.Array(shape=(action_spec.num_values,), dtype=np.float32)
+    }
+
+    if in_process_replay:
+      # Keep replay in this process, avoiding the cost of sending each item to
+      # (and sampling it from) a replay server.
+      replay_client = local_replay.Client([
+          local_replay.Table(
+              name=adders.DEFAULT_PRIORITY_TABLE,
+              max_size=replay_capacity,
+              rate_limiter=local_replay.MinSize(1))
+      ])
+      adder_client = replay_client
 
-    # Create a replay server for storing transitions.
-    replay_table = reverb.Table(
-        name=adders.DEFAULT_PRIORITY_TABLE,
-        sampler=reverb.selectors.Uniform(),
-        remover=reverb.selectors.Fifo(),
-        max_size=replay_capacity,
-        rate_limiter=reverb.rate_limiters.MinSize(1))
-    self._server = reverb.Server([replay_table], port=None)
+      # The dataset provides an interface to sample from replay.
+      dataset = local_replay.make_dataset(
+          client=replay_client,
+          environment_spec=environment_spec,
+          batch_size=batch_size,
+          extra_spec=extra_spec,
+          transition_adder=True)
+    else:
+      # Create a replay server for storing transitions.
+      replay_table = reverb.Table(
+          name=adders.DEFAULT_PRIORITY_TABLE,
+          sampler=reverb.selectors.Uniform(),
+          remover=reverb.selectors.Fifo(),
+          max_size=replay_capacity,
+          rate_limiter=reverb.rate_limiters.MinSize(1))
+      self._server = reverb.Server([replay_table], port=None)
+      address = f'localhost:{self._server.port}'
+      adder_client = reverb.Client(address)
+
+      # The dataset provides an interface to sample from replay.
+      dataset = datasets.make_reverb_dataset(
+          client=reverb.TFClient(address),
+          environment_spec=environment_spec,
+          extra_spec=extra_spec,
+          transition_adder=True)
+      dataset = dataset.batch(batch_size, drop_remainder=True)
 
     # The adder is used to insert observations into replay.
-    address = f'localhost:{self._server.port}'
     adder = adders.NStepTransitionAdder(
-        client=reverb.Client(address),
+        client=adder_client,
         n_step=n_step,
         discount=discount)
 
-    # The dataset provides an interface to sample from replay.
-    replay_client = reverb.TFClient(address)
-    action_spec: specs.DiscreteArray = environment_spec.actions
-    dataset = datasets.make_reverb_dataset(
-        client=replay_client,
-        environment_spec=environment_spec,
-        extra_spec={
-            'pi': specs.Array(
-                shape=(action_spec.num_values,), dtype=np.float32)
-        },
-        transition_adder=True)
-
-    dataset = dataset.batch(batch_size, drop_remainder=True)
-
     tf2_utils.create_variables(network, [environment_spec.observations])
 
     # Now create the agent components: actor & learner.
@@ -16,6 +16,7 @@
 """Tests for the MCTS agent."""
 
 from absl.testing import absltest
+from absl.testing import parameterized
 import acme
 from acme import specs
 from acme.agents.tf import mcts
@@ -26,9 +27,10 @@ import numpy as np
 import sonnet as snt
 
 
-class MCTSTest(absltest.TestCase):
+class MCTSTest(parameterized.TestCase):
 
-  def test_mcts(self):
+  @parameterized.parameters(False, True)
+  def test_mcts(self, in_process_replay):
     # Create a fake environment to test with.
     num_actions = 5
     environment = fakes.DiscreteEnvironment(
@@ -56,7 +58,8 @@ class MCTSTest(absltest.TestCase):
         discount=1.,
         replay_capacity=100,
         num_simulations=10,
-        batch_size=10)
+        batch_size=10,
+        in_process_replay=in_process_replay)
 
     # Try running the environment loop. We have no assertions here because all
     # we care about is that the agent runs without raising any errors.
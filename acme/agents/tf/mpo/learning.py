@@ -25,6 +25,7 @@ from acme.tf import savers as tf2_savers
 from acme.tf import utils as tf2_utils
 from acme.utils import counting
 from acme.utils import loggers
+from acme.utils import profiling
 import numpy as np
 import sonnet as snt
 import tensorflow as tf
@@ -55,10 +56,12 @@ class MPOLearner(acme.Learner):
       counter: Optional[counting.Counter] = None,
       logger: Optional[loggers.Logger] = None,
       checkpoint: bool = True,
+      timer: Optional[profiling.Timer] = None,
   ):
 
     self._counter = counter or counting.Counter()
     self._logger = logger or loggers.make_default_logger('learner')
+    self._timer = timer or profiling.Timer(enabled=False)
     self._discount = discount
     self._num_samples = num_samples
     self._clipping = clipping
@@ -261,7 +264,8 @@ class MPOLearner(acme.Learner):
 
   def step(self):
     # Run the learning step.
-    fetches = self._step()
+    with self._timer.time('step'):
+      fetches = self._step()
 
     # Compute elapsed time.
     timestamp = time.time()
@@ -271,13 +275,16 @@ class MPOLearner(acme.Learner):
     # Update our counts and record it.
     counts = self._counter.increment(steps=1, walltime=elapsed_time)
     fetches.update(counts)
+    fetches.update(self._timer.get_periodic_metrics())
 
     # Checkpoint and attempt to write the logs.
-    if self._checkpointer is not None:
-      self._checkpointer.save()
-    if self._snapshotter is not None:
-      self._snapshotter.save()
-    self._logger.write(fetches)
+    with self._timer.time('checkpoint'):
+      if self._checkpointer is not None:
+        self._checkpointer.save()
+      if self._snapshotter is not None:
+        self._snapshotter.save()
+    with self._timer.time('write'):
+      self._logger.write(fetches)
 
   def get_variables(self, names: List[str]) -> List[List[np.ndarray]]:
     return [tf2_utils.to_numpy(self._variables[name]) for name in names]
@@ -82,6 +82,7 @@ class R2D2(agent.Agent):
         client=reverb.Client(address),
         period=replay_period,
         sequence_length=sequence_length,
+        sequence_extras=('core_state',),
     )
 
     # The dataset object to learn from.
@@ -97,7 +98,8 @@ class R2D2(agent.Agent):
         batch_size=batch_size,
         prefetch_size=prefetch_size,
         extra_spec=extra_spec,
-        sequence_length=sequence_length)
+        sequence_length=sequence_length,
+        sequence_extras=('core_state',))
 
     target_network = copy.deepcopy(network)
     tf2_utils.create_variables(network, [environment_spec.observations])
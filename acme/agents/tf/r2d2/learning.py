@@ -28,6 +28,7 @@ from acme.tf import savers as tf2_savers
 from acme.tf import utils as tf2_utils
 from acme.utils import counting
 from acme.utils import loggers
+from acme.utils import profiling
 import numpy as np
 import reverb
 import sonnet as snt
@@ -41,7 +42,10 @@ class R2D2Learner(acme.Learner, tf2_savers.TFSaveable):
   """R2D2 learner.
 
   This is the learning component of the R2D2 agent. It takes a dataset as input
-  and implements update functionality to learn from this dataset.
+  and implements update functionality to learn from this dataset. If
+  `store_lstm_state` is True the dataset must hold the recurrent state as a
+  'core_state' sequence extra, i.e. without a time dimension (see
+  `datasets.make_reverb_dataset`).
   """
 
   def __init__(
@@ -63,6 +67,7 @@ class R2D2Learner(acme.Learner, tf2_savers.TFSaveable):
       store_lstm_state: bool = True,
       max_priority_weight: float = 0.9,
       n_step: int = 5,
+      timer: profiling.Timer = None,
   ):
 
     if isinstance(network, snt.RNNCore):
@@ -79,7 +84,7 @@ class R2D2Learner(acme.Learner, tf2_savers.TFSaveable):
     self._reverb_client = reverb_client
 
     # Internalise the hyperparameters.
-    self._store_lstm_state = tf.constant(store_lstm_state)
+    self._store_lstm_state = store_lstm_state
     self._burn_in_length = burn_in_length
     self._discount = discount
     self._max_replay_size = max_replay_size
@@ -103,6 +108,7 @@ class R2D2Learner(acme.Learner, tf2_savers.TFSaveable):
     # Internalise logging/counting objects.
     self._counter = counting.Counter(counter, 'learner')
     self._logger = logger or loggers.TerminalLogger('learner', time_delta=100.)
+    self._timer = timer or profiling.Timer(enabled=False)
 
     # Do not record timestamps until after the first learning step is done.
     # This is to avoid including the time it takes for actors to come online and
@@ -115,13 +121,15 @@ class R2D2Learner(acme.Learner, tf2_savers.TFSaveable):
     # Draw a batch of data from replay.
     sample: reverb.ReplaySample = next(self._iterator)
 
-    data = tf2_utils.batch_to_sequence(sample.data)
-    observations, actions, rewards, discounts, extra = data
+    observations, actions, rewards, discounts, extra = sample.data
+    observations, actions, rewards, discounts = tf2_utils.batch_to_sequence(
+        (observations, actions, rewards, discounts))
     unused_sequence_length, batch_size = actions.shape
 
     # Get initial state for the LSTM, either from replay or simply use zeros.
+    # The stored state is a sequence extra, i.e. has no time dimension.
     if self._store_lstm_state:
-      core_state = tree.map_structure(lambda x: x[0], extra['core_state'])
+      core_state = extra['core_state']
     else:
       core_state = self._network.initial_state(batch_size)
     target_core_state = tree.map_structure(tf.identity, core_state)
@@ -133,9 +141,9 @@ class R2D2Learner(acme.Learner, tf2_savers.TFSaveable):
     _, target_core_state = self._burn_in(burn_in_obs, target_core_state)
 
     # Don't train on the warmup period.
-    observations, actions, rewards, discounts, extra = tree.map_structure(
+    observations, actions, rewards, discounts = tree.map_structure(
         lambda x: x[self._burn_in_length:],
-        (observations, actions, rewards, discounts, extra))
+        (observations, actions, rewards, discounts))
 
     with tf.GradientTape() as tape:
       # Unroll the online and target Q-networks on the sequences.
@@ -197,7 +205,8 @@ class R2D2Learner(acme.Learner, tf2_savers.TFSaveable):
 
   def step(self):
     # Run the learning step.
-    results = self._step()
+    with self._timer.time('step'):
+      results = self._step()
 
     # Compute elapsed time.
     timestamp = time.time()
@@ -207,7 +216,9 @@ class R2D2Learner(acme.Learner, tf2_savers.TFSaveable):
     # Update our counts and record it.
     counts = self._counter.increment(steps=1, walltime=elapsed_time)
     results.update(counts)
-    self._logger.write(results)
+    results.update(self._timer.get_periodic_metrics())
+    with self._timer.time('write'):
+      self._logger.write(results)
 
   def get_variables(self, names: List[str]) -> List[Variables]:
     return [tf2_utils.to_numpy(self._variables)]
@@ -16,6 +16,7 @@
 """Recurrent DQfD (R2D3) agent implementation."""
 
 import functools
+from typing import Sequence
 
 from acme import datasets
 from acme import specs
@@ -80,6 +81,7 @@ class R2D3(agent.Agent):
     sequence_kwargs = dict(
         period=replay_period,
         sequence_length=sequence_length,
+        sequence_extras=('core_state',),
     )
     adder = adders.SequenceAdder(client=reverb.Client(address),
                                    **sequence_kwargs)
@@ -95,7 +97,8 @@ class R2D3(agent.Agent):
         client=reverb_client,
         environment_spec=environment_spec,
         extra_spec=extra_spec,
-        sequence_length=sequence_length)
+        sequence_length=sequence_length,
+        sequence_extras=('core_state',))
 
     # Combine with demonstration dataset.
     transition = functools.partial(_sequence_from_episode,
@@ -167,7 +170,8 @@ def _sequence_from_episode(observations: acme_types.NestedTensor,
                            discounts: tf.Tensor,
                            extra_spec: acme_types.NestedSpec,
                            period: int,
-                           sequence_length: int):
+                           sequence_length: int,
+                           sequence_extras: Sequence[str] = ()):
   """Produce Reverb-like sequence from a full episode.
 
   Observations, actions, rewards and discounts have the same length. This
@@ -186,6 +190,7 @@ def _sequence_from_episode(observations: acme_types.NestedTensor,
       will generate fake (all-zero) extras.
     period: The period with which we add sequences.
     sequence_length: The fixed length of sequences we wish to add.
+    sequence_extras: Keys of the extras which have no time dimension.
 
   Returns:
     (o_t, a_t, r_t, d_t, e_t) Tuple.
@@ -208,10 +213,17 @@ def _sequence_from_episode(observations: acme_types.NestedTensor,
   r_t = _slice_and_pad(rewards)
   d_t = _slice_and_pad(discounts)
 
+  def _zeros(spec):
+    return tf.zeros(spec.shape, spec.dtype)
+
   def _sequence_zeros(spec):
     return tf.zeros([sequence_length] + spec.shape, spec.dtype)
 
-  e_t = tree.map_structure(_sequence_zeros, extra_spec)
+  e_t = {
+      key: tree.map_structure(
+          _zeros if key in sequence_extras else _sequence_zeros, spec)
+      for key, spec in extra_spec.items()
+  }
 
   key = tf.zeros([sequence_length], tf.uint64)
   probability = tf.ones([sequence_length], tf.float64)
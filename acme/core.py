@@ -19,7 +19,7 @@ This file specifies and documents the notions of `Actor` and `Learner`.
 """
 
 import abc
-from typing import Generic, List, TypeVar
+from typing import Generic, List, NamedTuple, Optional, TypeVar
 
 from acme import types
 # Internal imports.
@@ -81,15 +81,89 @@ class Actor(abc.ABC):
     """Perform an update of the actor parameters from past observations."""
 
 
+class BatchedActor(abc.ABC):
+  """Interface for an agent that acts in a batch of environments at once.
+
+  This mirrors the `Actor` interface but is used by a `BatchedEnvironmentLoop`
+  (see acme.environment_loop) which steps N environments in lockstep. The policy
+  is queried once per step for the whole batch, while observations are made
+  per environment, identified by its `index` in the batch:
+
+    # Make the first observation for each environment.
+    for i, env in enumerate(envs):
+      actor.observe_first(env.reset(), index=i)
+
+    # Take a batched step and observe each environment separately.
+    actions = actor.select_action(stacked_observations)
+    for i, env in enumerate(envs):
+      actor.observe(actions[i], env.step(actions[i]), index=i)
+
+    # Update the actor policy/parameters.
+    actor.update()
+
+  Since episodes may end at different times in different environments, any
+  per-episode state (e.g. adder buffers or recurrent state) must be kept
+  separately for each index.
+  """
+
+  @abc.abstractmethod
+  def select_action(self,
+                    observations: types.NestedArray) -> types.NestedArray:
+    """Samples from the policy given observations stacked along axis 0."""
+
+  @abc.abstractmethod
+  def observe_first(self, timestep: dm_env.TimeStep, index: int):
+    """Make a first observation from the environment at the given index.
+
+    Args:
+      timestep: first timestep.
+      index: index of the environment within the batch.
+    """
+
+  @abc.abstractmethod
+  def observe(
+      self,
+      action: types.NestedArray,
+      next_timestep: dm_env.TimeStep,
+      index: int,
+  ):
+    """Make an observation of timestep data from the environment at `index`.
+
+    Args:
+      action: action taken in the environment (without a batch dimension).
+      next_timestep: timestep produced by the environment given the action.
+      index: index of the environment within the batch.
+    """
+
+  @abc.abstractmethod
+  def update(self):
+    """Perform an update of the actor parameters from past observations."""
+
+
 # Internal class.
 
 
+class VersionedVariables(NamedTuple):
+  """Variables returned by `VariableSource.get_versioned_variables`.
+
+  `variables` is None if the variables have not changed since the version given
+  by the caller. `version` is None for sources which do not version their
+  variables.
+  """
+  version: Optional[int]
+  variables: Optional[List[types.NestedArray]]
+
+
 class VariableSource(abc.ABC):
   """Abstract source of variables.
 
   Objects which implement this interface provide a source of variables, returned
   as a collection of (nested) numpy arrays. Generally this will be used to
   provide variables to some learned policy/etc.
+
+  Sources may also number the successive values of their variables (e.g. by
+  learner step) by implementing `get_variables_version`, in which case clients
+  can avoid fetching variables they already hold; see `get_versioned_variables`.
   """
 
   @abc.abstractmethod
@@ -105,6 +179,30 @@ class VariableSource(abc.ABC):
       corresponds to the collection named by `names[i]`.
     """
 
+  def get_variables_version(self) -> Optional[int]:
+    """Returns the current version of the variables, or None if unversioned."""
+    return None
+
+  def get_versioned_variables(self,
+                              names: List[str],
+                              version: Optional[int] = None
+                             ) -> VersionedVariables:
+    """Returns the named variables unless they are unchanged since `version`.
+
+    Args:
+      names: args where each name is a string identifying a predefined subset of
+        the variables.
+      version: the version of the variables held by the caller, if any.
+
+    Returns:
+      The current version of the variables, along with the variables (as
+      returned by `get_variables`) or None if this version equals `version`.
+    """
+    current_version = self.get_variables_version()
+    if current_version is not None and current_version == version:
+      return VersionedVariables(current_version, None)
+    return VersionedVariables(current_version, self.get_variables(names))
+
 
 class Worker(abc.ABC):
   """An interface for (potentially) distributed workers."""
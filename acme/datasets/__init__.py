@@ -14,4 +14,5 @@
 
 """Dataset interfaces."""
 
+from acme.datasets.numpy_iterator import make_reverb_numpy_iterator
 from acme.datasets.reverb import make_reverb_dataset
@@ -0,0 +1,689 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An in-process replay buffer for single-process agents.
+
+Single-process agents which start a `reverb.Server` only to add to and sample
+from it within the same process pay for serializing every item and sending it
+over gRPC. For small networks this can cost more than learning itself. The
+replay here keeps items in preallocated NumPy arrays in the agent's process,
+while exposing the parts of the `reverb.Client` interface used by Acme's
+adders (`writer`) and learners (`mutate_priorities`):
+
+  table = local_replay.Table(
+      name=adders.DEFAULT_PRIORITY_TABLE,
+      max_size=100000,
+      priority_exponent=0.6,
+      rate_limiter=local_replay.MinSize(1))
+  client = local_replay.Client([table])
+  adder = adders.NStepTransitionAdder(client=client, n_step=5, discount=0.99)
+  iterator = local_replay.make_iterator(
+      client, environment_spec, batch_size=256, transition_adder=True)
+
+TensorFlow learners can instead use `make_dataset`, which wraps the same
+iterator in a `tf.data.Dataset`.
+
+Items are evicted in FIFO order once a table is full, and sampled either
+uniformly or in proportion to their priorities using a sum-tree. Tables can
+also store each frame of stacked (e.g. Atari) observations only once; see
+`FrameStorage`.
+"""
+
+import collections
+import threading
+from typing import Iterator, List, Mapping, Optional, Sequence
+
+from acme import specs
+from acme import types
+from acme.adders import reverb as adders
+from acme.datasets import numpy_iterator
+
+import numpy as np
+import reverb
+import tensorflow as tf
+import tree
+
+
+class SumTree:
+  """A binary tree over an array of values, each node holding a subtree sum.
+
+  The tree is stored as a flat array of size `2 * capacity` (rounded up to a
+  power of two) where node `i` has children `2 * i` and `2 * i + 1` and leaves
+  start at index `capacity`. Both updates and sampling operate on batches of
+  indices at once, processing one level of the tree per vectorized step.
+  """
+
+  def __init__(self, capacity: int):
+    self._capacity = 1
+    while self._capacity < capacity:
+      self._capacity *= 2
+    self._nodes = np.zeros(2 * self._capacity, dtype=np.float64)
+
+  @property
+  def total(self) -> float:
+    return self._nodes[1]
+
+  def get(self, indices: np.ndarray) -> np.ndarray:
+    return self._nodes[np.asarray(indices) + self._capacity]
+
+  def set(self, indices: np.ndarray, values: np.ndarray):
+    """Sets the values of the given leaves and updates their ancestors."""
+    nodes = np.asarray(indices, dtype=np.int64) + self._capacity
+    self._nodes[nodes] = values
+    nodes = np.unique(nodes // 2)
+    while nodes[0] > 0:
+      self._nodes[nodes] = self._nodes[2 * nodes] + self._nodes[2 * nodes + 1]
+      nodes = np.unique(nodes // 2)
+
+  def find(self, targets: np.ndarray) -> np.ndarray:
+    """Returns the leaves at which the cumulative sums reach `targets`."""
+    targets = np.array(targets, dtype=np.float64)
+    nodes = np.ones(targets.shape, dtype=np.int64)
+    while nodes[0] < self._capacity:
+      left = self._nodes[2 * nodes]
+      go_right = targets >= left
+      targets -= np.where(go_right, left, 0.)
+      nodes = 2 * nodes + go_right
+    return nodes - self._capacity
+
+  def sample(self, num_samples: int,
+             random_state: np.random.RandomState) -> np.ndarray:
+    """Samples leaves in proportion to their values, stratified over the sum."""
+    offsets = random_state.uniform(size=num_samples)
+    targets = (np.arange(num_samples) + offsets) * (self.total / num_samples)
+    # Guard against rounding errors selecting the (empty) leaves past the sum.
+    targets = np.minimum(targets, np.nextafter(self.total, 0))
+    return self.find(targets)
+
+
+class RateLimiter:
+  """Decides when a table may be inserted into or sampled from.
+
+  This follows `reverb.rate_limiters.SampleToInsertRatio`: once the table holds
+  `min_size_to_sample` items, the number of inserts (scaled by
+  `samples_per_insert`) minus the number of samples is kept within
+  `error_buffer` of its value at that point.
+  """
+
+  def __init__(self, samples_per_insert: float, min_size_to_sample: int,
+               error_buffer: float):
+    offset = samples_per_insert * min_size_to_sample
+    self._samples_per_insert = samples_per_insert
+    self._min_size_to_sample = min_size_to_sample
+    self._min_diff = offset - error_buffer
+    self._max_diff = offset + error_buffer
+
+  def can_insert(self, size: int, num_inserts: int, num_samples: int) -> bool:
+    if size < self._min_size_to_sample:
+      return True
+    diff = (num_inserts + 1) * self._samples_per_insert - num_samples
+    return diff <= self._max_diff
+
+  def can_sample(self, size: int, num_inserts: int, num_samples: int,
+                 num_requested: int) -> bool:
+    if size < self._min_size_to_sample:
+      return False
+    diff = num_inserts * self._samples_per_insert - num_samples
+    return diff - num_requested >= self._min_diff
+
+
+class MinSize(RateLimiter):
+  """Blocks sampling until the table holds at least `min_size` items."""
+
+  def __init__(self, min_size_to_sample: int):
+    super().__init__(
+        samples_per_insert=1.,
+        min_size_to_sample=min_size_to_sample,
+        error_buffer=np.inf)
+
+
+class SampleToInsertRatio(RateLimiter):
+  """Keeps the ratio of samples to inserts close to `samples_per_insert`."""
+
+
+class FrameStorage:
+  """Stores the frames of stacked observations, each unique frame once.
+
+  Observations are stacks of the `stack_size` most recent frames along their
+  last axis, as emitted by e.g. the `AtariWrapper`. Consecutive observations
+  of an episode share all but one frame, and transitions hold observations
+  which were already added as part of earlier transitions, so storing whole
+  observations stores each frame many times over.
+
+  Instead, frames are kept in a ring buffer of `capacity` frames and each
+  observation is replaced by the index of its most recent frame; its stack is
+  then made of the frames at the `stack_size` consecutive indices ending there.
+  An added observation is matched against the stored frames: if it equals a
+  recently stored stack it is given that stack's index, if it extends the most
+  recently stored frames by one frame only that frame is stored, and otherwise
+  (e.g. at the start of an episode) all of its frames are stored.
+  """
+
+  def __init__(self, capacity: int, stack_size: int, lookback: int = 16):
+    """Initializes the storage.
+
+    Args:
+      capacity: the number of frames stored; once reached, the oldest frames
+        are overwritten.
+      stack_size: the number of frames stacked in each observation.
+      lookback: the number of most recent stacks an observation is matched
+        against.
+
+    Raises:
+      ValueError: if `capacity` cannot hold at least a few stacks.
+    """
+    if capacity < 4 * stack_size:
+      raise ValueError('A capacity of {} frames is too small for stacks of {} '
+                       'frames.'.format(capacity, stack_size))
+    self._capacity = capacity
+    self._stack_size = stack_size
+    self._lookback = lookback
+    self._frames = None  # type: Optional[np.ndarray]
+    self._next_index = 0
+
+  @property
+  def stack_size(self) -> int:
+    return self._stack_size
+
+  @property
+  def nbytes(self) -> int:
+    return self._frames.nbytes if self._frames is not None else 0
+
+  @property
+  def oldest_index(self) -> int:
+    """The index of the oldest frame which has not been overwritten."""
+    return max(0, self._next_index - self._capacity)
+
+  def add(self, observation: np.ndarray) -> int:
+    """Adds the frames of an observation and returns its index."""
+    observation = np.asarray(observation)
+    if self._frames is None:
+      self._frames = np.zeros((self._capacity,) + observation.shape[:-1],
+                              dtype=observation.dtype)
+
+    newest = self._next_index - 1
+    for index in range(newest, max(newest - self._lookback, -1), -1):
+      if self._matches(observation, index):
+        return index
+
+    if self._matches(observation[..., :-1], newest):
+      frames = observation[..., -1:]
+    else:
+      frames = observation
+    for k in range(frames.shape[-1]):
+      self._frames[self._next_index % self._capacity] = frames[..., k]
+      self._next_index += 1
+    return self._next_index - 1
+
+  def stacked(self, indices: np.ndarray) -> np.ndarray:
+    """Returns the observations with the given indices, of any shape."""
+    offsets = np.arange(1 - self._stack_size, 1)
+    frames = self._frames[(indices[..., None] + offsets) % self._capacity]
+    return np.moveaxis(frames, indices.ndim, -1)
+
+  def _matches(self, frames: np.ndarray, end: int) -> bool:
+    """Returns whether `frames` equal the stored frames ending at `end`."""
+    count = frames.shape[-1]
+    if end - count + 1 < self.oldest_index:
+      return False
+    # Compare the most recent frames first, as they differ most often.
+    for k in reversed(range(count)):
+      stored = self._frames[(end - count + 1 + k) % self._capacity]
+      if not np.array_equal(stored, frames[..., k]):
+        return False
+    return True
+
+
+class Table:
+  """A fixed-size table of items stored in preallocated NumPy arrays.
+
+  All items of a table must have the same number of timesteps and the same
+  structure. The arrays holding them are allocated from the first inserted
+  item, with shape `[max_size, num_timesteps, ...]` for each of its leaves.
+
+  Leaves holding stacked observations (e.g. the observation and next
+  observation of Atari transitions) can instead be kept in a `FrameStorage`,
+  by giving their positions in the flattened items as `frame_leaves`. Only the
+  index of each such observation is then stored with the item, and the
+  observation is restored when the item is sampled. Items are also evicted
+  once any of their frames has been overwritten.
+  """
+
+  def __init__(
+      self,
+      name: str,
+      max_size: int,
+      priority_exponent: Optional[float] = None,
+      rate_limiter: Optional[RateLimiter] = None,
+      seed: Optional[int] = None,
+      frame_leaves: Sequence[int] = (),
+      frame_storage: Optional[FrameStorage] = None,
+  ):
+    """Initializes the table.
+
+    Args:
+      name: the name of the table.
+      max_size: the maximum number of items; once reached the oldest item is
+        evicted for each new item.
+      priority_exponent: if given, items are sampled with probability
+        proportional to their priority raised to this exponent, otherwise they
+        are sampled uniformly. Items are also sampled uniformly while all of
+        their priorities are zero.
+      rate_limiter: the rate limiter; defaults to `MinSize(1)`.
+      seed: the seed of the random number generator used for sampling.
+      frame_leaves: the positions of stacked observations in flattened items,
+        which are kept in `frame_storage`.
+      frame_storage: the storage of the frames of `frame_leaves`.
+
+    Raises:
+      ValueError: if only one of `frame_leaves` and `frame_storage` is given.
+    """
+    if bool(frame_leaves) != (frame_storage is not None):
+      raise ValueError(
+          'frame_leaves and frame_storage must be given together.')
+    self.name = name
+    self._max_size = max_size
+    self._priority_exponent = priority_exponent
+    self._rate_limiter = rate_limiter or MinSize(1)
+    self._random_state = np.random.RandomState(seed)
+
+    self._sum_tree = None
+    if priority_exponent is not None:
+      self._sum_tree = SumTree(max_size)
+    self._priorities = np.zeros(max_size, dtype=np.float64)
+    self._times_sampled = np.zeros(max_size, dtype=np.int32)
+    self._arrays = None  # type: Optional[List[np.ndarray]]
+
+    self._frame_leaves = frozenset(frame_leaves)
+    self._frame_storage = frame_storage
+    # The index of the oldest frame used by each item.
+    self._oldest_frames = np.zeros(max_size, dtype=np.int64)
+
+    # Items are held for keys in [first_key, next_key), key k in slot
+    # k % max_size.
+    self._first_key = 0
+    self._next_key = 0
+    self._num_samples = 0
+    self._condition = threading.Condition()
+
+  @property
+  def size(self) -> int:
+    return self._next_key - self._first_key
+
+  @property
+  def nbytes(self) -> int:
+    """The number of bytes allocated to store items, including frames."""
+    nbytes = sum(array.nbytes for array in self._arrays or [])
+    if self._frame_storage is not None:
+      nbytes += self._frame_storage.nbytes
+    return nbytes
+
+  def can_sample(self, num_samples: int = 1) -> bool:
+    with self._condition:
+      return self._can_sample(num_samples)
+
+  def _can_sample(self, num_samples: int) -> bool:
+    return self._rate_limiter.can_sample(self.size, self._next_key,
+                                         self._num_samples, num_samples)
+
+  def insert(self, steps: Sequence[List[np.ndarray]], priority: float,
+             timeout: Optional[float] = None):
+    """Inserts an item, blocking while the rate limiter does not allow it.
+
+    Args:
+      steps: the flattened timesteps of the item, oldest first.
+      priority: the priority of the item.
+      timeout: the maximum time to block for, in seconds.
+
+    Raises:
+      TimeoutError: if the insert is still blocked after `timeout` seconds.
+      ValueError: if the item does not match previous items in length.
+    """
+    with self._condition:
+      if not self._condition.wait_for(
+          lambda: self._rate_limiter.can_insert(
+              self.size, self._next_key, self._num_samples), timeout):
+        raise TimeoutError('Timed out waiting to insert into table {}.'.format(
+            self.name))
+
+      if self._frame_storage is not None:
+        steps = [self._add_frames(step) for step in steps]
+      if self._arrays is None:
+        self._arrays = [
+            np.zeros((self._max_size, len(steps)) + np.shape(value),
+                     dtype=np.asarray(value).dtype) for value in steps[0]
+        ]
+      if len(steps) != self._arrays[0].shape[1]:
+        raise ValueError(
+            'Table {} holds items of {} timesteps but got {}.'.format(
+                self.name, self._arrays[0].shape[1], len(steps)))
+
+      # Evict the oldest item to make room once the table is full.
+      if self.size == self._max_size:
+        self._evict_oldest()
+
+      index = self._next_key % self._max_size
+      for t, step in enumerate(steps):
+        for array, value in zip(self._arrays, step):
+          array[index, t] = value
+      self._times_sampled[index] = 0
+      self._set_priorities(np.array([index]), np.array([priority]))
+      self._next_key += 1
+
+      if self._frame_storage is not None:
+        self._oldest_frames[index] = min(
+            step[leaf] for step in steps
+            for leaf in self._frame_leaves) - self._frame_storage.stack_size + 1
+        if self._oldest_frames[index] < self._frame_storage.oldest_index:
+          raise ValueError('The frame storage is too small to hold an item.')
+        # Evict items whose frames have been overwritten.
+        while (self._oldest_frames[self._first_key % self._max_size] <
+               self._frame_storage.oldest_index):
+          self._evict_oldest()
+      self._condition.notify_all()
+
+  def _add_frames(self, step: List[np.ndarray]) -> List[np.ndarray]:
+    """Replaces the stacked observations of a step with their indices."""
+    return [
+        np.int64(self._frame_storage.add(value))
+        if leaf in self._frame_leaves else value
+        for leaf, value in enumerate(step)
+    ]
+
+  def _evict_oldest(self):
+    index = self._first_key % self._max_size
+    self._priorities[index] = 0.
+    # Zero the leaf directly, since a zero priority raised to the exponent is
+    # not zero when the exponent is zero.
+    if self._sum_tree is not None:
+      self._sum_tree.set(np.array([index]), np.array([0.]))
+    self._first_key += 1
+
+  def sample(self, num_samples: int, timeout: Optional[float] = None):
+    """Samples a batch of items, blocking while the rate limiter forbids it.
+
+    Args:
+      num_samples: the number of items to sample (with replacement).
+      timeout: the maximum time to block for, in seconds.
+
+    Returns:
+      A `reverb.SampleInfo` of arrays of shape `[num_samples]` and a list of
+      the sampled arrays, of shape `[num_samples, num_timesteps, ...]`.
+
+    Raises:
+      TimeoutError: if sampling is still blocked after `timeout` seconds.
+    """
+    with self._condition:
+      if not self._condition.wait_for(
+          lambda: self._can_sample(num_samples), timeout):
+        raise TimeoutError('Timed out waiting to sample from table {}.'.format(
+            self.name))
+
+      size = self.size
+      if self._sum_tree is None or self._sum_tree.total <= 0:
+        indices = (self._first_key + self._random_state.randint(
+            size, size=num_samples)) % self._max_size
+        probabilities = np.full(num_samples, 1. / size)
+      else:
+        indices = self._sum_tree.sample(num_samples, self._random_state)
+        probabilities = self._sum_tree.get(indices) / self._sum_tree.total
+
+      np.add.at(self._times_sampled, indices, 1)
+      self._num_samples += num_samples
+      self._condition.notify_all()
+
+      keys = self._first_key + (indices - self._first_key) % self._max_size
+      info = numpy_iterator.make_sample_info(
+          key=keys.astype(np.uint64),
+          probability=probabilities,
+          table_size=np.full(num_samples, size, dtype=np.int64),
+          priority=self._priorities[indices],
+          times_sampled=self._times_sampled[indices])
+      data = [array[indices] for array in self._arrays]
+      for leaf in self._frame_leaves:
+        data[leaf] = self._frame_storage.stacked(data[leaf])
+      return info, data
+
+  def mutate_priorities(self, updates: Mapping[int, float]):
+    """Updates the priorities of items which have not been evicted yet."""
+    if not updates:
+      return
+    keys = np.fromiter(updates.keys(), dtype=np.int64, count=len(updates))
+    priorities = np.fromiter(
+        updates.values(), dtype=np.float64, count=len(updates))
+    with self._condition:
+      valid = (keys >= self._first_key) & (keys < self._next_key)
+      self._set_priorities(keys[valid] % self._max_size, priorities[valid])
+
+  def _set_priorities(self, indices: np.ndarray, priorities: np.ndarray):
+    if not indices.size:
+      return
+    self._priorities[indices] = priorities
+    if self._sum_tree is not None:
+      self._sum_tree.set(indices,
+                         np.power(priorities, self._priority_exponent))
+
+
+def stacked_observation_leaves(
+    environment_spec: specs.EnvironmentSpec,
+    stack_size: int,
+    extra_spec: Optional[types.NestedSpec] = None,
+    transition_adder: bool = False) -> List[int]:
+  """Returns the positions of stacked observations in flattened items.
+
+  This gives the `frame_leaves` of a `Table` holding the items of an adder,
+  i.e. the positions of the observations (and next observations, for
+  transitions) whose last dimension is of size `stack_size`.
+
+  Args:
+    environment_spec: the environment's spec.
+    stack_size: the number of frames stacked in each observation.
+    extra_spec: a possibly nested structure of specs for extras.
+    transition_adder: whether items are written by a transition adder.
+  """
+  observation_specs = tree.flatten(environment_spec.observations)
+  adder_spec = numpy_iterator.make_adder_spec(environment_spec, extra_spec,
+                                              transition_adder)
+  return [
+      leaf for leaf, spec in enumerate(tree.flatten(adder_spec))
+      if any(spec is s for s in observation_specs) and spec.shape and
+      spec.shape[-1] == stack_size
+  ]
+
+
+class Writer:
+  """Writes items of recently appended steps to local tables.
+
+  This implements the subset of the `reverb.Writer` interface used by adders.
+  """
+
+  def __init__(self, tables: Mapping[str, Table], max_sequence_length: int):
+    self._tables = tables
+    self._steps = collections.deque(maxlen=max_sequence_length)
+
+  def append(self, step: types.NestedArray):
+    self._steps.append(tree.flatten(step))
+
+  def create_item(self, table: str, num_timesteps: int, priority: float):
+    if num_timesteps > len(self._steps):
+      raise ValueError(
+          'Cannot create an item of {} timesteps from {} appended steps.'
+          .format(num_timesteps, len(self._steps)))
+    steps = list(self._steps)[len(self._steps) - num_timesteps:]
+    self._tables[table].insert(steps, priority)
+
+  def flush(self):
+    """Does nothing, as items are inserted when they are created."""
+
+  def close(self):
+    self._steps.clear()
+
+
+class Client:
+  """A client of local tables, standing in for a `reverb.Client`.
+
+  This implements `writer` and `mutate_priorities` as used by adders and
+  learners, and can be sampled from with the iterator of `make_iterator`.
+  """
+
+  def __init__(self, tables: Sequence[Table]):
+    self._tables = {table.name: table for table in tables}
+
+  def table(self, name: str) -> Table:
+    return self._tables[name]
+
+  def writer(self, max_sequence_length: int, **unused_kwargs) -> Writer:
+    return Writer(self._tables, max_sequence_length)
+
+  def mutate_priorities(self,
+                        table: str,
+                        updates: Optional[Mapping[int, float]] = None,
+                        deletes: Optional[Sequence[int]] = None):
+    """Updates the priorities of items in a table.
+
+    Args:
+      table: the name of the table.
+      updates: a mapping from the keys of items to their new priorities.
+      deletes: must be empty, as items cannot be deleted from local tables.
+
+    Raises:
+      ValueError: if `deletes` is not empty.
+    """
+    if deletes:
+      raise ValueError('Items cannot be deleted from local tables.')
+    self._tables[table].mutate_priorities(updates or {})
+
+
+class LocalReplayIterator(Iterator[reverb.ReplaySample]):
+  """Iterates over batches sampled from a local table.
+
+  This yields the same `reverb.ReplaySample` structures as the iterators of
+  `make_reverb_dataset` and `make_reverb_numpy_iterator`. Batches are sampled
+  in the calling thread, as sampling from local tables is cheap.
+  """
+
+  def __init__(
+      self,
+      client: Client,
+      environment_spec: specs.EnvironmentSpec,
+      batch_size: int,
+      sequence_length: Optional[int] = None,
+      extra_spec: Optional[types.NestedSpec] = None,
+      transition_adder: bool = False,
+      table: str = adders.DEFAULT_PRIORITY_TABLE,
+  ):
+    self._adder_spec = numpy_iterator.make_adder_spec(
+        environment_spec, extra_spec, transition_adder)
+    self._table = client.table(table)
+    self._batch_size = batch_size
+    self._sequence_length = sequence_length
+
+  def __iter__(self):
+    return self
+
+  def __next__(self) -> reverb.ReplaySample:
+    info, data = self._table.sample(self._batch_size)
+    if not self._sequence_length:
+      data = [array[:, 0] for array in data]
+    return reverb.ReplaySample(
+        info=info, data=tree.unflatten_as(self._adder_spec, data))
+
+
+def make_iterator(
+    client: Client,
+    environment_spec: specs.EnvironmentSpec,
+    batch_size: int,
+    sequence_length: Optional[int] = None,
+    extra_spec: Optional[types.NestedSpec] = None,
+    transition_adder: bool = False,
+    table: str = adders.DEFAULT_PRIORITY_TABLE,
+) -> LocalReplayIterator:
+  """Makes an iterator over batches sampled from a local table.
+
+  Args:
+    client: the client of the local table.
+    environment_spec: the environment's spec.
+    batch_size: the number of items in each batch.
+    sequence_length: if specified items are expected to be sequences of this
+      length, as written by e.g. the `SequenceAdder`.
+    extra_spec: a possibly nested structure of specs for extras.
+    transition_adder: whether the adder used with this iterator adds
+      transitions.
+    table: the name of the table to sample from.
+
+  Returns:
+    An iterator over batches of `reverb.ReplaySample`.
+  """
+  return LocalReplayIterator(
+      client=client,
+      environment_spec=environment_spec,
+      batch_size=batch_size,
+      sequence_length=sequence_length,
+      extra_spec=extra_spec,
+      transition_adder=transition_adder,
+      table=table)
+
+
+def make_dataset(
+    client: Client,
+    environment_spec: specs.EnvironmentSpec,
+    batch_size: int,
+    sequence_length: Optional[int] = None,
+    extra_spec: Optional[types.NestedSpec] = None,
+    transition_adder: bool = False,
+    table: str = adders.DEFAULT_PRIORITY_TABLE,
+) -> tf.data.Dataset:
+  """Makes a dataset of batches sampled from a local table.
+
+  This wraps `make_iterator` with `tf.data.Dataset.from_generator`, and so
+  yields the same (batched) `reverb.ReplaySample` structures as
+  `make_reverb_dataset`.
+
+  Args:
+    client: the client of the local table.
+    environment_spec: the environment's spec.
+    batch_size: the number of items in each batch.
+    sequence_length: if specified items are expected to be sequences of this
+      length, as written by e.g. the `SequenceAdder`.
+    extra_spec: a possibly nested structure of specs for extras.
+    transition_adder: whether the adder used with this dataset adds
+      transitions.
+    table: the name of the table to sample from.
+
+  Returns:
+    A `tf.data.Dataset` of batches of `reverb.ReplaySample`.
+  """
+  adder_spec = numpy_iterator.make_adder_spec(
+      environment_spec, extra_spec, transition_adder)
+  outer_shape = [batch_size] + ([sequence_length] if sequence_length else [])
+  signature = reverb.ReplaySample(
+      info=numpy_iterator.make_sample_info_spec([batch_size]),
+      data=tree.map_structure(
+          lambda spec: specs.Array(outer_shape + list(spec.shape), spec.dtype),
+          adder_spec))
+  signature = tree.map_structure(
+      lambda spec: tf.TensorSpec(spec.shape, spec.dtype), signature)
+
+  def generator():
+    return make_iterator(
+        client=client,
+        environment_spec=environment_spec,
+        batch_size=batch_size,
+        sequence_length=sequence_length,
+        extra_spec=extra_spec,
+        transition_adder=transition_adder,
+        table=table)
+
+  return tf.data.Dataset.from_generator(generator, output_signature=signature)
@@ -0,0 +1,287 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the in-process replay."""
+
+from absl.testing import absltest
+
+from acme import specs
+from acme.adders import reverb as adders
+from acme.datasets import local_replay
+from acme.testing import fakes
+from acme.wrappers import atari_wrapper
+
+import dm_env
+import numpy as np
+
+
+class SumTreeTest(absltest.TestCase):
+
+  def test_set_and_total(self):
+    sum_tree = local_replay.SumTree(5)
+    sum_tree.set(np.array([0, 3, 4]), np.array([1., 2., 3.]))
+    self.assertEqual(sum_tree.total, 6.)
+    sum_tree.set(np.array([3]), np.array([0.5]))
+    self.assertEqual(sum_tree.total, 4.5)
+    np.testing.assert_array_equal(sum_tree.get(np.array([0, 3])), [1., 0.5])
+
+  def test_find(self):
+    sum_tree = local_replay.SumTree(4)
+    sum_tree.set(np.arange(4), np.array([1., 0., 2., 1.]))
+    np.testing.assert_array_equal(
+        sum_tree.find(np.array([0., 0.99, 1., 2.5, 3.5])), [0, 0, 2, 2, 3])
+
+  def test_sample_proportionally(self):
+    sum_tree = local_replay.SumTree(3)
+    sum_tree.set(np.arange(3), np.array([1., 0., 3.]))
+    samples = sum_tree.sample(4000, np.random.RandomState(0))
+    counts = np.bincount(samples, minlength=3)
+    self.assertEqual(counts[1], 0)
+    self.assertAlmostEqual(counts[2] / counts[0], 3., delta=0.1)
+
+
+class TableTest(absltest.TestCase):
+
+  def _insert(self, table, value, priority=1., timeout=None):
+    table.insert([[np.array([value], dtype=np.float32)]], priority, timeout)
+
+  def test_fifo_eviction(self):
+    table = local_replay.Table('table', max_size=3)
+    for value in range(5):
+      self._insert(table, value)
+    self.assertEqual(table.size, 3)
+
+    info, (data,) = table.sample(100)
+    self.assertEqual(data.shape, (100, 1, 1))
+    self.assertEqual(set(data.ravel()), {2., 3., 4.})
+    # Keys identify the items across evictions.
+    np.testing.assert_array_equal(info.key, data.ravel())
+    np.testing.assert_array_equal(info.probability, 1. / 3)
+
+  def test_prioritized(self):
+    table = local_replay.Table('table', max_size=10, priority_exponent=1.)
+    for value in range(3):
+      self._insert(table, value, priority=1.)
+
+    # Evicted (or never inserted) keys are ignored.
+    table.mutate_priorities({0: 0., 1: 3., 7: 1.})
+    info, (data,) = table.sample(1000)
+    self.assertNotIn(0., data)
+    np.testing.assert_array_equal(info.priority[data.ravel() == 1.], 3.)
+    np.testing.assert_allclose(info.probability[data.ravel() == 1.], 0.75)
+
+  def test_zero_priorities_sample_uniformly(self):
+    table = local_replay.Table('table', max_size=5, priority_exponent=1.)
+    for value in range(3):
+      self._insert(table, value, priority=0.)
+
+    info, (data,) = table.sample(100)
+    self.assertEqual(set(data.ravel()), {0., 1., 2.})
+    np.testing.assert_array_equal(info.probability, 1. / 3)
+
+  def test_rate_limiters(self):
+    table = local_replay.Table(
+        'table', max_size=10, rate_limiter=local_replay.MinSize(2))
+    self._insert(table, 0.)
+    self.assertFalse(table.can_sample())
+    with self.assertRaises(TimeoutError):
+      table.sample(1, timeout=0.01)
+    self._insert(table, 1.)
+    self.assertTrue(table.can_sample(10))
+
+    table = local_replay.Table(
+        'table',
+        max_size=10,
+        rate_limiter=local_replay.SampleToInsertRatio(
+            samples_per_insert=2., min_size_to_sample=1, error_buffer=2.))
+    self._insert(table, 0.)
+    self._insert(table, 1.)
+    with self.assertRaises(TimeoutError):
+      self._insert(table, 2., timeout=0.01)
+    table.sample(4)
+    self.assertFalse(table.can_sample())
+    self._insert(table, 2.)
+
+
+class FrameStorageTest(absltest.TestCase):
+
+  def test_stores_unique_frames(self):
+    storage = local_replay.FrameStorage(capacity=100, stack_size=3)
+    stacker = atari_wrapper.FrameStacker(length=3)
+    frames = np.random.RandomState(0).randint(0, 255, size=(10, 4, 4))
+    observations = [stacker.step(frame) for frame in frames]
+
+    indices = [storage.add(observation) for observation in observations]
+    # The first observation is stored whole, including its zero padding.
+    self.assertEqual(indices, list(range(2, 12)))
+    # Observations which were already added are not stored again.
+    self.assertEqual(storage.add(observations[7]), indices[7])
+    self.assertEqual(storage.nbytes, 100 * frames[0].nbytes)
+
+    np.testing.assert_array_equal(
+        storage.stacked(np.array(indices)), np.stack(observations))
+
+  def test_overwrites_oldest_frames(self):
+    storage = local_replay.FrameStorage(capacity=8, stack_size=2)
+    for frame in range(10):
+      storage.add(np.full((2, 2), frame)[..., None].repeat(2, -1))
+    self.assertEqual(storage.oldest_index, 12)
+
+
+class FrameTableTest(absltest.TestCase):
+
+  def test_deduplicates_transitions(self):
+    spec = specs.EnvironmentSpec(
+        observations=specs.Array((20, 20, 4), np.uint8),
+        actions=specs.DiscreteArray(3),
+        rewards=specs.Array((), np.float32),
+        discounts=specs.BoundedArray((), np.float32, 0., 1.))
+    frame_leaves = local_replay.stacked_observation_leaves(
+        spec, stack_size=4, transition_adder=True)
+    self.assertEqual(frame_leaves, [0, 4])
+
+    name = adders.DEFAULT_PRIORITY_TABLE
+    tables = [
+        local_replay.Table(name, max_size=1000, seed=1),
+        local_replay.Table(
+            name,
+            max_size=1000,
+            seed=1,
+            frame_leaves=frame_leaves,
+            frame_storage=local_replay.FrameStorage(1200, stack_size=4)),
+    ]
+    random_state = np.random.RandomState(0)
+    for table in tables:
+      adder = adders.NStepTransitionAdder(
+          local_replay.Client([table]), n_step=3, discount=1.)
+      for _ in range(4):
+        stacker = atari_wrapper.FrameStacker(length=4)
+        frame = lambda: random_state.randint(0, 255, (20, 20)).astype(np.uint8)
+        adder.add_first(dm_env.restart(stacker.step(frame())))
+        for t in range(50):
+          step = dm_env.transition if t < 49 else dm_env.termination
+          adder.add(np.int32(0), step(np.float32(1.), stacker.step(frame())))
+      random_state = np.random.RandomState(0)
+
+    # Both tables hold (and sample) the same transitions.
+    (info, data), (dedup_info, dedup_data) = [t.sample(50) for t in tables]
+    np.testing.assert_array_equal(info.key, dedup_info.key)
+    for array, dedup_array in zip(data, dedup_data):
+      np.testing.assert_array_equal(array, dedup_array)
+
+    # Each frame appears in the stacks of 8 observations across transitions,
+    # but is stored once (with room for 1.2 frames per transition here).
+    self.assertLess(tables[1].nbytes * 5, tables[0].nbytes)
+
+  def test_evicts_items_with_overwritten_frames(self):
+    table = local_replay.Table(
+        'table',
+        max_size=100,
+        frame_leaves=[0],
+        frame_storage=local_replay.FrameStorage(20, stack_size=2))
+    stacker = atari_wrapper.FrameStacker(length=2)
+    for frame in range(30):
+      table.insert([[stacker.step(np.full((2,), frame))]], priority=1.)
+    # Every item uses its own frame and the previous one.
+    self.assertEqual(table.size, 19)
+    _, (data,) = table.sample(100)
+    np.testing.assert_array_equal(data[..., 1] - data[..., 0], 1)
+    self.assertGreaterEqual(data.min(), 10)
+
+  def test_does_not_sample_evicted_items_with_exponent_zero(self):
+    table = local_replay.Table(
+        'table',
+        max_size=100,
+        priority_exponent=0.,
+        frame_leaves=[0],
+        frame_storage=local_replay.FrameStorage(16, stack_size=2))
+    stacker = atari_wrapper.FrameStacker(length=2)
+    for frame in range(30):
+      table.insert([[stacker.step(np.full((2,), frame))]], priority=1.)
+
+    info, _ = table.sample(2000)
+    first_key = 30 - table.size
+    self.assertGreaterEqual(info.key.min(), first_key)
+    self.assertLess(info.key.max(), 30)
+
+
+class ClientTest(absltest.TestCase):
+
+  def test_adder_and_iterator(self):
+    environment = fakes.ContinuousEnvironment(
+        action_dim=2, observation_dim=3, episode_length=10)
+    spec = specs.make_environment_spec(environment)
+    client = local_replay.Client([
+        local_replay.Table(
+            adders.DEFAULT_PRIORITY_TABLE, max_size=100, priority_exponent=0.5)
+    ])
+    adder = adders.NStepTransitionAdder(client, n_step=2, discount=1.)
+
+    action = np.zeros((2,), dtype=np.float32)
+    timestep = environment.reset()
+    adder.add_first(timestep)
+    while not timestep.last():
+      timestep = environment.step(action)
+      adder.add(action, timestep)
+
+    iterator = local_replay.make_iterator(
+        client, spec, batch_size=8, transition_adder=True)
+    sample = next(iterator)
+    observation, action, reward, discount, next_observation = sample.data
+    self.assertEqual(observation.shape, (8, 3))
+    self.assertEqual(action.shape, (8, 2))
+    self.assertEqual(reward.shape, (8,))
+    self.assertEqual(discount.shape, (8,))
+    self.assertEqual(next_observation.shape, (8, 3))
+    self.assertEqual(sample.info.table_size[0], 11)
+
+    client.mutate_priorities(
+        adders.DEFAULT_PRIORITY_TABLE,
+        updates={int(key): 2. for key in sample.info.key})
+    np.testing.assert_array_equal(next(iterator).info.priority >= 1., True)
+
+    with self.assertRaises(ValueError):
+      client.mutate_priorities(adders.DEFAULT_PRIORITY_TABLE, deletes=[0])
+
+  def test_dataset(self):
+    environment = fakes.DiscreteEnvironment(
+        num_actions=3, num_observations=5, obs_dtype=np.float32,
+        episode_length=10)
+    spec = specs.make_environment_spec(environment)
+    client = local_replay.Client(
+        [local_replay.Table(adders.DEFAULT_PRIORITY_TABLE, max_size=100)])
+    adder = adders.NStepTransitionAdder(client, n_step=1, discount=1.)
+
+    action = spec.actions.generate_value()
+    pi = np.full((3,), 1. / 3, dtype=np.float32)
+    timestep = environment.reset()
+    adder.add_first(timestep)
+    while not timestep.last():
+      timestep = environment.step(action)
+      adder.add(action, timestep, extras={'pi': pi})
+
+    dataset = local_replay.make_dataset(
+        client, spec, batch_size=4, transition_adder=True,
+        extra_spec={'pi': specs.Array((3,), np.float32)})
+    sample = next(iter(dataset))
+    observations, actions, _, _, _, extras = sample.data
+    self.assertEqual(observations.shape, (4,) + spec.observations.shape)
+    self.assertEqual(actions.dtype, spec.actions.dtype)
+    np.testing.assert_array_equal(extras['pi'], np.tile(pi, (4, 1)))
+    np.testing.assert_array_equal(sample.info.table_size, 10)
+
+
+if __name__ == '__main__':
+  absltest.main()
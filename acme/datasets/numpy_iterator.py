@@ -0,0 +1,287 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""NumPy iterators which sample from Reverb replay without using tf.data."""
+
+import inspect
+import queue
+import sys
+import threading
+from typing import Iterator, List, Optional, Sequence
+
+from acme import specs
+from acme import types
+from acme.adders import reverb as adders
+
+import numpy as np
+import reverb
+import tree
+
+# Dtypes of the fields of `reverb.SampleInfo`, as used by reverb's datasets.
+# Older versions of reverb (e.g. the one pinned in setup.py) only have some of
+# these fields, so only those of the installed version are used.
+_ALL_INFO_DTYPES = {
+    'key': np.uint64,
+    'probability': np.float64,
+    'table_size': np.int64,
+    'priority': np.float64,
+    'times_sampled': np.int32,
+}
+_INFO_DTYPES = [_ALL_INFO_DTYPES[field] for field in reverb.SampleInfo._fields]
+
+
+def make_sample_info(**fields) -> reverb.SampleInfo:
+  """Makes a `reverb.SampleInfo`, dropping fields it does not have."""
+  return reverb.SampleInfo(
+      *[fields[field] for field in reverb.SampleInfo._fields])
+
+
+def make_sample_info_spec(shape: Sequence[int]) -> reverb.SampleInfo:
+  """Makes a `reverb.SampleInfo` of array specs with the given shape."""
+  return reverb.SampleInfo(
+      *[specs.Array(shape, dtype) for dtype in _INFO_DTYPES])
+
+
+def make_adder_spec(environment_spec: specs.EnvironmentSpec,
+                    extra_spec: Optional[types.NestedSpec] = None,
+                    transition_adder: bool = False) -> types.NestedSpec:
+  """Returns the spec of the data written by adders, as sampled from replay.
+
+  This is the environment spec converted to a plain tuple, with the same
+  additions as made by `make_reverb_dataset`.
+
+  Args:
+    environment_spec: The environment's spec.
+    extra_spec: Optional. A possibly nested structure of specs for extras.
+    transition_adder: Whether the adder adds transitions, which also hold the
+      next observation.
+  """
+  adder_spec = tuple(environment_spec)
+  if transition_adder:
+    adder_spec += (environment_spec.observations,)
+  if extra_spec:
+    adder_spec += (extra_spec,)
+  return adder_spec
+
+
+class ReverbNumpyIterator(Iterator[reverb.ReplaySample]):
+  """Iterates over batches of replay samples as NumPy arrays.
+
+  This yields the same `reverb.ReplaySample` structures as iterating over
+  `make_reverb_dataset(...).as_numpy_iterator()`, but samples directly with
+  `reverb.Client.sample` rather than through a `tf.data` pipeline, and so
+  avoids converting every batch from tensors.
+
+  A number of worker threads each sample and assemble whole batches, writing
+  samples directly into batch-shaped arrays allocated from the specs, and
+  queue them for the consumer. A new batch is allocated each time so that the
+  consumer is free to hold on to the arrays it receives.
+  """
+
+  def __init__(
+      self,
+      client: reverb.Client,
+      environment_spec: specs.EnvironmentSpec,
+      batch_size: int,
+      sequence_length: Optional[int] = None,
+      extra_spec: Optional[types.NestedSpec] = None,
+      transition_adder: bool = False,
+      table: str = adders.DEFAULT_PRIORITY_TABLE,
+      num_workers: int = 2,
+      prefetch_size: int = 2,
+      sequence_extras: Sequence[str] = (),
+  ):
+    """Initializes the iterator and starts its worker threads.
+
+    Args:
+      client: A client for talking to a replay server.
+      environment_spec: The environment's spec.
+      batch_size: The number of samples in each batch.
+      sequence_length: Optional. If specified samples are expected to be
+        sequences of this length, as written by e.g. the `SequenceAdder`.
+      extra_spec: Optional. A possibly nested structure of specs for extras.
+      transition_adder: Whether the adder used with this iterator adds
+        transitions.
+      table: The name of the table to sample from replay.
+      num_workers: The number of threads sampling from replay.
+      prefetch_size: The number of batches each worker may assemble ahead of
+        the consumer.
+      sequence_extras: Keys of the (dict) extras which were written once per
+        sequence, see `SequenceAdder`. These are returned without a time
+        dimension, as by `make_reverb_dataset` (and are likewise sampled for
+        every step, then sliced).
+
+    Raises:
+      ValueError: If `sequence_extras` are given without a `sequence_length` or
+        are missing from `extra_spec`.
+    """
+    if sequence_extras:
+      if not sequence_length:
+        raise ValueError('sequence_extras require a sequence_length.')
+      missing = set(sequence_extras) - set(extra_spec or {})
+      if missing:
+        raise ValueError(
+            'sequence_extras {} are not in extra_spec.'.format(sorted(missing)))
+
+    adder_spec = make_adder_spec(environment_spec, extra_spec,
+                                 transition_adder)
+    self._adder_spec = adder_spec
+    self._flat_spec = tree.flatten(adder_spec)
+    self._flat_sequence_level = [False] * len(self._flat_spec)
+    if sequence_extras:
+      self._flat_sequence_level = tree.flatten(
+          _sequence_level(adder_spec, sequence_extras))
+    self._client = client
+    self._table = table
+    self._batch_size = batch_size
+    self._sequence_length = sequence_length
+
+    self._batches = queue.Queue(maxsize=num_workers * prefetch_size)
+    self._stop = threading.Event()
+    self._workers = [
+        threading.Thread(target=self._work, daemon=True)
+        for _ in range(num_workers)
+    ]
+    for worker in self._workers:
+      worker.start()
+
+  def __iter__(self):
+    return self
+
+  def __next__(self) -> reverb.ReplaySample:
+    batch = self._batches.get()
+    if isinstance(batch, Exception):
+      self._batches.put(batch)  # So that every later call raises it too.
+      raise batch
+    return batch
+
+  def close(self):
+    """Stops the worker threads after they finish the batch they assemble."""
+    self._stop.set()
+
+  def _work(self):
+    """Assembles batches of samples until stopped."""
+    try:
+      samples = _sample_items(self._client, self._table)
+      while not self._stop.is_set():
+        batch = self._assemble_batch(samples)
+        while not self._stop.is_set():
+          try:
+            self._batches.put(batch, timeout=0.1)
+            break
+          except queue.Full:
+            continue
+    except Exception as e:  # pylint: disable=broad-except
+      self._batches.put(e)
+
+  def _assemble_batch(self, samples) -> reverb.ReplaySample:
+    """Writes the next `batch_size` samples into newly allocated arrays."""
+    outer_shape = (self._batch_size,)
+    if self._sequence_length:
+      outer_shape += (self._sequence_length,)
+    data = [
+        np.empty(outer_shape[:1 if sequence_level else None] +
+                 tuple(spec.shape), dtype=spec.dtype)
+        for spec, sequence_level in zip(self._flat_spec,
+                                        self._flat_sequence_level)
+    ]
+    info = [np.empty(outer_shape[:1], dtype=dtype) for dtype in _INFO_DTYPES]
+
+    for index in range(self._batch_size):
+      sample_info, columns = next(samples)
+      _write_row(info, index, sample_info)
+      _write_row(data, index, self._unpack(columns))
+
+    return reverb.ReplaySample(
+        info=reverb.SampleInfo(*info),
+        data=tree.unflatten_as(self._adder_spec, data))
+
+  def _unpack(self, columns: List[np.ndarray]) -> List[np.ndarray]:
+    """Strips the time dimension of single timesteps and sequence extras."""
+    if len(columns) != len(self._flat_spec):
+      raise ValueError(
+          'Sampled {} arrays but the specs describe {}; check that the specs '
+          'match those used by the adder.'.format(
+              len(columns), len(self._flat_spec)))
+    if self._sequence_length:
+      return [
+          column[0] if sequence_level else column
+          for column, sequence_level in zip(columns, self._flat_sequence_level)
+      ]
+    return [column[0] for column in columns]
+
+
+def _sequence_level(adder_spec: types.NestedSpec,
+                    sequence_extras: Sequence[str]) -> types.NestedArray:
+  """Returns `adder_spec` with leaves marking whether they are per sequence."""
+  *fields, extra_spec = adder_spec
+  fields = tree.map_structure(lambda _: False, tuple(fields))
+  extra_spec = {
+      key: tree.map_structure(lambda _, k=key: k in sequence_extras, spec)
+      for key, spec in extra_spec.items()
+  }
+  return fields + (extra_spec,)
+
+
+def _sample_items(client: reverb.Client, table: str):
+  """Yields the info and time-major columns of items sampled from `table`."""
+  if 'emit_timesteps' in inspect.signature(client.sample).parameters:
+    for sample in client.sample(
+        table, num_samples=sys.maxsize, emit_timesteps=False):
+      yield sample.info, sample.data
+  else:
+    # Older versions of reverb yield each item as a list of timesteps.
+    for timesteps in client.sample(table, num_samples=sys.maxsize):
+      columns = zip(*[timestep.data for timestep in timesteps])
+      yield timesteps[0].info, [np.stack(column) for column in columns]
+
+
+def _write_row(batch: List[np.ndarray], index: int, values):
+  for array, value in zip(batch, values):
+    array[index] = value
+
+
+def make_reverb_numpy_iterator(
+    client: reverb.Client,
+    environment_spec: specs.EnvironmentSpec,
+    batch_size: int,
+    sequence_length: Optional[int] = None,
+    extra_spec: Optional[types.NestedSpec] = None,
+    transition_adder: bool = False,
+    table: str = adders.DEFAULT_PRIORITY_TABLE,
+    num_workers: int = 2,
+    prefetch_size: int = 2,
+    sequence_extras: Sequence[str] = (),
+) -> ReverbNumpyIterator:
+  """Makes an iterator over batches sampled from replay, as NumPy arrays.
+
+  This is the counterpart of `make_reverb_dataset` for learners which consume
+  NumPy arrays (e.g. JAX learners) and so have no use for a `tf.data` pipeline;
+  see `ReverbNumpyIterator` for details of the arguments.
+
+  Returns:
+    An iterator over batches of `reverb.ReplaySample`.
+  """
+  return ReverbNumpyIterator(
+      client=client,
+      environment_spec=environment_spec,
+      batch_size=batch_size,
+      sequence_length=sequence_length,
+      extra_spec=extra_spec,
+      transition_adder=transition_adder,
+      table=table,
+      num_workers=num_workers,
+      prefetch_size=prefetch_size,
+      sequence_extras=sequence_extras)
@@ -0,0 +1,191 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the NumPy replay iterator."""
+
+from absl.testing import absltest
+
+from acme import specs
+from acme.adders import reverb as adders
+from acme.datasets import numpy_iterator
+from acme.testing import fakes
+
+import dm_env
+import numpy as np
+import reverb
+
+
+def _run_episodes(environment: dm_env.Environment, adder: adders.ReverbAdder,
+                  num_episodes: int):
+  """Adds episodes generated with constant actions."""
+  action = np.zeros((1,), dtype=np.float32)
+  for _ in range(num_episodes):
+    timestep = environment.reset()
+    adder.add_first(timestep)
+    while not timestep.last():
+      timestep = environment.step(action)
+      adder.add(action, timestep)
+
+
+class _TimestepClient:
+  """Client which samples items as lists of timesteps, as older reverbs do."""
+
+  def __init__(self, client: reverb.Client):
+    self._client = client
+
+  def sample(self, table, num_samples=1):
+    for sample in self._client.sample(
+        table, num_samples=num_samples, emit_timesteps=False):
+      yield [
+          reverb.ReplaySample(sample.info, list(timestep))
+          for timestep in zip(*sample.data)
+      ]
+
+
+class NumpyIteratorTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._server = reverb.Server(
+        tables=[
+            reverb.Table(
+                adders.DEFAULT_PRIORITY_TABLE,
+                reverb.selectors.Uniform(),
+                reverb.selectors.Fifo(),
+                max_size=1000,
+                rate_limiter=reverb.rate_limiters.MinSize(1))
+        ],
+        port=None)
+    self._client = reverb.Client(f'localhost:{self._server.port}')
+    self._environment = fakes.ContinuousEnvironment(
+        action_dim=1, observation_dim=3, episode_length=10)
+    self._spec = specs.make_environment_spec(self._environment)
+
+  def tearDown(self):
+    self._server.stop()
+    super().tearDown()
+
+  def test_transitions(self):
+    adder = adders.NStepTransitionAdder(self._client, n_step=1, discount=1.)
+    _run_episodes(self._environment, adder, num_episodes=2)
+
+    iterator = numpy_iterator.make_reverb_numpy_iterator(
+        self._client, self._spec, batch_size=4, transition_adder=True)
+    sample = next(iterator)
+    iterator.close()
+
+    observation, action, reward, discount, next_observation = sample.data
+    self.assertEqual(observation.shape, (4, 3))
+    self.assertEqual(observation.dtype, self._spec.observations.dtype)
+    self.assertEqual(next_observation.shape, (4, 3))
+    self.assertEqual(action.shape, (4, 1))
+    self.assertEqual(reward.shape, (4,))
+    self.assertEqual(discount.shape, (4,))
+    self.assertEqual(sample.info.key.shape, (4,))
+    self.assertEqual(sample.info.key.dtype, np.uint64)
+    np.testing.assert_array_equal(sample.info.priority, 1.)
+
+  def test_sequences(self):
+    adder = adders.SequenceAdder(self._client, sequence_length=5, period=5)
+    _run_episodes(self._environment, adder, num_episodes=2)
+
+    iterator = numpy_iterator.make_reverb_numpy_iterator(
+        self._client,
+        self._spec,
+        batch_size=3,
+        sequence_length=5,
+        num_workers=1)
+    for _ in range(2):
+      observation, action, reward, discount = next(iterator).data
+      self.assertEqual(observation.shape, (3, 5, 3))
+      self.assertEqual(action.shape, (3, 5, 1))
+      self.assertEqual(reward.shape, (3, 5))
+      self.assertEqual(discount.shape, (3, 5))
+    iterator.close()
+
+  def test_sequences_sampled_as_timesteps(self):
+    adder = adders.SequenceAdder(self._client, sequence_length=5, period=5)
+    _run_episodes(self._environment, adder, num_episodes=1)
+
+    iterator = numpy_iterator.make_reverb_numpy_iterator(
+        _TimestepClient(self._client),
+        self._spec,
+        batch_size=3,
+        sequence_length=5,
+        num_workers=1)
+    observation, action, reward, discount = next(iterator).data
+    iterator.close()
+    self.assertEqual(observation.shape, (3, 5, 3))
+    self.assertEqual(action.shape, (3, 5, 1))
+    self.assertEqual(reward.shape, (3, 5))
+    self.assertEqual(discount.shape, (3, 5))
+
+  def test_sequence_extras(self):
+    adder = adders.SequenceAdder(
+        self._client, sequence_length=5, period=5,
+        sequence_extras=('core_state',))
+    action = np.zeros((1,), dtype=np.float32)
+    timestep = self._environment.reset()
+    adder.add_first(timestep)
+    for t in range(1, 11):
+      timestep = self._environment.step(action)
+      extras = {
+          'core_state': np.full((2,), t, dtype=np.float32),
+          'logits': np.full((1,), t, dtype=np.float32),
+      }
+      adder.add(action, timestep, extras)
+
+    extra_spec = {
+        'core_state': specs.Array((2,), np.float32),
+        'logits': specs.Array((1,), np.float32),
+    }
+    iterator = numpy_iterator.make_reverb_numpy_iterator(
+        self._client,
+        self._spec,
+        batch_size=3,
+        sequence_length=5,
+        extra_spec=extra_spec,
+        num_workers=1,
+        sequence_extras=('core_state',))
+    extras = next(iterator).data[-1]
+    iterator.close()
+
+    self.assertEqual(extras['core_state'].shape, (3, 2))
+    self.assertEqual(extras['logits'].shape, (3, 5, 1))
+    # The core state is the one at the start of each sequence.
+    np.testing.assert_array_equal(extras['core_state'][:, 0],
+                                  extras['logits'][:, 0, 0])
+
+  def test_sequence_extras_without_sequence_length_raise(self):
+    extra_spec = {'core_state': specs.Array((2,), np.float32)}
+    with self.assertRaises(ValueError):
+      numpy_iterator.make_reverb_numpy_iterator(
+          self._client, self._spec, batch_size=2, extra_spec=extra_spec,
+          sequence_extras=('core_state',))
+
+  def test_mismatched_specs_raise(self):
+    adder = adders.NStepTransitionAdder(self._client, n_step=1, discount=1.)
+    _run_episodes(self._environment, adder, num_episodes=1)
+
+    # The transition adder adds the next observation, which is not expected.
+    iterator = numpy_iterator.make_reverb_numpy_iterator(
+        self._client, self._spec, batch_size=2)
+    with self.assertRaises(ValueError):
+      next(iterator)
+    iterator.close()
+
+
+if __name__ == '__main__':
+  absltest.main()
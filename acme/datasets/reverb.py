@@ -15,7 +15,7 @@
 
 """Functions for making TensorFlow datasets for sampling from Reverb replay."""
 
-from typing import Optional
+from typing import Optional, Sequence
 
 from acme import specs
 from acme import types
@@ -37,6 +37,7 @@ def make_reverb_dataset(
     table: str = adders.DEFAULT_PRIORITY_TABLE,
     parallel_batch_optimization: bool = True,
     convert_zero_size_to_none: bool = False,
+    sequence_extras: Sequence[str] = (),
 ) -> tf.data.Dataset:
   """Makes a TensorFlow dataset.
 
@@ -72,13 +73,31 @@ def make_reverb_dataset(
       shapes for example `GraphsTuple` from the graph_net library. For example,
       `specs.Array((0, 5), tf.float32)` will correspond to a examples with shape
       `tf.TensorShape([None, 5])`.
+    sequence_extras: Keys of the (dict) extras which were written once per
+      sequence, see `SequenceAdder`. These are returned without a time
+      dimension, holding their value at the start of the sequence. Requires
+      `sequence_length` to be given. Note that they are still sampled (and
+      decompressed) for every step of the sequence, and only sliced to their
+      first step afterwards.
 
   Returns:
     A tf.data.Dataset that streams data from the replay server.
+
+  Raises:
+    ValueError: If `sequence_extras` are given without a `sequence_length` or
+      are missing from `extra_spec`.
   """
 
   assert isinstance(client, reverb.TFClient)
 
+  if sequence_extras:
+    if not sequence_length:
+      raise ValueError('sequence_extras require a sequence_length.')
+    missing = set(sequence_extras) - set(extra_spec or {})
+    if missing:
+      raise ValueError(
+          'sequence_extras {} are not in extra_spec.'.format(sorted(missing)))
+
   # Use the environment spec but convert it to a plain tuple.
   adder_spec = tuple(environment_spec)
 
@@ -111,8 +130,18 @@ def make_reverb_dataset(
         sequence_length=sequence_length,
         emit_timesteps=sequence_length is None,
     )
+    if sequence_extras:
+      dataset = dataset.map(_take_sequence_extras)
     return dataset
 
+  def _take_sequence_extras(
+      sample: reverb.ReplaySample) -> reverb.ReplaySample:
+    *fields, extras = sample.data
+    extras = dict(extras)
+    for key in sequence_extras:
+      extras[key] = tree.map_structure(lambda x: x[0], extras[key])
+    return reverb.ReplaySample(sample.info, tuple(fields) + (extras,))
+
   # Create the dataset.
   dataset = tf.data.Dataset.range(1).repeat()
   dataset = dataset.interleave(
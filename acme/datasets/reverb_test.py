@@ -184,6 +184,52 @@ class DatasetsTest(absltest.TestCase):
     self.assertTrue(
         _check_specs(tuple(expected_spec), dataset.element_spec.data))
 
+  def test_make_dataset_with_sequence_extras(self):
+    sequence_length = 6
+    environment = fakes.ContinuousEnvironment()
+    environment_spec = specs.make_environment_spec(environment)
+    extra_spec = {
+        'core_state': specs.Array((8,), 'float32'),
+        'logits': specs.Array((2,), 'float32'),
+    }
+    dataset = reverb_dataset.make_dataset(
+        client=self.tf_client,
+        environment_spec=environment_spec,
+        sequence_length=sequence_length,
+        extra_spec=extra_spec,
+        sequence_extras=('core_state',))
+
+    def make_tensor_spec(spec):
+      return tf.TensorSpec(
+          shape=(sequence_length,) + spec.shape, dtype=spec.dtype)
+
+    expected_spec = tree.map_structure(make_tensor_spec,
+                                       tuple(environment_spec) + (extra_spec,))
+    # Sequence extras are returned without a time dimension.
+    expected_spec[-1]['core_state'] = tf.TensorSpec((8,), tf.float32)
+
+    self.assertTrue(_check_specs(expected_spec, dataset.element_spec.data))
+
+  def test_make_dataset_with_invalid_sequence_extras(self):
+    environment = fakes.ContinuousEnvironment()
+    environment_spec = specs.make_environment_spec(environment)
+    extra_spec = {'core_state': specs.Array((8,), 'float32')}
+
+    with self.assertRaises(ValueError):
+      reverb_dataset.make_dataset(
+          client=self.tf_client,
+          environment_spec=environment_spec,
+          extra_spec=extra_spec,
+          sequence_extras=('core_state',))
+
+    with self.assertRaises(ValueError):
+      reverb_dataset.make_dataset(
+          client=self.tf_client,
+          environment_spec=environment_spec,
+          sequence_length=6,
+          extra_spec=extra_spec,
+          sequence_extras=('logits',))
+
   def test_make_dataset_with_variable_length_instances(self):
     """Dataset with variable length instances should have shapes with None."""
     environment_spec = specs.EnvironmentSpec(
@@ -17,14 +17,18 @@
 
 import itertools
 import time
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple, Union
 
 from acme import core
+from acme import types
 # Internal imports.
 from acme.utils import counting
 from acme.utils import loggers
+from acme.utils import profiling
 
 import dm_env
+import numpy as np
+import tree
 
 
 class EnvironmentLoop(core.Worker):
@@ -45,6 +49,10 @@ class EnvironmentLoop(core.Worker):
   by utils.loggers.make_default_logger. A string `label` can be passed to easily
   change the label associated with the default logger; this is ignored if a
   `Logger` instance is given.
+
+  A `Timer` instance can be given in order to log latency percentiles of the
+  `select_action`, environment `step`, `observe` and `update` calls along with
+  the episode results. By default nothing is timed.
   """
 
   def __init__(
@@ -54,12 +62,14 @@ class EnvironmentLoop(core.Worker):
       counter: counting.Counter = None,
       logger: loggers.Logger = None,
       label: str = 'environment_loop',
+      timer: profiling.Timer = None,
   ):
     # Internalize agent and environment.
     self._environment = environment
     self._actor = actor
     self._counter = counter or counting.Counter()
     self._logger = logger or loggers.make_default_logger(label)
+    self._timer = timer or profiling.Timer(enabled=False)
 
   def run(self, num_episodes: Optional[int] = None):
     """Perform the run loop.
@@ -91,12 +101,16 @@ class EnvironmentLoop(core.Worker):
       # Run an episode.
       while not timestep.last():
         # Generate an action from the agent's policy and step the environment.
-        action = self._actor.select_action(timestep.observation)
-        timestep = self._environment.step(action)
+        with self._timer.time('select_action'):
+          action = self._actor.select_action(timestep.observation)
+        with self._timer.time('environment_step'):
+          timestep = self._environment.step(action)
 
         # Have the agent observe the timestep and let the actor update itself.
-        self._actor.observe(action, next_timestep=timestep)
-        self._actor.update()
+        with self._timer.time('observe'):
+          self._actor.observe(action, next_timestep=timestep)
+        with self._timer.time('update'):
+          self._actor.update()
 
         # Book-keeping.
         episode_steps += 1
@@ -113,9 +127,228 @@ class EnvironmentLoop(core.Worker):
           'steps_per_second': steps_per_second,
       }
       result.update(counts)
+      result.update(self._timer.get_metrics())
 
       # Log the given results.
       self._logger.write(result)
 
 
+class BatchedEnvironmentLoop(core.Worker):
+  """An RL environment loop which steps a batch of environments together.
+
+  This takes N environments and a `BatchedActor` and coordinates their
+  interaction. At every step the observations of all N environments are stacked
+  along a new leading axis and passed to a single `select_action` call, after
+  which the batched action is split back out and each environment is stepped
+  with its own action. This can be used as:
+
+    loop = BatchedEnvironmentLoop(environments, actor)
+    loop.run(num_episodes)
+
+  The environments can be given either as a sequence of `Environment` instances,
+  which are stepped one after the other in this process, or as a single batched
+  `Environment` such as `acme.wrappers.EnvironmentPool`, whose timesteps hold
+  the data of all N environments stacked along the first axis.
+
+  Episodes in different environments end at different times; whenever an
+  environment emits a LAST timestep its episode results are logged exactly as
+  they would be by `EnvironmentLoop` and the environment is reset on the
+  following step, where the action selected for it is ignored. Observations are
+  passed to the actor together with the index of the environment they came from
+  so that the actor can keep per-environment state (e.g. one adder per
+  environment).
+
+  Note that `actor.update()` is called once per batched step, rather than once
+  per environment step. As for `EnvironmentLoop`, an optional `Timer` can be
+  given to log latency percentiles of each phase of the loop.
+  """
+
+  def __init__(
+      self,
+      environments: Union[Sequence[dm_env.Environment], dm_env.Environment],
+      actor: core.BatchedActor,
+      counter: counting.Counter = None,
+      logger: loggers.Logger = None,
+      label: str = 'environment_loop',
+      timer: profiling.Timer = None,
+  ):
+    # Internalize agent and environments.
+    if isinstance(environments, dm_env.Environment):
+      self._environments = _StackedEnvironments(environments)
+    else:
+      self._environments = _EnvironmentSequence(environments)
+    self._actor = actor
+    self._counter = counter or counting.Counter()
+    self._logger = logger or loggers.make_default_logger(label)
+    self._timer = timer or profiling.Timer(enabled=False)
+
+  def run(self, num_episodes: Optional[int] = None):
+    """Perform the run loop.
+
+    Run the environment loop until a total of `num_episodes` episodes have been
+    completed across all environments. Once this number is reached the loop
+    returns at the end of the current batched step, which means that episodes
+    still in progress in other environments are abandoned. If the number of
+    episodes is not given then this will interact with the environments
+    infinitely.
+
+    Args:
+      num_episodes: number of episodes to run the loop for. If `None` (default),
+        runs without limit.
+    """
+
+    num_environments = self._environments.num_environments
+    start_times = [0.] * num_environments
+    episode_steps = [0] * num_environments
+    episode_returns = [0] * num_environments
+
+    def start_episode(index: int, timestep: dm_env.TimeStep):
+      # Reset any counts and make the first observation.
+      start_times[index] = time.time()
+      episode_steps[index] = 0
+      episode_returns[index] = 0
+      self._actor.observe_first(timestep, index=index)
+
+    observations, timesteps = self._environments.reset()
+    for index, timestep in enumerate(timesteps):
+      start_episode(index, timestep)
+
+    num_completed = 0
+    while num_episodes is None or num_completed < num_episodes:
+      # Generate a batch of actions from the agent's policy and step the
+      # environments.
+      with self._timer.time('select_action'):
+        actions = self._actor.select_action(observations)
+      with self._timer.time('environment_step'):
+        observations, timesteps = self._environments.step(actions)
+
+      for index, timestep in enumerate(timesteps):
+        # Environments which finished their episode on the previous step have
+        # now been reset.
+        if timestep.first():
+          start_episode(index, timestep)
+          continue
+
+        # Have the agent observe the timestep.
+        action = tree.map_structure(lambda a, i=index: a[i], actions)
+        with self._timer.time('observe'):
+          self._actor.observe(action, next_timestep=timestep, index=index)
+
+        # Book-keeping.
+        episode_steps[index] += 1
+        episode_returns[index] += timestep.reward
+
+        if timestep.last():
+          self._write_episode_results(
+              episode_steps[index], episode_returns[index], start_times[index])
+          num_completed += 1
+
+      # Let the actor update itself.
+      with self._timer.time('update'):
+        self._actor.update()
+
+  def _write_episode_results(self, episode_steps: int,
+                             episode_return: types.NestedArray,
+                             start_time: float):
+    """Records counts and logs the results of a single finished episode."""
+    # Record counts.
+    counts = self._counter.increment(episodes=1, steps=episode_steps)
+
+    # Collect the results and combine with counts.
+    steps_per_second = episode_steps / (time.time() - start_time)
+    result = {
+        'episode_length': episode_steps,
+        'episode_return': episode_return,
+        'steps_per_second': steps_per_second,
+    }
+    result.update(counts)
+    result.update(self._timer.get_metrics())
+
+    # Log the given results.
+    self._logger.write(result)
+
+
+class _EnvironmentSequence:
+  """Steps a sequence of environments one after the other.
+
+  Both `reset` and `step` return the observations stacked along a new first
+  axis along with a list of the individual timesteps. Each environment is reset
+  on the step following a LAST timestep, regardless of its action.
+  """
+
+  def __init__(self, environments: Sequence[dm_env.Environment]):
+    if not environments:
+      raise ValueError('BatchedEnvironmentLoop requires at least one '
+                       'environment.')
+    self._environments = list(environments)
+    self._timesteps = []
+
+  @property
+  def num_environments(self) -> int:
+    return len(self._environments)
+
+  def reset(self) -> Tuple[types.NestedArray, List[dm_env.TimeStep]]:
+    self._timesteps = [env.reset() for env in self._environments]
+    return self._stack_observations(), self._timesteps
+
+  def step(
+      self, actions: types.NestedArray
+  ) -> Tuple[types.NestedArray, List[dm_env.TimeStep]]:
+    for index, environment in enumerate(self._environments):
+      if self._timesteps[index].last():
+        self._timesteps[index] = environment.reset()
+      else:
+        action = tree.map_structure(lambda a, i=index: a[i], actions)
+        self._timesteps[index] = environment.step(action)
+    return self._stack_observations(), self._timesteps
+
+  def _stack_observations(self) -> types.NestedArray:
+    observations = [timestep.observation for timestep in self._timesteps]
+    return tree.map_structure(lambda *x: np.stack(x), *observations)
+
+
+class _StackedEnvironments:
+  """Adapts a batched environment, e.g. an `EnvironmentPool`.
+
+  This returns the same values as `_EnvironmentSequence` but the environment's
+  observations are already stacked, so the individual timesteps are given as
+  views into the batched timestep.
+  """
+
+  def __init__(self, environment: dm_env.Environment):
+    self._environment = environment
+    self._num_environments = tree.flatten(
+        environment.observation_spec())[0].shape[0]
+
+  @property
+  def num_environments(self) -> int:
+    return self._num_environments
+
+  def reset(self) -> Tuple[types.NestedArray, List[dm_env.TimeStep]]:
+    return self._unstack(self._environment.reset())
+
+  def step(
+      self, actions: types.NestedArray
+  ) -> Tuple[types.NestedArray, List[dm_env.TimeStep]]:
+    return self._unstack(self._environment.step(actions))
+
+  def _unstack(
+      self, timestep: dm_env.TimeStep
+  ) -> Tuple[types.NestedArray, List[dm_env.TimeStep]]:
+    """Splits a batched timestep into a list of timesteps."""
+    timesteps = []
+    for index in range(self._num_environments):
+      step_type = dm_env.StepType(timestep.step_type[index])
+      observation = tree.map_structure(lambda x, i=index: x[i],
+                                       timestep.observation)
+      if step_type == dm_env.StepType.FIRST:
+        timesteps.append(dm_env.restart(observation))
+        continue
+      reward, discount = tree.map_structure(
+          lambda x, i=index: x[i], (timestep.reward, timestep.discount))
+      timesteps.append(dm_env.TimeStep(step_type, reward, discount,
+                                       observation))
+    return timestep.observation, timesteps
+
+
 # Internal class.
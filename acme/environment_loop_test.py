@@ -20,6 +20,19 @@ from absl.testing import absltest
 from acme import environment_loop
 from acme import specs
 from acme.testing import fakes
+from acme.utils import counting
+from acme.utils import loggers
+from acme.utils import profiling
+
+
+class _ListLogger(loggers.Logger):
+  """Logger which records all written data in a list."""
+
+  def __init__(self):
+    self.data = []
+
+  def write(self, data: loggers.LoggingData):
+    self.data.append(data)
 
 
 class EnvironmentLoopTest(absltest.TestCase):
@@ -34,6 +47,42 @@ class EnvironmentLoopTest(absltest.TestCase):
     loop.run(num_episodes=10)
     self.assertEqual(actor.num_updates, 100)
 
+  def test_environment_loop_timing(self):
+    environment = fakes.DiscreteEnvironment(episode_length=10)
+    actor = fakes.Actor(specs.make_environment_spec(environment))
+    logger = _ListLogger()
+    loop = environment_loop.EnvironmentLoop(
+        environment, actor, logger=logger, timer=profiling.Timer())
+    loop.run(num_episodes=2)
+
+    # Every episode logs the percentiles of each phase of the loop.
+    for data in logger.data:
+      for phase in ('select_action', 'environment_step', 'observe', 'update'):
+        self.assertIn(f'{phase}_time_p50', data)
+        self.assertIn(f'{phase}_time_p99', data)
+
+
+class BatchedEnvironmentLoopTest(absltest.TestCase):
+
+  def test_batched_environment_loop(self):
+    # Create environments whose episodes end at different times.
+    environments = [
+        fakes.DiscreteEnvironment(episode_length=length) for length in (3, 5)
+    ]
+    spec = specs.make_environment_spec(environments[0])
+    actor = fakes.BatchedActor(spec, num_environments=len(environments))
+    counter = counting.Counter()
+    logger = _ListLogger()
+    loop = environment_loop.BatchedEnvironmentLoop(
+        environments, actor, counter=counter, logger=logger)
+
+    # The first environment finishes at step 3, is reset at step 4 and finishes
+    # again at step 7. The second finishes at step 5.
+    loop.run(num_episodes=3)
+    self.assertEqual(actor.num_updates, 7)
+    self.assertEqual([d['episode_length'] for d in logger.data], [3, 5, 3])
+    self.assertEqual(counter.get_counts(), {'episodes': 3, 'steps': 11})
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -41,8 +41,20 @@ import jax.numpy as jnp
 Images = jnp.ndarray
 
 
+def _to_float(images: Images) -> jnp.ndarray:
+  """Rescales uint8 pixels to floats in [0, 1]; other inputs are unchanged."""
+  if images.dtype == jnp.uint8:
+    return images.astype(jnp.float32) / 255.
+  return images
+
+
 class AtariTorso(hk.Module):
-  """Simple convolutional stack commonly used for Atari."""
+  """Simple convolutional stack commonly used for Atari.
+
+  Pixels may be given as uint8 values, in which case they are rescaled to
+  floats in [0, 1] by the torso itself, so that observations can be stored and
+  moved around in their compact form.
+  """
 
   def __init__(self):
     super().__init__(name='atari_torso')
@@ -57,7 +69,7 @@ class AtariTorso(hk.Module):
     ])
 
   def __call__(self, inputs: Images) -> jnp.ndarray:
-    return self._network(inputs)
+    return self._network(_to_float(inputs))
 
 
 def dqn_atari_network(num_actions: int) -> base.QNetwork:
@@ -92,7 +104,10 @@ class ResidualBlock(hk.Module):
 
 
 class DeepAtariTorso(base.Module):
-  """Deep torso for Atari, from the IMPALA paper."""
+  """Deep torso for Atari, from the IMPALA paper.
+
+  As for `AtariTorso`, uint8 pixels are rescaled to floats in [0, 1].
+  """
 
   def __init__(self, name: str = 'deep_atari_torso'):
     super().__init__(name=name)
@@ -121,7 +136,7 @@ class DeepAtariTorso(base.Module):
     self._network = hk.Sequential(layers)
 
   def __call__(self, x: jnp.ndarray) -> jnp.ndarray:
-    return self._network(x)
+    return self._network(_to_float(x))
 
 
 class DeepIMPALAAtariNetwork(hk.RNNCore):
@@ -17,10 +17,12 @@
 
 import queue
 import threading
-from typing import Iterable, Generator, TypeVar
+import time
+from typing import Dict, Iterable, Iterator, Optional, TypeVar
 
 from absl import logging
 from acme import types
+from acme.utils import tree_utils
 import haiku as hk
 import jax
 from jax import tree_util
@@ -79,10 +81,144 @@ def batch_to_sequence(values: types.Nest) -> types.NestedArray:
 T = TypeVar('T')
 
 
+class PrefetchIterator(Iterator[T]):
+  """Iterator which prefetches elements of an iterable in background threads.
+
+  Elements are pulled from the wrapped iterable by `num_threads` producer
+  threads, optionally stacked in groups of `num_batches` along a new leading
+  axis and copied to `device`, before being placed in a bounded buffer. Since
+  device transfers are dispatched asynchronously, the copy of the next element
+  overlaps with computation on the current one.
+
+  The iterator also keeps track of how long consumers wait for elements and of
+  how full the buffer is when they ask for one; see `get_metrics`. A learner
+  which mostly finds the buffer empty and spends a significant fraction of its
+  time waiting is starved of data.
+  """
+
+  def __init__(self,
+               iterable: Iterable[T],
+               buffer_size: int = 5,
+               device=None,
+               num_threads: int = 1,
+               num_batches: Optional[int] = None):
+    """Initializes the iterator and starts the producer threads.
+
+    Args:
+      iterable: A python iterable. It is only ever iterated under a lock, so
+        that it may be shared between producer threads.
+      buffer_size: Number of elements to keep in the prefetch buffer.
+      device: The device to prefetch the elements to. If none then the elements
+        are left on the CPU. The device should be of the type returned by
+        `jax.devices()`.
+      num_threads: Number of producer threads.
+      num_batches: If given, this many consecutive elements of `iterable` are
+        stacked along a new leading axis to make each prefetched element.
+        Incomplete stacks at the end of `iterable` are dropped.
+
+    Raises:
+      ValueError: if `buffer_size` <= 1 or `num_threads` < 1.
+    """
+    if buffer_size <= 1:
+      raise ValueError('the buffer_size should be > 1')
+    if num_threads < 1:
+      raise ValueError('the num_threads should be >= 1')
+
+    self._buffer = queue.Queue(maxsize=(buffer_size - 1))
+    self._capacity = buffer_size - 1
+    self._iterator = iter(iterable)
+    self._iterator_lock = threading.Lock()
+    self._device = device
+    self._num_batches = num_batches
+    self._num_threads = num_threads
+    self._num_finished = 0
+    self._producer_error = []
+    self._end = object()
+
+    # Consumer-side statistics, accumulated until the next `get_metrics`.
+    self._num_gets = 0
+    self._wait_time = 0.
+    self._occupancy = 0
+
+    for _ in range(num_threads):
+      threading.Thread(target=self._producer, daemon=True).start()
+
+  def _next_item(self):
+    """Returns the next (possibly stacked) item, copied to the device."""
+    with self._iterator_lock:
+      if self._num_batches is None:
+        item = next(self._iterator)
+      else:
+        item = [next(self._iterator) for _ in range(self._num_batches)]
+    if self._num_batches is not None:
+      item = tree_utils.stack_sequence_fields(item)
+    if self._device:
+      item = jax.device_put(item, self._device)
+    return item
+
+  def _producer(self):
+    """Enqueues items from the iterable on a given thread."""
+    try:
+      while True:
+        try:
+          item = self._next_item()
+        except StopIteration:
+          break
+        self._buffer.put(item)
+    except Exception as e:  # pylint: disable=broad-except
+      logging.exception('Error in producer thread for %s', self._iterator)
+      self._producer_error.append(e)
+    finally:
+      self._buffer.put(self._end)
+
+  def __iter__(self) -> 'PrefetchIterator[T]':
+    return self
+
+  def __next__(self) -> T:
+    while True:
+      self._occupancy += self._buffer.qsize()
+      self._num_gets += 1
+      start_time = time.time()
+      value = self._buffer.get()
+      self._wait_time += time.time() - start_time
+      if value is not self._end:
+        return value
+
+      # Stop only once all producers are done, and raise any error first.
+      self._num_finished += 1
+      if self._producer_error:
+        raise self._producer_error[0]
+      if self._num_finished >= self._num_threads:
+        # Keep signalling the end to any subsequent calls.
+        self._buffer.put(self._end)
+        self._num_finished -= 1
+        raise StopIteration
+
+  def get_metrics(self) -> Dict[str, float]:
+    """Returns buffer statistics since the previous call to this method.
+
+    Returns:
+      A dictionary with the mean fraction of the buffer which was filled when
+      an element was requested ('prefetch_occupancy') and the total number of
+      seconds spent waiting for elements ('prefetch_wait_time').
+    """
+    metrics = {
+        'prefetch_occupancy':
+            self._occupancy / max(self._num_gets * self._capacity, 1),
+        'prefetch_wait_time': self._wait_time,
+    }
+    self._num_gets = 0
+    self._wait_time = 0.
+    self._occupancy = 0
+    return metrics
+
+
 def prefetch(iterable: Iterable[T],
              buffer_size: int = 5,
-             device=None) -> Generator[T, None, None]:
-  """Performs prefetching of elements from an iterable in a separate thread.
+             device=None,
+             num_threads: int = 1,
+             num_batches: Optional[int] = None) -> PrefetchIterator[T]:
+  """Performs prefetching of elements from an iterable in separate threads.
 
   Args:
     iterable: A python iterable. This is used to build the python prefetcher.
@@ -92,45 +228,21 @@ def prefetch(iterable: Iterable[T],
     device: The device to prefetch the elements to. If none then the elements
       are left on the CPU. The device should be of the type returned by
       `jax.devices()`.
+    num_threads: Number of threads pulling elements from the iterable.
+    num_batches: If given, consecutive elements are stacked in groups of this
+      size along a new leading axis, e.g. for learners which run several SGD
+      steps per call.
 
-  Yields:
-    Prefetched elements from the original iterable.
+  Returns:
+    An iterator over the prefetched elements, see `PrefetchIterator`.
   Raises:
     ValueError if the buffer_size <= 1.
     Any error thrown by the iterable_function. Note this is not raised inside
       the producer, but after it finishes executing.
   """
-
-  if buffer_size <= 1:
-    raise ValueError('the buffer_size should be > 1')
-  buffer = queue.Queue(maxsize=(buffer_size - 1))
-  producer_error = []
-  end = object()
-
-  def producer():
-    """Enqueues items from `iterable` on a given thread."""
-    try:
-      # Build a new iterable for each thread. This is crucial if working with
-      # tensorflow datasets because tf.Graph objects are thread local.
-      for item in iterable:
-        if device:
-          item = jax.device_put(item, device)
-        buffer.put(item)
-    except Exception as e:  # pylint: disable=broad-except
-      logging.exception('Error in producer thread for %s', iterable.__name__)
-      producer_error.append(e)
-    finally:
-      buffer.put(end)
-
-  # Start the producer thread.
-  threading.Thread(target=producer, daemon=True).start()
-
-  # Consume from the buffer.
-  while True:
-    value = buffer.get()
-    if value is end:
-      break
-    yield value
-
-  if producer_error:
-    raise producer_error[0]
+  return PrefetchIterator(
+      iterable,
+      buffer_size=buffer_size,
+      device=device,
+      num_threads=num_threads,
+      num_batches=num_batches)
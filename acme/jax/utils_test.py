@@ -19,6 +19,7 @@ from absl.testing import absltest
 from acme.jax import utils
 
 import jax.numpy as jnp
+import numpy as np
 
 
 class JaxUtilsTest(absltest.TestCase):
@@ -37,6 +38,34 @@ class JaxUtilsTest(absltest.TestCase):
     expected_shape = [batch_size, 2 + 5 * 3 + 1]
     self.assertSequenceEqual(output_shape, expected_shape)
 
+  def test_prefetch(self):
+    values = [np.full((2,), i) for i in range(10)]
+    iterator = utils.prefetch(iter(values), buffer_size=3, num_threads=2)
+    outputs = sorted(int(x[0]) for x in iterator)
+    self.assertEqual(outputs, list(range(10)))
+
+    metrics = iterator.get_metrics()
+    self.assertSetEqual(
+        set(metrics), {'prefetch_occupancy', 'prefetch_wait_time'})
+    self.assertBetween(metrics['prefetch_occupancy'], 0., 1.)
+
+  def test_prefetch_stacks_batches(self):
+    values = [np.full((2,), i) for i in range(7)]
+    outputs = list(utils.prefetch(iter(values), num_batches=3))
+    # The incomplete final stack is dropped.
+    self.assertLen(outputs, 2)
+    np.testing.assert_array_equal(outputs[0][:, 0], [0, 1, 2])
+    np.testing.assert_array_equal(outputs[1][:, 0], [3, 4, 5])
+
+  def test_prefetch_raises_producer_error(self):
+
+    def generator():
+      yield np.zeros(1)
+      raise KeyError('error')
+
+    with self.assertRaises(KeyError):
+      list(utils.prefetch(generator()))
+
 
 if __name__ == '__main__':
   absltest.main()
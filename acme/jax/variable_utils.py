@@ -16,28 +16,49 @@
 """Variable utilities for JAX."""
 
 from concurrent import futures
-from typing import List
 
 from acme import core
 
 import haiku as hk
+import jax
 
 
 class VariableClient:
-  """A variable client for updating variables from a remote source."""
+  """A variable client for updating variables from a remote source.
+
+  Parameters are copied to `device` once, when a new copy is received from the
+  source, rather than by every call of a jitted function which uses them. Each
+  received copy increments `version`. If the source versions its variables,
+  requests for variables which have not changed since the last copy return
+  nothing and are not copied again.
+  """
 
   def __init__(self,
                client: core.VariableSource,
                key: str,
-               update_period: int = 1):
+               update_period: int = 1,
+               device=None):
+    """Initializes the variable client.
+
+    Args:
+      client: the source of the variables.
+      key: the name of the variables to request from the source.
+      update_period: number of calls to `update` between requests.
+      device: the device to hold the parameters on. Defaults to the host CPU,
+        where actors run their policies.
+    """
     self._key = key
     self._update_period = update_period
     self._call_counter = 0
     self._client = client
     self._params = None
+    self._version = 0
+    self._source_version = None
+    self._device = device or jax.devices('cpu')[0]
 
     self._executor = futures.ThreadPoolExecutor(max_workers=1)
-    self._request = lambda: client.get_variables([self._key])
+    self._request = lambda: client.get_versioned_variables(
+        [self._key], self._source_version)
     self._future = futures.Future()
     self._async_request = lambda: self._executor.submit(self._request)
 
@@ -65,12 +86,24 @@ class VariableClient:
     """Immediately update and block until we get the result."""
     self._callback(self._request())
 
-  def _callback(self, params_list: List[hk.Params]):
+  def _callback(self, versioned_params: core.VersionedVariables):
+    params_list = versioned_params.variables
+    if params_list is None:
+      # The source's parameters have not changed since the last copy.
+      return
     assert len(params_list) == 1
-    self._params = params_list[0]
+    # Transfer the new parameters before making them visible to the actor.
+    self._params = jax.device_put(params_list[0], self._device)
+    self._source_version = versioned_params.version
+    self._version += 1
 
   @property
   def params(self) -> hk.Params:
     if self._params is None:
       self.update_and_wait()
     return self._params
+
+  @property
+  def version(self) -> int:
+    """The number of parameter copies received so far."""
+    return self._version
@@ -18,6 +18,7 @@
 from absl.testing import absltest
 from acme.jax import variable_utils
 from acme.testing import fakes
+from acme.utils import variable_codecs
 import haiku as hk
 import jax
 import jax.numpy as jnp
@@ -40,6 +41,34 @@ class VariableClientTest(absltest.TestCase):
     variable_client.update_and_wait()
     tree.map_structure(np.testing.assert_array_equal, variable_client.params,
                        params)
+    self.assertEqual(variable_client.version, 1)
+
+    # Parameters are held on the device and only copied again on updates.
+    device = jax.devices('cpu')[0]
+    for leaf in tree.flatten(variable_client.params):
+      self.assertIsInstance(leaf, jnp.DeviceArray)
+      self.assertEqual(leaf.device_buffer.device(), device)
+    params = variable_client.params
+    self.assertIs(variable_client.params, params)
+    variable_client.update_and_wait()
+    self.assertEqual(variable_client.version, 2)
+
+  def test_update_with_encoded_variables(self):
+    init_fn, _ = hk.transform(dummy_network)
+    params = init_fn(jax.random.PRNGKey(1), jnp.zeros(shape=(1, 32)))
+    codecs = {'policy': variable_codecs.BFloat16Codec()}
+    encoding = variable_codecs.EncodingVariableSource(
+        fakes.VariableSource(params), codecs)
+    decoding = variable_codecs.DecodingVariableSource(encoding, codecs)
+    variable_client = variable_utils.VariableClient(decoding, key='policy')
+    variable_client.update_and_wait()
+
+    # The device arrays of the params are encoded, rather than skipped.
+    metrics = encoding.get_metrics()
+    self.assertLess(metrics['encoded_bytes'], 0.6 * metrics['raw_bytes'])
+    tree.map_structure(
+        lambda x, y: np.testing.assert_allclose(x, y, rtol=1e-2, atol=1e-2),
+        variable_client.params, params)
 
 
 if __name__ == '__main__':
@@ -58,6 +58,46 @@ class Actor(core.Actor):
     self.num_updates += 1
 
 
+class BatchedActor(core.BatchedActor):
+  """Fake batched actor which generates random actions and validates specs."""
+
+  def __init__(self, spec: specs.EnvironmentSpec, num_environments: int):
+    self._spec = spec
+    self._num_environments = num_environments
+    self.num_updates = 0
+    self.num_observations = [0] * num_environments
+
+  def select_action(self,
+                    observations: types.NestedArray) -> types.NestedArray:
+    for i in range(self._num_environments):
+      _validate_spec(self._spec.observations,
+                     tree.map_structure(lambda x, i=i: x[i], observations))
+    actions = [
+        _generate_from_spec(self._spec.actions)
+        for _ in range(self._num_environments)
+    ]
+    return tree.map_structure(lambda *x: np.stack(x), *actions)
+
+  def observe_first(self, timestep: dm_env.TimeStep, index: int):
+    _validate_spec(self._spec.observations, timestep.observation)
+    self.num_observations[index] = 0
+
+  def observe(
+      self,
+      action: types.NestedArray,
+      next_timestep: dm_env.TimeStep,
+      index: int,
+  ):
+    _validate_spec(self._spec.actions, action)
+    _validate_spec(self._spec.rewards, next_timestep.reward)
+    _validate_spec(self._spec.discounts, next_timestep.discount)
+    _validate_spec(self._spec.observations, next_timestep.observation)
+    self.num_observations[index] += 1
+
+  def update(self):
+    self.num_updates += 1
+
+
 class VariableSource(core.VariableSource):
   """Fake variable source."""
 
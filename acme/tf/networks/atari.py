@@ -34,7 +34,12 @@ Value = tf.Tensor
 
 
 class AtariTorso(base.Module):
-  """Simple convolutional stack commonly used for Atari."""
+  """Simple convolutional stack commonly used for Atari.
+
+  Pixels may be given as uint8 values, in which case they are rescaled to
+  floats in [0, 1] by the torso itself, so that observations can be stored and
+  moved around in their compact form.
+  """
 
   def __init__(self):
     super().__init__(name='atari_torso')
@@ -49,6 +54,8 @@ class AtariTorso(base.Module):
     ])
 
   def __call__(self, inputs: Images) -> tf.Tensor:
+    if inputs.dtype == tf.uint8:
+      inputs = tf.image.convert_image_dtype(inputs, tf.float32)
     return self._network(inputs)
 
 
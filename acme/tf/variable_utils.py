@@ -16,6 +16,7 @@
 """Variable handling utilities for TensorFlow 2."""
 
 from concurrent import futures
+import threading
 from typing import Mapping, Sequence
 
 from acme import core
@@ -25,12 +26,26 @@ import tree
 
 
 class VariableClient:
-  """A variable client for updating variables from a remote source."""
+  """A variable client for updating variables from a remote source.
+
+  If the source versions its variables, requests for variables which have not
+  changed since the last copy return nothing and nothing is assigned.
+
+  By default new values are assigned to the variables as soon as they arrive,
+  on a background thread, one variable at a time; a policy using the variables
+  at that moment may see a mix of old and new values. If `double_buffered` is
+  True new values are instead staged into a shadow copy of the variables by a
+  single compiled assignment, and the next call to `update` swaps all of them
+  into the variables at once, again in a single compiled call. Policies which
+  run on the same thread as `update` then always see a consistent set of
+  variables.
+  """
 
   def __init__(self,
                client: core.VariableSource,
                variables: Mapping[str, Sequence[tf.Variable]],
-               update_period: int = 1):
+               update_period: int = 1,
+               double_buffered: bool = False):
     self._keys = list(variables.keys())
     self._variables = tree.flatten(list(variables.values()))
     self._call_counter = 0
@@ -38,13 +53,34 @@ class VariableClient:
     self._client = client
 
     self._executor = futures.ThreadPoolExecutor(max_workers=1)
-    self._request = lambda: client.get_variables(self._keys)
+    self._version = None
+    self._request = lambda: client.get_versioned_variables(
+        self._keys, self._version)
     self._future = futures.Future()
     self._async_request = lambda: self._executor.submit(self._request)
 
+    self._double_buffered = double_buffered
+    if double_buffered:
+      self._shadow_variables = [
+          tf.Variable(tf.zeros(v.shape, v.dtype), trainable=False)
+          for v in self._variables
+      ]
+      # Whether the shadow variables hold values which have not been swapped
+      # in yet; the lock prevents swapping while they are being written.
+      self._swap_pending = False
+      self._shadow_lock = threading.Lock()
+      signature = [tf.TensorSpec(v.shape, v.dtype) for v in self._variables]
+      self._stage = tf.function(self._assign_shadow_variables,
+                                input_signature=(signature,))
+      self._swap = tf.function(self._assign_variables)
+
   def update(self):
     """Periodically updates the variables with latest copy from the source."""
 
+    # Swap in any values received since the previous call.
+    if self._double_buffered:
+      self._swap_if_pending(blocking=False)
+
     # Track calls (we only update periodically).
     if self._call_counter < self._update_period:
       self._call_counter += 1
@@ -65,13 +101,46 @@ class VariableClient:
   def update_and_wait(self):
     """Immediately update and block until we get the result."""
     self._copy(self._request())
+    if self._double_buffered:
+      self._swap_if_pending(blocking=True)
 
-  def _copy(self, new_variables: Sequence[Sequence[tf.Variable]]):
+  def _copy(self, versioned_variables: core.VersionedVariables):
     """Copies the new variables to the old ones."""
 
-    new_variables = tree.flatten(new_variables)
+    if versioned_variables.variables is None:
+      # The source's variables have not changed since the last copy.
+      return
+
+    new_variables = tree.flatten(versioned_variables.variables)
     if len(self._variables) != len(new_variables):
       raise ValueError('Length mismatch between old variables and new.')
 
-    for new, old in zip(new_variables, self._variables):
-      old.assign(new)
+    if self._double_buffered:
+      with self._shadow_lock:
+        self._stage(new_variables)
+        self._swap_pending = True
+    else:
+      for new, old in zip(new_variables, self._variables):
+        old.assign(new)
+    self._version = versioned_variables.version
+
+  def _swap_if_pending(self, blocking: bool):
+    """Assigns the staged values to the variables, if there are any."""
+    if not self._swap_pending:
+      return
+    # Skip the swap if values are being staged; it will happen next time.
+    if not self._shadow_lock.acquire(blocking=blocking):
+      return
+    try:
+      self._swap()
+      self._swap_pending = False
+    finally:
+      self._shadow_lock.release()
+
+  def _assign_shadow_variables(self, values: Sequence[tf.Tensor]):
+    for shadow, value in zip(self._shadow_variables, values):
+      shadow.assign(value)
+
+  def _assign_variables(self):
+    for variable, shadow in zip(self._variables, self._shadow_variables):
+      variable.assign(shadow)
@@ -15,6 +15,8 @@
 
 """Tests for acme.tf.variable_utils."""
 
+import time
+
 from absl.testing import absltest
 from acme.testing import fakes
 from acme.tf import utils as tf2_utils
@@ -24,6 +26,22 @@ import sonnet as snt
 import tensorflow as tf
 
 
+class _VersionedVariableSource(fakes.VariableSource):
+  """Variable source which versions its variables and counts its copies."""
+
+  def __init__(self, variables):
+    super().__init__(variables)
+    self.version = 0
+    self.num_copies = 0
+
+  def get_variables(self, names):
+    self.num_copies += 1
+    return super().get_variables(names)
+
+  def get_variables_version(self):
+    return self.version
+
+
 class VariableClientTest(absltest.TestCase):
 
   def test_update(self):
@@ -61,6 +79,53 @@ class VariableClientTest(absltest.TestCase):
     learner_output = learner_model(x).numpy()
     self.assertTrue(np.allclose(actor_output, learner_output))
 
+  def test_versioned_update(self):
+    model = snt.nets.MLP([5])
+    tf2_utils.create_variables(model, [tf.TensorSpec((3,), tf.float32)])
+    np_variables = [tf2_utils.to_numpy(v) for v in model.variables]
+    variable_source = _VersionedVariableSource(np_variables)
+    variable_client = tf2_variable_utils.VariableClient(
+        variable_source, {'policy': model.variables})
+
+    # Variables are only copied if they changed since the previous request.
+    variable_client.update_and_wait()
+    variable_client.update_and_wait()
+    self.assertEqual(variable_source.num_copies, 1)
+
+    variable_source.version += 1
+    variable_client.update_and_wait()
+    self.assertEqual(variable_source.num_copies, 2)
+
+  def test_double_buffered_update(self):
+    model = snt.nets.MLP([5])
+    tf2_utils.create_variables(model, [tf.TensorSpec((3,), tf.float32)])
+    new_variables = [np.ones(v.shape, v.dtype.as_numpy_dtype)
+                     for v in model.variables]
+    variable_source = fakes.VariableSource(new_variables)
+    variable_client = tf2_variable_utils.VariableClient(
+        variable_source, {'policy': model.variables}, double_buffered=True)
+
+    # Received values are staged and only swapped in by the next update.
+    variable_client.update()
+    # pylint: disable=protected-access
+    variable_client._future.result()
+    # Callbacks may still be running once the result is available.
+    while not variable_client._swap_pending:
+      time.sleep(1e-3)
+    # pylint: enable=protected-access
+    for variable in model.variables:
+      self.assertFalse(np.all(variable.numpy() == 1.))
+    variable_client.update()
+    for variable in model.variables:
+      np.testing.assert_array_equal(variable.numpy(), 1.)
+
+    # Waiting for an update swaps the values in immediately.
+    variable_source._variables['policy'] = [  # pylint: disable=protected-access
+        2. * v for v in new_variables]
+    variable_client.update_and_wait()
+    for variable in model.variables:
+      np.testing.assert_array_equal(variable.numpy(), 2.)
+
 
 if __name__ == '__main__':
   absltest.main()
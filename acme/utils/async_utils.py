@@ -61,6 +61,7 @@ class AsyncExecutor(Generic[E]):
           element = self._data.get(timeout=self._interruptible_interval_secs)
           # Execute fn upon dequeuing an element from the data queue.
           fn(element)
+          self._data.task_done()
         except queue.Empty:
           # If queue is Empty for longer than the specified time interval,
           # check again if should_stop has been requested and retry.
@@ -83,6 +84,17 @@ class AsyncExecutor(Generic[E]):
     except queue.Empty:
       pass
 
+  def join(self) -> None:
+    """Blocks until all elements put so far have been processed by `fn`.
+
+    This returns early if the executor is closed or `fn` raises, in which case
+    the error is raised on the calling thread.
+    """
+    with self._data.all_tasks_done:
+      while self._data.unfinished_tasks and not self._should_stop.is_set():
+        self._data.all_tasks_done.wait(self._interruptible_interval_secs)
+    self._raise_on_error()
+
   def close(self):
     self._should_stop.set()
     # Join all background threads.
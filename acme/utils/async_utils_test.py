@@ -0,0 +1,52 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the asynchronous executor."""
+
+import time
+
+from absl.testing import absltest
+from acme.utils import async_utils
+
+
+class AsyncExecutorTest(absltest.TestCase):
+
+  def test_join_waits_for_all_elements(self):
+    processed = []
+
+    def fn(element):
+      time.sleep(0.01)
+      processed.append(element)
+
+    executor = async_utils.AsyncExecutor(fn, queue_size=2)
+    for element in range(5):
+      executor.put(element)
+    executor.join()
+    self.assertEqual(processed, list(range(5)))
+    executor.close()
+
+  def test_join_raises_errors(self):
+
+    def fn(element):
+      raise ValueError(element)
+
+    executor = async_utils.AsyncExecutor(fn, interruptible_interval_secs=0.01)
+    executor.put(1)
+    with self.assertRaises(ValueError):
+      executor.join()
+
+
+if __name__ == '__main__':
+  absltest.main()
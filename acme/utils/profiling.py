@@ -0,0 +1,156 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Lightweight timing of the phases of a learner or environment loop step."""
+
+import collections
+import time
+from typing import Deque, Dict
+
+import numpy as np
+
+# Percentiles reported for each timed phase.
+_PERCENTILES = (50, 95, 99)
+
+
+class _NullContext:
+  """Context manager which does nothing."""
+
+  __slots__ = ()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *unused_exc_info):
+    pass
+
+
+# A context manager which does nothing, shared by all disabled timers.
+_NULL_CONTEXT = _NullContext()
+
+
+class _PhaseTimer:
+  """Context manager which records its duration in a sample buffer."""
+
+  __slots__ = ('_samples', '_start')
+
+  def __init__(self, samples: Deque[float]):
+    self._samples = samples
+    self._start = 0.
+
+  def __enter__(self):
+    self._start = time.perf_counter()
+    return self
+
+  def __exit__(self, *unused_exc_info):
+    self._samples.append(time.perf_counter() - self._start)
+
+
+class Timer:
+  """Records latencies of named phases and summarizes them as percentiles.
+
+  This can be used as:
+
+    timer = Timer()
+    with timer.time('sample'):
+      sample = next(iterator)
+    with timer.time('update'):
+      update(sample)
+    logger.write({**results, **timer.get_metrics()})
+
+  which logs e.g. 'sample_time_p50', 'sample_time_p95' and 'sample_time_p99'
+  (in seconds) over the samples recorded since the last call to `get_metrics`.
+
+  Code which logs on every step (e.g. learners, whose loggers drop most writes)
+  should instead use `get_periodic_metrics`, which summarizes windows of at
+  least `time_delta` seconds rather than a single step.
+
+  A disabled timer returns a shared no-op context manager from `time` and no
+  metrics, so that instrumented code costs next to nothing when timing is off.
+  """
+
+  def __init__(self,
+               enabled: bool = True,
+               max_samples: int = 10000,
+               time_delta: float = 10.):
+    """Initializes the timer.
+
+    Args:
+      enabled: whether to record anything at all.
+      max_samples: maximum number of latencies kept per phase between calls to
+        `get_metrics`; older samples are dropped first.
+      time_delta: minimum duration (in seconds) of the windows summarized by
+        `get_periodic_metrics`.
+    """
+    self._enabled = enabled
+    self._max_samples = max_samples
+    self._time_delta = time_delta
+    self._samples = {}
+    self._timers = {}
+    self._window_start = time.time()
+    self._periodic_metrics = {}
+
+  @property
+  def enabled(self) -> bool:
+    return self._enabled
+
+  def time(self, name: str):
+    """Returns a context manager which times the phase `name`."""
+    if not self._enabled:
+      return _NULL_CONTEXT
+    timer = self._timers.get(name)
+    if timer is None:
+      samples = collections.deque(maxlen=self._max_samples)
+      self._samples[name] = samples
+      timer = self._timers[name] = _PhaseTimer(samples)
+    return timer
+
+  def record(self, name: str, seconds: float):
+    """Records a latency for the phase `name` measured elsewhere."""
+    if not self._enabled:
+      return
+    self.time(name)  # Make sure the phase exists.
+    self._samples[name].append(seconds)
+
+  def get_metrics(self) -> Dict[str, float]:
+    """Returns latency percentiles per phase and clears the recorded samples."""
+    metrics = {}
+    for name, samples in self._samples.items():
+      if not samples:
+        continue
+      values = np.percentile(np.fromiter(samples, dtype=float), _PERCENTILES)
+      for percentile, value in zip(_PERCENTILES, values):
+        metrics[f'{name}_time_p{percentile}'] = float(value)
+      samples.clear()
+    return metrics
+
+  def get_periodic_metrics(self) -> Dict[str, float]:
+    """Returns the metrics of the last completed window of `time_delta` secs.
+
+    This is meant to be called, and its result logged, on every step. Samples
+    are accumulated until `time_delta` seconds have passed, at which point they
+    are summarized (and cleared) as by `get_metrics`. The same summary is then
+    returned until the next window completes, so it is not lost when a logger
+    skips writes.
+
+    Returns:
+      Latency percentiles per phase, or no metrics before the first window
+      completes.
+    """
+    now = time.time()
+    if now - self._window_start >= self._time_delta:
+      self._window_start = now
+      self._periodic_metrics = self.get_metrics()
+    return self._periodic_metrics
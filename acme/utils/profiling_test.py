@@ -0,0 +1,77 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for acme.utils.profiling."""
+
+from unittest import mock
+
+from absl.testing import absltest
+from acme.utils import profiling
+
+
+class TimerTest(absltest.TestCase):
+
+  def test_percentiles(self):
+    timer = profiling.Timer()
+    for i in range(101):
+      timer.record('update', float(i))
+    with timer.time('sample'):
+      pass
+
+    metrics = timer.get_metrics()
+    self.assertSetEqual(
+        set(metrics), {
+            'update_time_p50', 'update_time_p95', 'update_time_p99',
+            'sample_time_p50', 'sample_time_p95', 'sample_time_p99'
+        })
+    self.assertEqual(metrics['update_time_p50'], 50.)
+    self.assertEqual(metrics['update_time_p95'], 95.)
+    self.assertEqual(metrics['update_time_p99'], 99.)
+    self.assertGreaterEqual(metrics['sample_time_p50'], 0.)
+
+    # Samples are cleared once reported.
+    self.assertEmpty(timer.get_metrics())
+
+  def test_max_samples(self):
+    timer = profiling.Timer(max_samples=2)
+    for value in (100., 1., 1.):
+      timer.record('update', value)
+    self.assertEqual(timer.get_metrics()['update_time_p99'], 1.)
+
+  def test_periodic_metrics(self):
+    timer = profiling.Timer(time_delta=60.)
+    timer.record('update', 1.)
+    # Nothing is reported before the first window completes.
+    self.assertEmpty(timer.get_periodic_metrics())
+
+    with mock.patch.object(profiling.time, 'time', return_value=1e12):
+      timer.record('update', 3.)
+      metrics = timer.get_periodic_metrics()
+      self.assertEqual(metrics['update_time_p50'], 2.)
+      # The summary of the window is kept until the next one completes.
+      timer.record('update', 100.)
+      self.assertEqual(timer.get_periodic_metrics(), metrics)
+
+  def test_disabled(self):
+    timer = profiling.Timer(enabled=False)
+    with timer.time('update'):
+      pass
+    timer.record('sample', 1.)
+    self.assertFalse(timer.enabled)
+    self.assertEmpty(timer.get_metrics())
+
+
+if __name__ == '__main__':
+  absltest.main()
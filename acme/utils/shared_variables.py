@@ -0,0 +1,188 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Variables broadcast through shared memory to processes on the same host."""
+
+import multiprocessing
+import time
+from typing import List, Mapping, Optional
+
+from acme import core
+from acme import specs
+from acme import types
+
+import numpy as np
+import tree
+
+# Layout of the header array: the slot readers should use, followed by a
+# sequence number and a version for each of the two slots.
+_ACTIVE_SLOT = 0
+_SEQUENCE = (1, 2)
+_VERSION = (3, 4)
+_HEADER_SIZE = 5
+
+
+class SharedVariables(core.VariableSource):
+  """A source of variables which are published into shared memory.
+
+  A single writer (typically a thread next to the learner) publishes variables,
+  e.g. with `publish_from(learner)`, and any number of actor processes read
+  them, e.g. through a `VariableClient` using this object as its source. The
+  object must be created before the actor processes and passed to them as an
+  argument, like other `multiprocessing` shared objects. This can be used as:
+
+    policy_variables = learner.get_variables(['policy'])[0]
+    variables = SharedVariables({'policy': policy_variables})
+    processes = [Process(target=run_actor, args=(variables,)) ...]
+    while True:
+      variables.publish_from(learner)
+
+  The memory holds two copies (slots) of the variables. A new version is
+  written into the slot readers are not directed to, which is then made the
+  active one; each slot also carries a sequence number which is odd while it is
+  being written, so that a reader which was overtaken by two publications
+  notices it and reads again instead of returning a torn copy. Readers copy
+  the variables out of shared memory once, without any serialization, and only
+  need to do so when the version has changed (see `get_versioned_variables`).
+  """
+
+  def __init__(self,
+               variables: Mapping[str, types.NestedArray],
+               start_method: Optional[str] = None):
+    """Allocates shared memory for variables structured like `variables`.
+
+    Args:
+      variables: a mapping from names to (nested) arrays, used to determine the
+        structure, shapes and dtypes of the variables. Their values are not
+        published.
+      start_method: the `multiprocessing` start method of the processes the
+        variables are shared with.
+    """
+    context = multiprocessing.get_context(start_method)
+    self._specs = {
+        name: tree.map_structure(
+            lambda x: specs.Array(np.shape(x), np.asarray(x).dtype), value)
+        for name, value in variables.items()
+    }
+    self._header_buffer = context.RawArray('q', _HEADER_SIZE)
+    self._buffers = {
+        name: tree.map_structure(
+            lambda s: context.RawArray('b', 2 * max(_nbytes(s), 1)), spec)
+        for name, spec in self._specs.items()
+    }
+    self._make_views()
+    self._header[_ACTIVE_SLOT] = -1
+
+  def _make_views(self):
+    """Creates array views of the shared buffers in the current process."""
+    self._header = np.frombuffer(self._header_buffer, dtype=np.int64)
+    self._slots = {
+        name: tree.map_structure(_as_slots, self._buffers[name], spec)
+        for name, spec in self._specs.items()
+    }
+
+  def __getstate__(self):
+    return self._specs, self._header_buffer, self._buffers
+
+  def __setstate__(self, state):
+    self._specs, self._header_buffer, self._buffers = state
+    self._make_views()
+
+  def publish(self,
+              variables: Mapping[str, types.NestedArray],
+              version: Optional[int] = None):
+    """Writes a new version of the variables; only one writer is supported.
+
+    Args:
+      variables: a mapping from each name given on construction to its new
+        values.
+      version: the version of the variables. Defaults to one plus the version of
+        the previous publication.
+    """
+    active = self._header[_ACTIVE_SLOT]
+    if version is None:
+      version = 0 if active < 0 else self._header[_VERSION[active]] + 1
+    slot = 0 if active < 0 else 1 - active
+
+    self._header[_SEQUENCE[slot]] += 1  # Odd while writing.
+    for name, slots in self._slots.items():
+      tree.map_structure(lambda s, v: np.copyto(s[slot, ...], v), slots,
+                         variables[name])
+    self._header[_VERSION[slot]] = version
+    self._header[_SEQUENCE[slot]] += 1
+    self._header[_ACTIVE_SLOT] = slot
+
+  def publish_from(self, source: core.VariableSource) -> bool:
+    """Publishes the variables of `source` if they have changed.
+
+    Args:
+      source: the source of the variables, e.g. a learner.
+
+    Returns:
+      Whether a new version was published.
+    """
+    names = list(self._specs)
+    versioned = source.get_versioned_variables(names,
+                                               self.get_variables_version())
+    if versioned.variables is None:
+      return False
+    self.publish(dict(zip(names, versioned.variables)), versioned.version)
+    return True
+
+  def get_variables_version(self) -> Optional[int]:
+    active = self._header[_ACTIVE_SLOT]
+    if active < 0:
+      return None
+    return int(self._header[_VERSION[active]])
+
+  def get_variables(self, names: List[str]) -> List[types.NestedArray]:
+    """Returns a consistent copy of the named variables.
+
+    This blocks until the variables have been published at least once.
+
+    Args:
+      names: the names of the variables to return.
+
+    Returns:
+      The values of the named variables.
+    """
+    while True:
+      slot = self._header[_ACTIVE_SLOT]
+      if slot < 0:
+        time.sleep(1e-3)
+        continue
+      sequence = self._header[_SEQUENCE[slot]]
+      if sequence % 2:
+        # The slot is being written to; wait for the writer to finish.
+        time.sleep(1e-4)
+        continue
+      variables = [
+          tree.map_structure(lambda s, i=slot: s[i, ...].copy(),
+                             self._slots[name])
+          for name in names
+      ]
+      if self._header[_SEQUENCE[slot]] == sequence:
+        return variables
+
+
+def _nbytes(spec: specs.Array) -> int:
+  return int(np.prod(spec.shape)) * np.dtype(spec.dtype).itemsize
+
+
+def _as_slots(buffer, spec: specs.Array) -> np.ndarray:
+  """Views a shared buffer as two arrays conforming to `spec`."""
+  return np.frombuffer(
+      buffer, dtype=spec.dtype, count=2 * int(np.prod(spec.shape))).reshape(
+          (2,) + spec.shape)
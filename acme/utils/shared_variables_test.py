@@ -0,0 +1,115 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for acme.utils.shared_variables."""
+
+import multiprocessing
+
+from absl.testing import absltest
+from acme.testing import fakes
+from acme.utils import shared_variables
+import numpy as np
+import tree
+
+
+def _make_variables(value: float):
+  return {
+      'policy': {
+          'w': np.full((3, 2), value, dtype=np.float32),
+          'b': np.full((2,), value, dtype=np.float32),
+      },
+      'step': np.int64(value),
+  }
+
+
+def _read_in_child(variables, pipe):
+  """Sends consistent reads from the shared variables back to the parent."""
+  results = []
+  while True:
+    version = variables.get_variables_version()
+    policy, step = variables.get_variables(['policy', 'step'])
+    # All leaves of a single read must come from the same publication.
+    values = {float(x) for x in np.concatenate(
+        [policy['w'].ravel(), policy['b'], [step]])}
+    results.append((version, values))
+    if step == 100:
+      break
+  pipe.send(results)
+
+
+class _VersionedSource(fakes.VariableSource):
+  """Variable source with a fixed version which counts its requests."""
+
+  def __init__(self, variables, version):
+    super().__init__()
+    self._variables = variables
+    self.version = version
+    self.num_requests = 0
+
+  def get_variables(self, names):
+    self.num_requests += 1
+    return super().get_variables(names)
+
+  def get_variables_version(self):
+    return self.version
+
+
+class SharedVariablesTest(absltest.TestCase):
+
+  def test_publish_and_read(self):
+    variables = shared_variables.SharedVariables(_make_variables(0.))
+    self.assertIsNone(variables.get_variables_version())
+
+    variables.publish(_make_variables(1.))
+    variables.publish(_make_variables(2.))
+    self.assertEqual(variables.get_variables_version(), 1)
+    policy, step = variables.get_variables(['policy', 'step'])
+    tree.map_structure(np.testing.assert_array_equal, policy,
+                       _make_variables(2.)['policy'])
+    self.assertEqual(step, 2)
+
+    # Unchanged versions are not returned again.
+    versioned = variables.get_versioned_variables(['step'], 1)
+    self.assertEqual(versioned.version, 1)
+    self.assertIsNone(versioned.variables)
+
+  def test_publish_from(self):
+    source = _VersionedSource(_make_variables(3.), version=7)
+    variables = shared_variables.SharedVariables(_make_variables(0.))
+    self.assertTrue(variables.publish_from(source))
+    self.assertFalse(variables.publish_from(source))
+    self.assertEqual(source.num_requests, 1)
+    self.assertEqual(variables.get_variables_version(), 7)
+    self.assertEqual(variables.get_variables(['step'])[0], 3)
+
+  def test_no_torn_reads_across_processes(self):
+    variables = shared_variables.SharedVariables(_make_variables(0.))
+    variables.publish(_make_variables(0.))
+    parent_pipe, child_pipe = multiprocessing.Pipe()
+    process = multiprocessing.Process(
+        target=_read_in_child, args=(variables, child_pipe))
+    process.start()
+    for value in range(1, 101):
+      variables.publish(_make_variables(float(value)), version=value)
+    results = parent_pipe.recv()
+    process.join()
+
+    for _, values in results:
+      self.assertLen(values, 1)
+    self.assertEqual(results[-1][1], {100.})
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,50 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for tree_utils."""
+
+from absl.testing import absltest
+
+from acme.utils import tree_utils
+
+import numpy as np
+
+
+class TreeUtilsTest(absltest.TestCase):
+
+  def test_stack_sequence_fields(self):
+    sequence = [{
+        'action': np.array([1.0]),
+        'observation': (np.array([0.0, 1.0, 2.0]),),
+        'reward': 1.0,
+    }, {
+        'action': np.array([0.5]),
+        'observation': (np.array([1.0, 2.0, 3.0]),),
+        'reward': 0.0,
+    }]
+
+    stacked = tree_utils.stack_sequence_fields(sequence)
+
+    self.assertEqual(stacked['action'].shape, (2, 1))
+    self.assertEqual(stacked['observation'][0].shape, (2, 3))
+    self.assertEqual(stacked['reward'].tolist(), [1.0, 0.0])
+
+  def test_stack_empty_sequence(self):
+    with self.assertRaises(ValueError):
+      tree_utils.stack_sequence_fields([])
+
+
+if __name__ == '__main__':
+  absltest.main()
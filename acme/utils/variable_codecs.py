@@ -0,0 +1,317 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Codecs which reduce the size of variables sent to variable clients.
+
+A learner's variables can be wrapped in an `EncodingVariableSource`, which
+encodes each named collection of variables with its own `Codec` before it is
+sent to actors, and a `DecodingVariableSource` on the actor side restores them
+before they reach a `VariableClient`:
+
+  # On the learner.
+  source = EncodingVariableSource(learner, {'policy': Int8Codec()})
+  # On each actor, where `remote_source` refers to `source`.
+  client = VariableClient(
+      DecodingVariableSource(remote_source, {'policy': Int8Codec()}), 'policy')
+
+The lossy codecs only apply to floating point arrays; other arrays are sent
+unchanged.
+"""
+
+import abc
+import zlib
+from typing import Dict, List, Mapping, Optional
+
+from acme import core
+from acme import types
+
+import numpy as np
+import tree
+
+
+class EncodedArray:
+  """An encoded array, along with what is needed to decode it."""
+
+  __slots__ = ('data', 'dtype', 'shape', 'scale', 'is_delta')
+
+  def __init__(self,
+               data,
+               dtype: np.dtype,
+               shape=(),
+               scale: float = 1.,
+               is_delta: bool = False):
+    self.data = data
+    self.dtype = np.dtype(dtype)
+    self.shape = tuple(shape)
+    self.scale = scale
+    self.is_delta = is_delta
+
+  @property
+  def nbytes(self) -> int:
+    if isinstance(self.data, bytes):
+      return len(self.data)
+    return self.data.nbytes
+
+
+class Codec(abc.ABC):
+  """Encodes and decodes individual arrays."""
+
+  def accepts(self, value) -> bool:
+    """Returns whether `value` is encoded; by default only float arrays are.
+
+    Any array with a `dtype` is accepted, e.g. the device arrays of JAX
+    learners, and is converted to a NumPy array before it is encoded.
+
+    Args:
+      value: a leaf of the variables.
+    """
+    return _is_array(value) and np.issubdtype(value.dtype, np.floating)
+
+  @abc.abstractmethod
+  def encode(self,
+             value: np.ndarray,
+             base: Optional[np.ndarray] = None) -> EncodedArray:
+    """Encodes `value`, possibly relative to `base`, held by the decoder."""
+
+  @abc.abstractmethod
+  def decode(self,
+             encoded: EncodedArray,
+             base: Optional[np.ndarray] = None) -> np.ndarray:
+    """Decodes an array encoded (possibly relative to `base`) by `encode`."""
+
+
+def _is_array(value) -> bool:
+  return hasattr(value, 'dtype') and hasattr(value, 'shape')
+
+
+def _as_bytes(value: np.ndarray) -> np.ndarray:
+  return np.ascontiguousarray(value).reshape(-1).view(np.uint8)
+
+
+class Float16Codec(Codec):
+  """Sends floating point arrays as IEEE half precision floats."""
+
+  def encode(self, value, base=None):
+    return EncodedArray(value.astype(np.float16), value.dtype)
+
+  def decode(self, encoded, base=None):
+    return encoded.data.astype(encoded.dtype)
+
+
+class BFloat16Codec(Codec):
+  """Sends floating point arrays as bfloat16, i.e. truncated float32s.
+
+  This keeps the full float32 exponent range at the cost of precision, and
+  only needs NumPy: the upper 16 bits of each float32 are sent, rounded to the
+  nearest even value.
+  """
+
+  def encode(self, value, base=None):
+    bits = value.astype(np.float32).view(np.uint32)
+    rounding = np.uint32(0x7fff) + ((bits >> 16) & 1)
+    rounded = np.where(np.isnan(value), bits, bits + rounding)
+    return EncodedArray((rounded >> 16).astype(np.uint16), value.dtype)
+
+  def decode(self, encoded, base=None):
+    bits = encoded.data.astype(np.uint32) << 16
+    return bits.view(np.float32).astype(encoded.dtype)
+
+
+class Int8Codec(Codec):
+  """Quantizes floating point arrays to int8 with a scale per array."""
+
+  def encode(self, value, base=None):
+    max_abs = float(np.max(np.abs(value))) if value.size else 0.
+    scale = max_abs / 127. if max_abs > 0 else 1.
+    quantized = np.clip(np.round(value / scale), -127, 127).astype(np.int8)
+    return EncodedArray(quantized, value.dtype, scale=scale)
+
+  def decode(self, encoded, base=None):
+    return (encoded.data.astype(np.float32) * encoded.scale).astype(
+        encoded.dtype)
+
+
+class DeltaCodec(Codec):
+  """Losslessly compresses arrays relative to the decoder's previous version.
+
+  The bits of the array are XOR-ed with those of the version held by the
+  decoder, if known, and compressed. Parameters which change little between
+  versions leave most of the resulting bits zero, which compresses well.
+  """
+
+  def __init__(self, level: int = 1):
+    self._level = level
+
+  def accepts(self, value) -> bool:
+    return _is_array(value)
+
+  def encode(self, value, base=None):
+    value = np.asarray(value)
+    bits = _as_bytes(value)
+    is_delta = base is not None
+    if is_delta:
+      bits = np.bitwise_xor(bits, _as_bytes(base))
+    return EncodedArray(
+        zlib.compress(bits.tobytes(), self._level),
+        value.dtype,
+        shape=value.shape,
+        is_delta=is_delta)
+
+  def decode(self, encoded, base=None):
+    bits = np.frombuffer(zlib.decompress(encoded.data), dtype=np.uint8)
+    if encoded.is_delta:
+      if base is None:
+        raise ValueError('Cannot decode a delta without its base version.')
+      bits = np.bitwise_xor(bits, _as_bytes(base))
+    return bits.view(encoded.dtype).reshape(encoded.shape).copy()
+
+
+def _nbytes(nest) -> int:
+  return sum(getattr(x, 'nbytes', 0) for x in tree.flatten(nest))
+
+
+class EncodingVariableSource(core.VariableSource):
+  """Encodes the variables of another source for transport to clients.
+
+  To compute deltas for clients holding older versions, the last
+  `history_length` versions sent are kept (only for names using a
+  `DeltaCodec`, and only if `source` versions its variables).
+  """
+
+  def __init__(self,
+               source: core.VariableSource,
+               codecs: Mapping[str, Codec],
+               history_length: int = 4):
+    """Initializes the source.
+
+    Args:
+      source: the source of the (unencoded) variables.
+      codecs: a mapping from variable names to the codec used for them; other
+        variables are sent unchanged.
+      history_length: the number of past versions kept to compute deltas.
+    """
+    self._source = source
+    self._codecs = dict(codecs)
+    self._history_length = history_length
+    self._history: Dict[str, Dict[int, types.NestedArray]] = {}
+    self._raw_bytes = 0
+    self._encoded_bytes = 0
+
+  def get_variables(self, names: List[str]) -> List[types.NestedArray]:
+    return self.get_versioned_variables(names).variables
+
+  def get_variables_version(self) -> Optional[int]:
+    return self._source.get_variables_version()
+
+  def get_versioned_variables(self, names, version=None):
+    versioned = self._source.get_versioned_variables(names, version)
+    if versioned.variables is None:
+      return versioned
+    encoded = [
+        self._encode(name, variables, versioned.version, version)
+        for name, variables in zip(names, versioned.variables)
+    ]
+    self._raw_bytes += _nbytes(versioned.variables)
+    self._encoded_bytes += _nbytes(encoded)
+    return core.VersionedVariables(versioned.version, encoded)
+
+  def _encode(self, name: str, variables: types.NestedArray,
+              version: Optional[int], client_version: Optional[int]):
+    """Encodes a single collection of variables."""
+    codec = self._codecs.get(name)
+    if codec is None:
+      return variables
+
+    base = None
+    if isinstance(codec, DeltaCodec) and version is not None:
+      history = self._history.setdefault(name, {})
+      base = history.get(client_version)
+      history[version] = variables
+      while len(history) > self._history_length:
+        del history[min(history)]
+
+    def encode(x, b=None):
+      if not codec.accepts(x):
+        return x
+      return codec.encode(np.asarray(x), None if b is None else np.asarray(b))
+
+    if base is None:
+      return tree.map_structure(encode, variables)
+    return tree.map_structure(encode, variables, base)
+
+  def get_metrics(self) -> Dict[str, int]:
+    """Returns the total number of bytes before and after encoding."""
+    return {'raw_bytes': self._raw_bytes, 'encoded_bytes': self._encoded_bytes}
+
+
+class DecodingVariableSource(core.VariableSource):
+  """Decodes the variables of an `EncodingVariableSource`."""
+
+  def __init__(self, source: core.VariableSource, codecs: Mapping[str, Codec]):
+    """Initializes the source.
+
+    Args:
+      source: an `EncodingVariableSource`, or a remote handle to one.
+      codecs: the same mapping from variable names to codecs as given to the
+        encoding source.
+    """
+    self._source = source
+    self._codecs = dict(codecs)
+    self._variables: Dict[str, types.NestedArray] = {}
+    self._versions: Dict[str, Optional[int]] = {}
+    self._encoded_bytes = 0
+
+  def get_variables(self, names: List[str]) -> List[types.NestedArray]:
+    return self.get_versioned_variables(names).variables
+
+  def get_variables_version(self) -> Optional[int]:
+    return self._source.get_variables_version()
+
+  def get_versioned_variables(self, names, version=None):
+    # Request variables relative to the version held here, which deltas are
+    # computed against.
+    held_versions = set(self._versions.get(name) for name in names)
+    held_version = held_versions.pop() if len(held_versions) == 1 else None
+    versioned = self._source.get_versioned_variables(names, held_version)
+
+    if versioned.variables is not None:
+      self._encoded_bytes += _nbytes(versioned.variables)
+      for name, encoded in zip(names, versioned.variables):
+        self._variables[name] = self._decode(name, encoded)
+        self._versions[name] = versioned.version
+
+    if versioned.version is not None and versioned.version == version:
+      return core.VersionedVariables(versioned.version, None)
+    return core.VersionedVariables(
+        versioned.version, [self._variables[name] for name in names])
+
+  def _decode(self, name: str, encoded: types.NestedArray):
+    """Decodes a single collection of variables."""
+    codec = self._codecs.get(name)
+    if codec is None:
+      return encoded
+
+    def decode(x, base=None):
+      if isinstance(x, EncodedArray):
+        return codec.decode(x, base)
+      return x
+
+    if name not in self._variables:
+      return tree.map_structure(decode, encoded)
+    return tree.map_structure(decode, encoded, self._variables[name])
+
+  def get_metrics(self) -> Dict[str, int]:
+    """Returns the total number of (encoded) bytes received."""
+    return {'encoded_bytes': self._encoded_bytes}
@@ -0,0 +1,146 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for acme.utils.variable_codecs."""
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from acme.testing import fakes
+from acme.utils import variable_codecs
+import numpy as np
+import tree
+
+
+class _VersionedSource(fakes.VariableSource):
+  """Variable source whose variables and version are set by the test."""
+
+  def __init__(self):
+    super().__init__()
+    self.version = None
+
+  def set_variables(self, variables, version):
+    self._variables = variables
+    self.version = version
+
+  def get_variables_version(self):
+    return self.version
+
+
+def _make_variables(seed: int):
+  rng = np.random.RandomState(seed)
+  return {
+      'policy': {
+          'w': rng.normal(size=(64, 32)).astype(np.float32),
+          'step': np.int64(seed),
+      },
+      'critic': rng.normal(size=(8,)).astype(np.float32),
+  }
+
+
+class CodecTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('float16', variable_codecs.Float16Codec(), 1e-3),
+      ('bfloat16', variable_codecs.BFloat16Codec(), 1e-2),
+      ('int8', variable_codecs.Int8Codec(), 1e-2),
+  )
+  def test_lossy_round_trip(self, codec, tolerance):
+    value = np.random.RandomState(0).normal(size=(100,)).astype(np.float32)
+    encoded = codec.encode(value)
+    self.assertLess(encoded.nbytes, value.nbytes)
+    decoded = codec.decode(encoded)
+    self.assertEqual(decoded.dtype, np.float32)
+    np.testing.assert_allclose(
+        decoded, value, atol=tolerance * 3, rtol=tolerance)
+
+  def test_bfloat16_keeps_float32_range(self):
+    codec = variable_codecs.BFloat16Codec()
+    value = np.array([1e30, -1e-30, 0., 1.], dtype=np.float32)
+    np.testing.assert_allclose(codec.decode(codec.encode(value)), value,
+                               rtol=1e-2)
+
+  def test_delta_is_lossless(self):
+    codec = variable_codecs.DeltaCodec()
+    base = np.random.RandomState(0).normal(size=(1000,)).astype(np.float32)
+    value = base.copy()
+    value[:10] += 1.
+
+    full = codec.encode(value)
+    delta = codec.encode(value, base)
+    self.assertLess(delta.nbytes, full.nbytes)
+    np.testing.assert_array_equal(codec.decode(full), value)
+    np.testing.assert_array_equal(codec.decode(delta, base), value)
+    with self.assertRaises(ValueError):
+      codec.decode(delta)
+
+
+class VariableSourceTest(absltest.TestCase):
+
+  def test_per_name_codecs(self):
+    codecs = {'policy': variable_codecs.Int8Codec()}
+    source = _VersionedSource()
+    source.set_variables(_make_variables(0), version=0)
+    encoding = variable_codecs.EncodingVariableSource(source, codecs)
+    decoding = variable_codecs.DecodingVariableSource(encoding, codecs)
+
+    policy, critic = decoding.get_variables(['policy', 'critic'])
+    expected = _make_variables(0)
+    # The critic is sent as is, and only float arrays are quantized.
+    np.testing.assert_array_equal(critic, expected['critic'])
+    self.assertEqual(policy['step'], 0)
+    np.testing.assert_allclose(policy['w'], expected['policy']['w'], atol=0.05)
+
+    metrics = encoding.get_metrics()
+    self.assertLess(metrics['encoded_bytes'], metrics['raw_bytes'] / 2)
+    self.assertEqual(decoding.get_metrics()['encoded_bytes'],
+                     metrics['encoded_bytes'])
+
+  def test_delta_against_held_version(self):
+    codecs = {'policy': variable_codecs.DeltaCodec()}
+    source = _VersionedSource()
+    variables = _make_variables(0)
+    source.set_variables(variables, version=0)
+    encoding = variable_codecs.EncodingVariableSource(source, codecs)
+    decoding = variable_codecs.DecodingVariableSource(encoding, codecs)
+
+    # Fetch as a variable client would, passing the version it holds.
+    versioned = decoding.get_versioned_variables(['policy'])
+    self.assertEqual(versioned.version, 0)
+    first_bytes = encoding.get_metrics()['encoded_bytes']
+
+    # Change a few parameters; only a small delta should be sent.
+    variables = tree.map_structure(np.copy, variables)
+    variables['policy']['w'][0] += 1.
+    source.set_variables(variables, version=1)
+    versioned = decoding.get_versioned_variables(['policy'], version=0)
+    delta_bytes = encoding.get_metrics()['encoded_bytes'] - first_bytes
+    self.assertLess(delta_bytes, first_bytes / 4)
+    self.assertEqual(versioned.version, 1)
+    policy, = versioned.variables
+    tree.map_structure(np.testing.assert_array_equal, policy,
+                       variables['policy'])
+
+    # Unchanged variables are not sent again.
+    versioned = decoding.get_versioned_variables(['policy'], version=1)
+    self.assertIsNone(versioned.variables)
+    policy, = decoding.get_variables(['policy'])
+    self.assertEqual(
+        encoding.get_metrics()['encoded_bytes'], first_bytes + delta_bytes)
+    tree.map_structure(np.testing.assert_array_equal, policy,
+                       variables['policy'])
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -54,6 +54,10 @@ class AtariWrapper(dm_env.Environment):
 
   This class also exposes an additional option `to_float` that doesn't feature
   in other wrappers, which rescales pixel values to floats in the range [0, 1].
+  Note that this makes observations 4x larger everywhere they are stored or
+  copied (e.g. in replay); prefer keeping the uint8 pixels and rescaling them
+  inside the network, as done by the Atari torsos in `acme.tf.networks` and
+  `acme.jax.networks`.
   """
 
   def __init__(self,
@@ -92,7 +96,7 @@ class AtariWrapper(dm_env.Environment):
         the returned observation.
       max_episode_len: Number of frames before truncating episode. By default,
         there is no maximum length.
-      to_float: If `True`, rescales RGB observations to floats in [0, 1].
+      to_float: If `True`, rescales RGB observations to float32s in [0, 1].
       grayscaling: If `True` returns a grayscale version of the observations. In
         this case, the observation is 3D (H, W, num_stacked_frames). If `False`
         the observations are RGB and have shape (H, W, C, num_stacked_frames).
@@ -152,7 +156,7 @@ class AtariWrapper(dm_env.Environment):
       An `Array` specification for the pixel observations.
     """
     if self._to_float:
-      pixels_dtype = np.float
+      pixels_dtype = np.float32
     else:
       pixels_dtype = np.uint8
 
@@ -300,7 +304,8 @@ class AtariWrapper(dm_env.Environment):
       cast_observation = processed_pixels
 
     if self._to_float:
-      stacked_observation = self._frame_stacker.step(cast_observation / 255.0)
+      stacked_observation = self._frame_stacker.step(
+          cast_observation.astype(np.float32) / 255.0)
     else:
       stacked_observation = self._frame_stacker.step(cast_observation)
 
@@ -314,7 +319,7 @@ class AtariWrapper(dm_env.Environment):
       return dm_env.restart(timestep.observation)
 
     reward = np.clip(timestep.reward, -self._max_abs_reward,
-                     self._max_abs_reward)
+                     self._max_abs_reward).astype(np.float32)
 
     return timestep._replace(reward=reward)
 
@@ -327,7 +332,7 @@ class AtariWrapper(dm_env.Environment):
     return self._observation_spec
 
   def reward_spec(self) -> specs.Array:
-    return specs.Array(shape=(), dtype=np.float)
+    return specs.Array(shape=(), dtype=np.float32)
 
   @property
   def raw_observation(self) -> np.ndarray:
@@ -336,25 +341,43 @@ class AtariWrapper(dm_env.Environment):
 
 
 class FrameStacker:
-  """Simple class for frame-stacking observations."""
+  """Simple class for frame-stacking observations.
 
-  def __init__(self, length: int):
-    self._stack = None
+  Frames are written once into a preallocated circular buffer which holds two
+  copies of the stack along its last axis, so that the most recent `length`
+  frames always form a contiguous slice of it. Each call to `step` then returns
+  a single copy of that slice or, if `copy` is False, a view of it which is
+  only valid until the next call to `step` or `reset`.
+  """
+
+  def __init__(self, length: int, copy: bool = True):
+    self._buffer = None
     self._length = length
+    self._copy = copy
+    self._index = 0
 
   @property
   def length(self) -> int:
     return self._length
 
   def reset(self):
-    self._stack = None
+    if self._buffer is not None:
+      self._buffer.fill(0)
+    self._index = 0
 
   def step(self, frame: np.ndarray) -> np.ndarray:
-    if self._stack is None:
-      self._stack = [np.zeros_like(frame) for _ in range(self._length)]
-    self._stack[0][:] = frame
-    self._stack = self._stack[1:] + [self._stack[0]]
-    return np.stack(self._stack, axis=-1)
+    if self._buffer is None:
+      self._buffer = np.zeros(
+          frame.shape + (2 * self._length,), dtype=frame.dtype)
+
+    # Write the frame at both positions it occupies in the mirrored buffer.
+    self._buffer[..., self._index] = frame
+    self._buffer[..., self._index + self._length] = frame
+    self._index = (self._index + 1) % self._length
+
+    # The oldest frame is now at self._index.
+    stack = self._buffer[..., self._index:self._index + self._length]
+    return stack.copy() if self._copy else stack
 
 
 class _ZeroDiscountOnLifeLoss(dm_env.Environment):
@@ -60,5 +60,35 @@ class AtariWrapperTest(absltest.TestCase):
     env.close()
 
 
+class FrameStackerTest(absltest.TestCase):
+
+  def test_stacks_most_recent_frames(self):
+    stacker = atari_wrapper.FrameStacker(length=3)
+    frames = [np.full((2, 2), i, dtype=np.uint8) for i in range(1, 6)]
+
+    # Missing frames are zero at the start of an episode.
+    observation = stacker.step(frames[0])
+    self.assertEqual(observation.shape, (2, 2, 3))
+    self.assertEqual(observation.dtype, np.uint8)
+    np.testing.assert_array_equal(observation[0, 0], [0, 0, 1])
+
+    observations = [stacker.step(frame) for frame in frames[1:]]
+    np.testing.assert_array_equal(observations[0][0, 0], [0, 1, 2])
+    np.testing.assert_array_equal(observations[-1][0, 0], [3, 4, 5])
+
+    # Copies returned by earlier steps are not overwritten.
+    np.testing.assert_array_equal(observations[1][0, 0], [1, 2, 3])
+
+    stacker.reset()
+    np.testing.assert_array_equal(stacker.step(frames[0])[0, 0], [0, 0, 1])
+
+  def test_view(self):
+    stacker = atari_wrapper.FrameStacker(length=2, copy=False)
+    stacker.step(np.ones((2,)))
+    observation = stacker.step(np.full((2,), 2.))
+    np.testing.assert_array_equal(observation, [[1., 2.], [1., 2.]])
+    self.assertFalse(observation.flags.owndata)
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -0,0 +1,276 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A pool of environments stepped in parallel worker processes."""
+
+import multiprocessing
+import traceback
+from typing import Callable, Optional
+
+from acme import specs
+from acme import types
+
+import dm_env
+import numpy as np
+import tree
+
+# Commands sent from the pool to its workers.
+_RESET = 0
+_STEP = 1
+_CLOSE = 2
+
+
+class EnvironmentPool(dm_env.Environment):
+  """Runs K copies of an environment in worker processes.
+
+  The pool itself is a `dm_env.Environment` whose timesteps are batched along a
+  new leading axis of size K, i.e. observations have shape `[K, ...]`, rewards
+  and discounts have shape `[K]` and `step_type` is an array of K `StepType`
+  values. Actions passed to `step` must likewise be stacked along the first
+  axis. This can be used as:
+
+    pool = EnvironmentPool(make_environment, num_environments=8)
+    timestep = pool.reset()
+    timestep = pool.step(actions)
+
+  or, to overlap environment stepping with other work, as:
+
+    pool.step_async(actions)
+    ...
+    timestep = pool.step_wait()
+
+  Each worker resets its environment on the step following a LAST timestep, so
+  that individual episodes can end at different times. The rows of a batched
+  timestep corresponding to such a reset have step type FIRST and zero reward
+  and discount.
+
+  Observations, rewards and discounts are not pickled: each worker writes them
+  into shared-memory buffers sized from the environment's specs, and only the
+  (small) actions and step types are sent through pipes.
+  """
+
+  def __init__(
+      self,
+      environment_factory: Callable[[], dm_env.Environment],
+      num_environments: int,
+      environment_spec: Optional[specs.EnvironmentSpec] = None,
+      start_method: Optional[str] = None,
+  ):
+    """Initializes a new EnvironmentPool.
+
+    Args:
+      environment_factory: A picklable callable which creates the environment.
+        This is called once in each worker process.
+      num_environments: The number K of environments to run.
+      environment_spec: The spec of the environment. If not given, an
+        environment is created in the calling process in order to read it.
+      start_method: The `multiprocessing` start method used to create the
+        workers, e.g. 'fork' or 'spawn'. Defaults to the platform default.
+
+    Raises:
+      ValueError: If `num_environments` is less than 1.
+    """
+    if num_environments < 1:
+      raise ValueError('num_environments ({}) must be at least 1.'.format(
+          num_environments))
+
+    if environment_spec is None:
+      environment = environment_factory()
+      environment_spec = specs.make_environment_spec(environment)
+      environment.close()
+
+    self._spec = environment_spec
+    self._num_environments = num_environments
+    self._waiting = False
+    self._closed = False
+
+    # Allocate one shared buffer per observation/reward/discount leaf, holding
+    # the values for all K environments.
+    context = multiprocessing.get_context(start_method)
+    buffer_specs = (environment_spec.observations, environment_spec.rewards,
+                    environment_spec.discounts)
+    buffers = tree.map_structure(
+        lambda s: context.RawArray('b', num_environments * _nbytes(s)),
+        buffer_specs)
+    self._observations, self._rewards, self._discounts = tree.map_structure(
+        lambda b, s: _as_array(b, s, num_environments), buffers, buffer_specs)
+
+    self._pipes = []
+    self._processes = []
+    for index in range(num_environments):
+      parent_pipe, worker_pipe = context.Pipe()
+      process = context.Process(
+          target=_worker,
+          args=(worker_pipe, environment_factory, buffers, buffer_specs,
+                num_environments, index),
+          daemon=True)
+      process.start()
+      worker_pipe.close()
+      self._pipes.append(parent_pipe)
+      self._processes.append(process)
+
+  @property
+  def num_environments(self) -> int:
+    return self._num_environments
+
+  def reset(self) -> dm_env.TimeStep:
+    """Resets all environments and returns the batched first timesteps."""
+    self._check_not_waiting()
+    for pipe in self._pipes:
+      pipe.send((_RESET, None))
+    self._waiting = True
+    return self.step_wait()
+
+  def step(self, action: types.NestedArray) -> dm_env.TimeStep:
+    """Steps all environments with a batch of actions and waits for them."""
+    self.step_async(action)
+    return self.step_wait()
+
+  def step_async(self, action: types.NestedArray):
+    """Sends a batch of actions to the workers without waiting for results."""
+    self._check_not_waiting()
+    for index, pipe in enumerate(self._pipes):
+      pipe.send((_STEP, tree.map_structure(lambda a, i=index: a[i], action)))
+    self._waiting = True
+
+  def step_wait(self) -> dm_env.TimeStep:
+    """Waits for the workers and returns the resulting batched timestep."""
+    if not self._waiting:
+      raise ValueError('step_wait called without a preceding step_async.')
+
+    step_types = []
+    errors = []
+    for pipe in self._pipes:
+      success, result = pipe.recv()
+      if success:
+        step_types.append(result)
+      else:
+        errors.append(result)
+    self._waiting = False
+
+    if errors:
+      raise RuntimeError('Error in environment worker:\n{}'.format(errors[0]))
+
+    # Copy out of the shared buffers, as the workers will overwrite them on the
+    # next step while the caller may still hold on to this timestep.
+    return dm_env.TimeStep(
+        step_type=np.array(step_types, dtype=np.int8),
+        reward=tree.map_structure(np.array, self._rewards),
+        discount=tree.map_structure(np.array, self._discounts),
+        observation=tree.map_structure(np.array, self._observations))
+
+  def close(self):
+    """Shuts down all worker processes."""
+    if self._closed:
+      return
+    if self._waiting:
+      for pipe in self._pipes:
+        pipe.recv()
+      self._waiting = False
+    for pipe in self._pipes:
+      pipe.send((_CLOSE, None))
+    for process in self._processes:
+      process.join()
+    for pipe in self._pipes:
+      pipe.close()
+    self._closed = True
+
+  def _check_not_waiting(self):
+    if self._waiting:
+      raise ValueError('step_wait must be called before sending new commands '
+                       'to the environment pool.')
+    if self._closed:
+      raise ValueError('The environment pool has been closed.')
+
+  def observation_spec(self) -> types.NestedSpec:
+    return tree.map_structure(self._batch_spec, self._spec.observations)
+
+  def action_spec(self) -> types.NestedSpec:
+    return tree.map_structure(self._batch_spec, self._spec.actions)
+
+  def reward_spec(self) -> types.NestedSpec:
+    return tree.map_structure(self._batch_spec, self._spec.rewards)
+
+  def discount_spec(self) -> types.NestedSpec:
+    return tree.map_structure(self._batch_spec, self._spec.discounts)
+
+  def _batch_spec(self, spec: specs.Array) -> specs.Array:
+    """Adds a leading dimension of size K to a single spec."""
+    shape = (self._num_environments,) + spec.shape
+    if isinstance(spec, specs.BoundedArray):
+      return specs.BoundedArray(shape, spec.dtype, spec.minimum, spec.maximum,
+                                spec.name)
+    return specs.Array(shape, spec.dtype, spec.name)
+
+
+def _nbytes(spec: specs.Array) -> int:
+  return int(np.prod(spec.shape)) * np.dtype(spec.dtype).itemsize
+
+
+def _as_array(buffer, spec: specs.Array, num_environments: int) -> np.ndarray:
+  """Views a shared buffer as an array of K values conforming to `spec`."""
+  return np.frombuffer(buffer, dtype=spec.dtype).reshape(
+      (num_environments,) + spec.shape)
+
+
+def _worker(pipe, environment_factory, buffers, buffer_specs, num_environments,
+            index):
+  """Runs a single environment, writing its outputs into the shared buffers."""
+  observations, rewards, discounts = tree.map_structure(
+      lambda b, s: _as_array(b, s, num_environments)[index, ...], buffers,
+      buffer_specs)
+
+  def write(timestep: dm_env.TimeStep) -> int:
+    tree.map_structure(np.copyto, observations, timestep.observation)
+    if timestep.first():
+      tree.map_structure(lambda x: x.fill(0), (rewards, discounts))
+    else:
+      tree.map_structure(np.copyto, rewards, timestep.reward)
+      tree.map_structure(np.copyto, discounts, timestep.discount)
+    return int(timestep.step_type)
+
+  try:
+    environment = environment_factory()
+  except Exception:  # pylint: disable=broad-except
+    environment = None
+    creation_error = traceback.format_exc()
+
+  try:
+    timestep = None
+    while True:
+      command, action = pipe.recv()
+      if command == _CLOSE:
+        if environment is not None:
+          environment.close()
+        break
+      if environment is None:
+        pipe.send((False, creation_error))
+        continue
+      try:
+        if command == _RESET:
+          timestep = environment.reset()
+        # Reset explicitly (rather than relying on the environment to do so)
+        # once an episode has ended, so that episodes end independently.
+        elif timestep is None or timestep.last():
+          timestep = environment.reset()
+        else:
+          timestep = environment.step(action)
+        pipe.send((True, write(timestep)))
+      except Exception:  # pylint: disable=broad-except
+        pipe.send((False, traceback.format_exc()))
+  except KeyboardInterrupt:
+    pass
+  finally:
+    pipe.close()
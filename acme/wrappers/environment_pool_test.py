@@ -0,0 +1,93 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the environment pool."""
+
+import functools
+
+from absl.testing import absltest
+
+from acme import environment_loop
+from acme import specs
+from acme import wrappers
+from acme.testing import fakes
+
+import dm_env
+import numpy as np
+
+
+class EnvironmentPoolTest(absltest.TestCase):
+
+  def test_step(self):
+    make_environment = functools.partial(
+        fakes.DiscreteEnvironment,
+        num_actions=3,
+        obs_shape=(2, 3),
+        episode_length=2)
+    pool = wrappers.EnvironmentPool(make_environment, num_environments=4)
+    self.addCleanup(pool.close)
+
+    self.assertEqual(pool.observation_spec().shape, (4, 2, 3))
+    self.assertEqual(pool.action_spec().shape, (4,))
+    self.assertEqual(pool.reward_spec().shape, (4,))
+
+    timestep = pool.reset()
+    self.assertEqual(timestep.observation.shape, (4, 2, 3))
+    np.testing.assert_array_equal(timestep.step_type,
+                                  [dm_env.StepType.FIRST] * 4)
+
+    actions = np.zeros((4,), dtype=np.int32)
+    timestep = pool.step(actions)
+    np.testing.assert_array_equal(timestep.step_type,
+                                  [dm_env.StepType.MID] * 4)
+
+    pool.step_async(actions)
+    timestep = pool.step_wait()
+    np.testing.assert_array_equal(timestep.step_type,
+                                  [dm_env.StepType.LAST] * 4)
+
+    # Stepping after the end of an episode resets each environment.
+    timestep = pool.step(actions)
+    np.testing.assert_array_equal(timestep.step_type,
+                                  [dm_env.StepType.FIRST] * 4)
+    np.testing.assert_array_equal(timestep.reward, np.zeros(4))
+
+  def test_errors_are_raised(self):
+    pool = wrappers.EnvironmentPool(
+        fakes.DiscreteEnvironment, num_environments=2)
+    self.addCleanup(pool.close)
+    pool.reset()
+
+    # The fake environment validates actions against its spec.
+    with self.assertRaises(RuntimeError):
+      pool.step(np.full((2,), 5, dtype=np.int32))
+
+  def test_batched_environment_loop(self):
+    make_environment = functools.partial(
+        fakes.DiscreteEnvironment, episode_length=3)
+    pool = wrappers.EnvironmentPool(make_environment, num_environments=2)
+    self.addCleanup(pool.close)
+
+    spec = specs.make_environment_spec(make_environment())
+    actor = fakes.BatchedActor(spec, num_environments=2)
+    loop = environment_loop.BatchedEnvironmentLoop(pool, actor)
+    loop.run(num_episodes=4)
+
+    # Each environment finishes at steps 3 and 7.
+    self.assertEqual(actor.num_updates, 7)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,97 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of the import time and memory footprint of an actor process.
+
+Each configuration imports a set of modules in a fresh Python process and
+reports the time taken and the peak resident set size of that process. The
+`*_with_tf_utils` configurations additionally import `acme.tf.utils`, which the
+Reverb adders used to depend on, in order to reproduce the startup cost from
+before the adders were made framework-free.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+from absl import app
+from absl import flags
+
+flags.DEFINE_integer('num_repeats', 5, 'Number of processes per config.')
+FLAGS = flags.FLAGS
+
+_CONFIGS = {
+    'adders': ['acme.adders.reverb'],
+    'adders_with_tf_utils': ['acme.adders.reverb', 'acme.tf.utils'],
+    'jax_actor': [
+        'acme.adders.reverb',
+        'acme.agents.jax.actors',
+        'acme.jax.variable_utils',
+    ],
+    'jax_actor_with_tf_utils': [
+        'acme.adders.reverb',
+        'acme.agents.jax.actors',
+        'acme.jax.variable_utils',
+        'acme.tf.utils',
+    ],
+}
+
+# Code run in each child process; prints its measurements as JSON.
+_CHILD = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+for module in sys.argv[1:]:
+  importlib.import_module(module)
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'seconds': elapsed,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.,
+    'tensorflow': 'tensorflow' in sys.modules,
+    'sonnet': 'sonnet' in sys.modules,
+}))
+"""
+
+
+def _measure(modules):
+  """Returns the measurements of a child process, or None if it failed."""
+  process = subprocess.run(
+      [sys.executable, '-c', _CHILD] + modules,
+      stdout=subprocess.PIPE,
+      stderr=subprocess.DEVNULL)
+  if process.returncode:
+    return None
+  return json.loads(process.stdout.decode().strip().splitlines()[-1])
+
+
+def main(_):
+  print('{:<26} {:>10} {:>12} {:>11} {:>7}'.format(
+      'config', 'import (s)', 'max RSS (MB)', 'tensorflow', 'sonnet'))
+  for name, modules in _CONFIGS.items():
+    results = [_measure(modules) for _ in range(FLAGS.num_repeats)]
+    if None in results:
+      print('{:<26} failed to import {}'.format(name, modules))
+      continue
+    print('{:<26} {:>10.2f} {:>12.0f} {:>11} {:>7}'.format(
+        name,
+        statistics.median(r['seconds'] for r in results),
+        statistics.median(r['max_rss_mb'] for r in results),
+        str(results[0]['tensorflow']),
+        str(results[0]['sonnet']),
+    ))
+
+
+if __name__ == '__main__':
+  app.run(main)
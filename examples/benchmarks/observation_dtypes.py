@@ -0,0 +1,100 @@
+# python3
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of replay memory and throughput for different pixel dtypes.
+
+Atari-sized stacked observations are written to an in-process Reverb server
+by a transition adder and sampled back in batches, as they would be by an
+agent, with observations stored as uint8 (normalized inside the network),
+float32, or float64 (as `AtariWrapper(to_float=True)` used to produce). Both
+observations of every transition are stored, so the size of each item is
+dominated by the observation dtype.
+"""
+
+import time
+
+from absl import app
+from absl import flags
+from acme import adders as acme_adders
+from acme import datasets
+from acme import specs
+from acme.adders import reverb as adders
+import dm_env
+import numpy as np
+import reverb
+
+flags.DEFINE_integer('num_inserts', 2000, 'Number of transitions inserted.')
+flags.DEFINE_integer('num_batches', 20, 'Number of batches sampled.')
+flags.DEFINE_integer('batch_size', 32, 'Number of transitions per batch.')
+FLAGS = flags.FLAGS
+
+_SHAPE = (84, 84, 4)
+
+
+def _run(dtype) -> str:
+  """Returns a line of results for observations of the given dtype."""
+  spec = specs.EnvironmentSpec(
+      observations=specs.Array(_SHAPE, dtype),
+      actions=specs.DiscreteArray(18),
+      rewards=specs.Array((), np.float32),
+      discounts=specs.BoundedArray((), np.float32, 0., 1.))
+  table = reverb.Table(
+      name=adders.DEFAULT_PRIORITY_TABLE,
+      sampler=reverb.selectors.Uniform(),
+      remover=reverb.selectors.Fifo(),
+      max_size=FLAGS.num_inserts,
+      rate_limiter=reverb.rate_limiters.MinSize(1))
+  server = reverb.Server([table], port=None)
+  client = reverb.Client(f'localhost:{server.port}')
+  adder = acme_adders.CastingAdder(
+      adders.NStepTransitionAdder(client, n_step=1, discount=0.99), spec)
+
+  random_state = np.random.RandomState(0)
+  pixels = random_state.randint(0, 256, size=(16,) + _SHAPE).astype(np.uint8)
+  if dtype != np.uint8:
+    pixels = pixels.astype(dtype) / 255.
+  action = np.int32(0)
+
+  start = time.perf_counter()
+  adder.add_first(dm_env.restart(pixels[0]))
+  for i in range(FLAGS.num_inserts):
+    adder.add(action, dm_env.transition(1., pixels[(i + 1) % len(pixels)]))
+  adder.close()
+  inserts_per_second = FLAGS.num_inserts / (time.perf_counter() - start)
+
+  iterator = datasets.make_reverb_numpy_iterator(
+      client, spec, batch_size=FLAGS.batch_size, transition_adder=True)
+  start = time.perf_counter()
+  for _ in range(FLAGS.num_batches):
+    next(iterator)
+  batches_per_second = FLAGS.num_batches / (time.perf_counter() - start)
+  iterator.close()
+  server.stop()
+
+  item_bytes = 2 * np.prod(_SHAPE) * np.dtype(dtype).itemsize
+  return '{:<10} {:>14.1f} {:>14.0f} {:>14.1f}'.format(
+      np.dtype(dtype).name, item_bytes / 2**10, inserts_per_second,
+      batches_per_second)
+
+
+def main(_):
+  print('{:<10} {:>14} {:>14} {:>14}'.format('dtype', 'KiB/item',
+                                             'inserts/sec', 'batches/sec'))
+  for dtype in (np.uint8, np.float32, np.float64):
+    print(_run(dtype))
+
+
+if __name__ == '__main__':
+  app.run(main)